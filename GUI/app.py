@@ -1,14 +1,51 @@
 #!/usr/bin/env python3
+import os
 import sys
-from PyQt5.QtWidgets import QApplication
-from ui.main_window import MainWindow
+import time
+
+_T0 = time.perf_counter()
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QApplication, QSplashScreen
+from PyQt5.QtGui import QPixmap, QColor
 import app_globals
 
+# Set by tools/startup_timing.py: print time-to-window and loaded heavy modules, then quit
+STARTUP_PROBE_ENV = "PROPSTAND_STARTUP_PROBE"
+HEAVY_MODULES = ("scipy", "matplotlib.pyplot", "widgets.map_trajectory",
+                 "tools.calc_center_of_thrust", "data.trajectory",
+                 "data.data_processing", "data.omega_estimator",
+                 "widgets.lc_calibration_1", "widgets.lc_calibration_2")
+
+
+def _startup_probe():
+    ms = (time.perf_counter() - _T0) * 1000.0
+    heavy = [m for m in HEAVY_MODULES if m in sys.modules]
+    print(f"startup_ms={ms:.1f}")
+    print(f"heavy_modules={','.join(heavy)}")
+    sys.stdout.flush()
+    QApplication.instance().quit()
+
+
 def main():
     app = QApplication(sys.argv)
+
+    # Splash goes up before the heavy imports (matplotlib via ui.main_window)
+    pix = QPixmap(420, 120)
+    pix.fill(QColor("white"))
+    splash = QSplashScreen(pix)
+    splash.showMessage("Propelleri stend\nLaen...", Qt.AlignCenter, QColor("black"))
+    splash.show()
+    app.processEvents()
+
+    from ui.main_window import MainWindow
     window = MainWindow()
     app_globals.window = window  # expose the main window to other modules
     window.show()
+    splash.finish(window)
+
+    if os.environ.get(STARTUP_PROBE_ENV):
+        QTimer.singleShot(0, _startup_probe)
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
@@ -33,6 +33,15 @@ second_thr_cal_val_default = 143.41
 pwm_ramp_ms_default = 150
 aoss_enabled_default = True
 rotation_dir = 1
+omega_estimator_default = "hist_mode"     # hist_mode | trimmed_mean | sweep_median (data/omega_estimator.py)
+omega_bin_width_default = 1.0             # rad/s, histogram bin of hist_mode
+flow_lag_s_default = 0.0                  # s, pitot/probe transport delay before binning (data/lag_compensation.py, 0 = off)
+flow_tau_s_default = 0.0                  # s, first-order sensor lag undone before binning (0 = off)
+serial_transport = "thread"           # "thread" (SerialReader QThread), "asyncio" (AsyncSerialTransport, POSIX)
+                                      # or "process" (AcquisitionTransport: own process + shared-memory frame ring)
+mcu_tick_hz = 1000                    # rate of the optional tick counter at the end of a Measurements line
+# USB VID/PID of the stand controller (PID None = any); such ports are listed first
+stand_usb_ids = ((0x2341, None), (0x2A03, None), (0x1A86, 0x7523), (0x10C4, 0xEA60))
 
 # Global scratch lists (they were module-level in your script)
 var_list = []
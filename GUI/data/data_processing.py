@@ -3,6 +3,10 @@ import csv
 import math
 import statistics
 
+import numpy as np
+
+from data.omega_estimator import DEFAULT_BIN_WIDTH, DEFAULT_ESTIMATOR, estimate_omega
+
 
 # ============================================================
 # Low-level file helpers
@@ -55,26 +59,117 @@ def _read_omega_values_tandem(log_path):
         print(f"Error reading log file: {e}")
     return vals
 
-def _read_omegas_tandem_separate(log_path):
-    """Return (omega1_list, omega2_list) from raw log."""
-    o1, o2 = [], []
+# Raw log columns (tandem rows carry 15, single-prop rows 12):
+# 0=prop_inch, 1=X, 2=Y, 3=Torque1, 4=Thrust1, 5=Omega1,
+# 6=Airspeed, 7=AoA, 8=AoSS, 9=V_tan, 10=V_rad, 11=V_axial,
+# 12=Torque2, 13=Thrust2, 14=Omega2
+_LOG_COLS = 15
+
+
+def _load_log_array(log_path, ncols=_LOG_COLS):
+    """
+    Read the raw log once into an (rows, ncols) float array plus the token count
+    of every row. Missing / unparsable cells are NaN.
+    """
+    rows, widths = [], []
+    nan = float('nan')
     try:
         for tokens in _read_rows_space_delimited(log_path):
-            if len(tokens) > 5:
-                try: o1.append(float(tokens[5]))
-                except ValueError: pass
-            if len(tokens) > 14:
-                try: o2.append(float(tokens[14]))
-                except ValueError: pass
+            vals = []
+            for t in tokens[:ncols]:
+                try:
+                    vals.append(float(t))
+                except ValueError:
+                    vals.append(nan)
+            vals.extend([nan] * (ncols - len(vals)))
+            rows.append(vals)
+            widths.append(len(tokens))
     except FileNotFoundError as e:
         print(f"Error reading log file: {e}")
-    return o1, o2
+    arr = np.array(rows, dtype=np.float64).reshape(-1, ncols)
+    return arr, np.array(widths, dtype=np.int64)
+
+
+def _group_means(values, gid, ngroups):
+    """Per-group mean of every column ignoring NaN (0.0 where a group has no values)."""
+    ok = np.isfinite(values)
+    out = np.zeros((ngroups, values.shape[1]))
+    for c in range(values.shape[1]):
+        m = ok[:, c]
+        s = np.bincount(gid[m], weights=values[m, c], minlength=ngroups)
+        n = np.bincount(gid[m], minlength=ngroups)
+        np.divide(s, n, out=out[:, c], where=n > 0)
+    return out
+
+
+def _estimate_omega(window, arr, col):
+    """Series omega of one prop (column col of the log array) with the estimator set in SharedData."""
+    sd = getattr(window, "shared_data", None)
+    method = getattr(sd, "omega_estimator", DEFAULT_ESTIMATOR) or DEFAULT_ESTIMATOR
+    bin_width = getattr(sd, "omega_bin_width", DEFAULT_BIN_WIDTH) or DEFAULT_BIN_WIDTH
+    # per-sweep row counts from the run manifest (the sweeps of this series)
+    manifest = getattr(window, "manifest", None)
+    try:
+        sweep_rows = [int(e.get("rows") or 0) for e in manifest.doc["timing"]["sweeps"]]
+    except Exception:
+        sweep_rows = None
+    est = estimate_omega(arr[:, col], arr[:, 1], method=method, bin_width=bin_width,
+                         sweep_rows=sweep_rows)
+    if est.drifting:
+        print(f"Omega drift over the series: {est.drift_pct:.2f} % "
+              f"({est.drift:.2f} rad/s per sweep, column {col})")
+    return est
+
+
+def _read_blade_geometry_table(prop_cfg_path):
+    """Whole prop config file as {x_str: (chord_angle_raw, chord_length_raw)} (one read)."""
+    table = {}
+    try:
+        with open(prop_cfg_path, newline='') as propfile:
+            for row in csv.reader(propfile, delimiter=' '):
+                if len(row) >= 3 and row[0] not in table:
+                    table[row[0]] = (row[1], row[2])
+    except Exception as e:
+        print(f"_read_blade_geometry error: {e}")
+    return table
+
+
+def _section_kinematics_arrays(omega, x_mm, vtan, vrad, vax, chord_raw, chord_len_raw, rot_dir, kin_visc):
+    """
+    Vectorized _compute_chord_effective + _compute_section_kinematics + _reynolds
+    (same formulas and zero guards) for one prop over all stations.
+    """
+    t_rel = rot_dir * float(omega) * (x_mm / 1000.0) - vtan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(t_rel != 0, vrad / t_rel, 0.0)
+        cos_r = np.cos(np.arctan(ratio))
+        chord_eff = np.where(t_rel != 0, np.degrees(np.arctan(np.tan(np.radians(chord_raw)) * cos_r)), 0.0)
+        chord_len_eff = np.where(t_rel != 0, chord_len_raw / cos_r, 0.0)
+
+        total = np.sqrt(t_rel ** 2 + vax ** 2 + vrad ** 2)
+        helix = np.where(total > 0, np.degrees(np.arcsin(np.clip(vax / total, -1.0, 1.0))), 0.0)
+        h = np.radians(helix)
+        v_lift = vax * np.cos(h) + vtan * np.sin(h)
+        v_drag = vtan * np.cos(h) - vax * np.sin(h)
+        cl = np.where(total > 0, 2.0 * v_lift / total, 0.0)
+        cd = np.where(total > 0, 2.0 * v_drag / total, 0.0)
+        # single-prop path feeds the 2-decimal total speed string into _reynolds
+        re = (chord_len_eff / 1000.0 * np.round(total, 2)) / (float(kin_visc) * 1e-5)
+    return {
+        'chord_eff': chord_eff, 'chord_len_eff': chord_len_eff,
+        'helix': helix, 'alpha': chord_eff - helix, 'total': total,
+        'v_lift': v_lift, 'v_drag': v_drag, 'cl': cl, 'cd': cd,
+        're': np.where(np.isfinite(re), re, 0.0),
+    }
+
 
 def _tandem_average_file(window):
     """
     Tandem (2 props):
-      - Average by (x,y).
-      - Write a proper comma CSV without omega columns.
+      - Read the raw log once into arrays; average by (x,y) with a vectorized group-by.
+      - Write a proper comma CSV without omega columns, plus per-prop section
+        kinematics (chord eff, helix, alpha, V_total/lift/drag, CL, CD, Re) from
+        each prop's omega mode; NaN when no prop file is selected.
       - Compute total induced metrics (Average_induced_speed etc.) using both props.
       - Compute per-prop mean torque and power (P = M * omega_mode).
       - Append all summary values at the end.
@@ -90,24 +185,50 @@ def _tandem_average_file(window):
         "airspeed_mps", "aoa_deg", "aoss_deg",
         "v_tan_mps", "v_rad_mps", "v_axial_mps",
         "torque2_Nm", "thrust2_N",
+        "chord_angle_deg", "chord_length_mm",
     ]
+    for p in (1, 2):
+        header += [
+            f"chord_angle_eff{p}_deg", f"chord_length_eff{p}_mm",
+            f"helix_angle_eff{p}_deg", f"alpha_angle{p}_deg",
+            f"v_total{p}_mps", f"v_lift{p}_mps", f"v_drag{p}_mps",
+            f"CL{p}", f"CD{p}", f"Re{p}",
+        ]
+    header.append("v_a+r_mps")
+
+    # ---------------- one pass over the log ----------------
+    arr, widths = _load_log_array(log_path)
+
+    # ---------------- omega modes, mean torques (per prop) and powers ----------------
+    om1 = _estimate_omega(window, arr, 5)
+    om2 = _estimate_omega(window, arr, 14)
+    omega1_m, omega2_m = om1.value, om2.value
+    trq1_all = arr[np.isfinite(arr[:, 3]), 3]
+    trq2_all = arr[np.isfinite(arr[:, 12]), 12]
+    M1 = float(trq1_all.mean()) if len(trq1_all) else 0.0
+    M2 = float(trq2_all.mean()) if len(trq2_all) else 0.0
+    P1 = M1 * float(omega1_m)
+    P2 = M2 * float(omega2_m)
 
-    # Accumulators for induced-speed and total loads
-    var_list = []          # for induced velocity integral
-    trq_total_list = []    # total torque per section (M1 + M2)
-    thr_total_list = []    # total thrust per section (T1 + T2)
-
-    # ---------------- group rows by (x, y) and write mean rows ----------------
-    groups = {}
-    for tokens in _read_rows_space_delimited(log_path):
-        if len(tokens) < 12:
-            continue
-        try:
-            x = int(float(tokens[1]))
-            y = int(float(tokens[2]))
-        except ValueError:
-            continue
-        groups.setdefault((x, y), []).append(tokens)
+    # ---------------- group rows by (x, y) ----------------
+    xy_ok = (widths >= 12) & np.isfinite(arr[:, 1]) & np.isfinite(arr[:, 2])
+    rows = arr[xy_ok]
+    keys = np.trunc(rows[:, 1:3]).astype(np.int64)          # int(float(token)) like before
+    if len(keys):
+        uniq, gid = np.unique(keys, axis=0, return_inverse=True)   # sorted by x, then y
+        gid = gid.reshape(-1)
+    else:
+        uniq, gid = np.zeros((0, 2), dtype=np.int64), np.zeros(0, dtype=np.int64)
+    ng = len(uniq)
+    counts = np.bincount(gid, minlength=ng)
+    means = _group_means(rows, gid, ng)
+
+    xs, ys = uniq[:, 0], uniq[:, 1]
+    prop_avg = means[:, 0]
+    trq1, thr1 = means[:, 3], means[:, 4]
+    air, aoa, aoss = means[:, 6], means[:, 7], means[:, 8]
+    vtan, vrad, vax = means[:, 9], means[:, 10], means[:, 11]
+    trq2, thr2 = means[:, 12], means[:, 13]
 
     # D/R from UI
     try:
@@ -115,85 +236,61 @@ def _tandem_average_file(window):
     except Exception:
         dr_ratio_val = 0.0
 
+    # ---------------- per-prop section kinematics ----------------
+    try:
+        rot_dir = int(getattr(getattr(window, "shared_data", object()), "rotation_dir", 1) or 1)
+    except Exception:
+        rot_dir = -1
+    fname = getattr(window, "fname", None)
+    geometry = _read_blade_geometry_table(fname[0]) if fname and fname[0] else {}
+    if geometry:
+        chord_raw_s = [geometry.get(str(int(x)), ("0.0", "0.0")) for x in xs]
+        chord_raw = np.array([float(a) for a, _ in chord_raw_s]) if ng else np.zeros(0)
+        chord_len_raw = np.array([float(b) for _, b in chord_raw_s]) if ng else np.zeros(0)
+        kin_visc = window.shared_data.kin_visc
+        # the prop file describes both blades (mirror pair); the rear prop counter-rotates
+        kin = [_section_kinematics_arrays(om, xs.astype(np.float64), vtan, vrad, vax,
+                                          chord_raw, chord_len_raw, d, kin_visc)
+               for om, d in ((omega1_m, rot_dir), (omega2_m, -rot_dir))]
+    else:
+        # no prop file (the usual tandem case): no blade angles, so no section kinematics
+        chord_raw_s = [("nan", "nan")] * ng
+        nan = np.full(ng, np.nan)
+        kin = [dict.fromkeys(('chord_eff', 'chord_len_eff', 'helix', 'alpha', 'total',
+                              'v_lift', 'v_drag', 'cl', 'cd', 're'), nan)] * 2
+    v_2d = np.sqrt(vax ** 2 + vrad ** 2)
+
     with open(out_path, "w", newline="") as f:
         w = csv.writer(f)
         w.writerow(header)
-
-        for (x, y) in sorted(groups.keys()):
-            rows = groups[(x, y)]
-            n = len(rows)
-
-            def col_mean(idx):
-                vals = []
-                for r in rows:
-                    if len(r) <= idx:
-                        continue
-                    try:
-                        vals.append(float(r[idx]))
-                    except ValueError:
-                        pass
-                return statistics.mean(vals) if vals else 0.0
-
-            # Column map:
-            # 0=prop_inch, 1=X, 2=Y, 3=Torque1, 4=Thrust1, 5=Omega1,
-            # 6=Airspeed, 7=AoA, 8=AoSS, 9=V_tan, 10=V_rad, 11=V_axial,
-            # 12=Torque2, 13=Thrust2, 14=Omega2
-            prop_avg = col_mean(0)
-            trq1     = col_mean(3)
-            thr1     = col_mean(4)
-            air      = col_mean(6)
-            aoa      = col_mean(7)
-            aoss     = col_mean(8)
-            vtan     = col_mean(9)
-            vrad     = col_mean(10)
-            vax      = col_mean(11)
-            trq2     = col_mean(12)
-            thr2     = col_mean(13)
-
-            # write per-(x,y) mean row
-            w.writerow([
-                n, round(prop_avg, 3), round(dr_ratio_val, 1), x, y,
-                round(trq1, 2), round(thr1, 2),
-                round(air, 2), round(aoa, 2), round(aoss, 2),
-                round(vtan, 2), round(vrad, 2), round(vax, 2),
-                round(trq2, 2), round(thr2, 2),
-            ])
-
-            # accumulate for induced-speed and total loads
-            var_list.append((x / 1000.0) * vax)   # same scheme as single-prop
-            trq_total_list.append(trq1 + trq2)    # total torque
-            thr_total_list.append(thr1 + thr2)    # total thrust
+        for i in range(ng):
+            row = [
+                int(counts[i]), round(float(prop_avg[i]), 3), round(dr_ratio_val, 1), int(xs[i]), int(ys[i]),
+                round(float(trq1[i]), 2), round(float(thr1[i]), 2),
+                round(float(air[i]), 2), round(float(aoa[i]), 2), round(float(aoss[i]), 2),
+                round(float(vtan[i]), 2), round(float(vrad[i]), 2), round(float(vax[i]), 2),
+                round(float(trq2[i]), 2), round(float(thr2[i]), 2),
+                chord_raw_s[i][0], chord_raw_s[i][1],
+            ]
+            for k in kin:
+                row += [
+                    f"{k['chord_eff'][i]:.2f}", f"{k['chord_len_eff'][i]:.2f}",
+                    f"{k['helix'][i]:.2f}", f"{k['alpha'][i]:.2f}",
+                    f"{k['total'][i]:.2f}", f"{k['v_lift'][i]:.2f}", f"{k['v_drag'][i]:.2f}",
+                    f"{k['cl'][i]:.3f}", f"{k['cd'][i]:.3f}", f"{k['re'][i]:.0f}",
+                ]
+            row.append(f"{v_2d[i]:.2f}")
+            w.writerow(row)
 
             try:
-                window.update_plot_ax2(int(x), float(vtan), float(vrad), float(vax))
+                window.update_plot_ax2(int(xs[i]), float(vtan[i]), float(vrad[i]), float(vax[i]))
             except Exception:
                 pass
 
-    # ---------------- omega modes for each prop ----------------
-    omega1_list, omega2_list = _read_omegas_tandem_separate(log_path)
-    omega1_m = _omega_mode(omega1_list)
-    omega2_m = _omega_mode(omega2_list)
-
-    # ---------------- mean torques (per prop) and powers ----------------
-    trq1_all = []
-    trq2_all = []
-    for tokens in _read_rows_space_delimited(log_path):
-        if len(tokens) > 3:
-            try:
-                trq1_all.append(float(tokens[3]))
-            except ValueError:
-                pass
-        if len(tokens) > 12:
-            try:
-                trq2_all.append(float(tokens[12]))
-            except ValueError:
-                pass
-
-    M1 = statistics.mean(trq1_all) if trq1_all else 0.0
-    M2 = statistics.mean(trq2_all) if trq2_all else 0.0
-
-    P1 = M1 * float(omega1_m)
-    P2 = M2 * float(omega2_m)
+    # accumulate for induced-speed and total loads (same scheme as single-prop)
+    var_list = ((xs / 1000.0) * vax).tolist()
+    trq_total_list = (trq1 + trq2).tolist()    # total torque per section (M1 + M2)
+    thr_total_list = (thr1 + thr2).tolist()    # total thrust per section (T1 + T2)
 
     # ---------------- total induced metrics via _finalize_metrics ----------------
     # Use an equivalent omega for total metrics (only affects Ct, Cp, P_total)
@@ -220,6 +317,11 @@ def _tandem_average_file(window):
         # Per-prop metrics
         w.writerow(["Omega1",                f"{float(omega1_m):.2f}",   "rad/s"])
         w.writerow(["Omega2",                f"{float(omega2_m):.2f}",   "rad/s"])
+        w.writerow(["Omega1_dispersion",     f"{om1.dispersion:.2f}",    "rad/s"])
+        w.writerow(["Omega2_dispersion",     f"{om2.dispersion:.2f}",    "rad/s"])
+        w.writerow(["Omega1_drift",          f"{om1.drift_pct:.2f}",     "%"])
+        w.writerow(["Omega2_drift",          f"{om2.drift_pct:.2f}",     "%"])
+        w.writerow(["Omega_estimator",       om1.method,                 ""])
         #w.writerow(["Torque1_mean",          f"{M1:.3f}",                "Nm"])
         #w.writerow(["Torque2_mean",          f"{M2:.3f}",                "Nm"])
         w.writerow(["Power1",                f"{P1:.3f}",                "W"])
@@ -235,11 +337,25 @@ def _tandem_average_file(window):
         w.writerow(["Ct_total",              f"{res['Ct']:.7f}",         ""])
         w.writerow(["Cp_total",              f"{res['Cp']:.7f}",         ""])
 
+    # same summary, machine-readable (MainWindow stores it in the run manifest)
+    window.summary_metrics = {
+        "Omega1": float(omega1_m), "Omega2": float(omega2_m),
+        "Omega1_dispersion": om1.dispersion, "Omega2_dispersion": om2.dispersion,
+        "Omega1_drift": om1.drift_pct, "Omega2_drift": om2.drift_pct,
+        "Omega_estimator": om1.method,
+        "Power1": P1, "Power2": P2,
+        "Average_induced_speed": res['vi'], "Induced_power_total": res['Pi'],
+        "Power_total": res['P'], "Efficiency_total": res['nu'],
+        "Airspeed_ratio": res['vv'], "V_mass": res['vm'], "V_max_mean": res['v_max_mean'],
+        "Ct_total": res['Ct'], "Cp_total": res['Cp'],
+    }
+
     # ---------------- plots ----------------
     try:
         window.counter = 0
         window.cnv.draw_ax2()
-        window.cnv.save_only_second_plot(os.path.join(window.path, plot_filename))
+        # summary png is drawn headless in a worker process from the mean file
+        window.report_renderer.submit(out_path, os.path.join(window.path, plot_filename), window.today_dt)
     except Exception as e:
         print(f"Plot 2 export failed in tandem: {e}")
 
@@ -254,31 +370,6 @@ def _tandem_average_file(window):
 # (same functionality as your current process_data, but modular)
 # ============================================================
 
-def _read_omega_values(log_path):
-    vals = []
-    try:
-        for tokens in _read_rows_space_delimited(log_path):
-            if len(tokens) > 5:
-                try:
-                    vals.append(float(tokens[5]))
-                except ValueError:
-                    pass
-    except FileNotFoundError as e:
-        print(f"Error reading log file: {e}")
-    return vals
-
-
-def _omega_mode(values):
-    if not values:
-        print("No omega values found in the log file.")
-        return 0.0
-    try:
-        return statistics.mode(values)
-    except statistics.StatisticsError as e:
-        print(f"Could not compute mode: {e}. Using mean instead.")
-        return statistics.mean(values)
-
-
 def _aggregate_at_x(log_path, x_mp):
     """
     Collect rows with X == x_mp and compute means
@@ -482,9 +573,9 @@ def _single_prop_full(window):
         "CL", "CD", "Re", "v_a+r_mps",
     ]
 
-    # Omega (mode) from raw log (column 5) — used in summary only
-    omega_values = _read_omega_values(log_path)    # existing helper reads col 5 :contentReference[oaicite:1]{index=1}
-    omega_m = _omega_mode(omega_values)
+    # Omega from raw log (column 5) — kinematics and summary
+    om = _estimate_omega(window, _load_log_array(log_path)[0], 5)
+    omega_m = om.value
     
     try:
         rot_dir = int(getattr(getattr(window, "shared_data", object()), "rotation_dir", 1) or 1)
@@ -567,6 +658,9 @@ def _single_prop_full(window):
         w.writerow([])
         #w.writerow(["metric", "value", "unit"])
         w.writerow(["Omega",                 f"{float(omega_m):.2f}",     "rad/s"])
+        w.writerow(["Omega_dispersion",      f"{om.dispersion:.2f}",      "rad/s"])
+        w.writerow(["Omega_drift",           f"{om.drift_pct:.2f}",       "%"])
+        w.writerow(["Omega_estimator",       om.method,                   ""])
         w.writerow(["Induced_power",         f"{res['Pi']:.2f}",          "W"])
         w.writerow(["Power",                 f"{res['P']:.2f}",           "W"])
         w.writerow(["Efficiency",            f"{res['nu']:.2f}",          "%"])
@@ -579,9 +673,22 @@ def _single_prop_full(window):
         w.writerow(['Air_density',			 window.shared_data.rho,		  'kg/m3'])
         w.writerow(['Air_kin_viscosity',	 window.shared_data.kin_visc,   'x10-5 m2/s'])
 
+    # same summary, machine-readable (MainWindow stores it in the run manifest)
+    window.summary_metrics = {
+        "Omega": float(omega_m), "Omega_dispersion": om.dispersion,
+        "Omega_drift": om.drift_pct, "Omega_estimator": om.method,
+        "Induced_power": res['Pi'], "Power": res['P'],
+        "Efficiency": res['nu'], "Average_induced_speed": res['vi'],
+        "Airspeed_ratio": res['vv'], "V_mass": res['vm'], "V_max_mean": res['v_max_mean'],
+        "Ct": res['Ct'], "Cp": res['Cp'],
+        "Air_density": float(window.shared_data.rho),
+        "Air_kin_viscosity": float(window.shared_data.kin_visc),
+    }
+
     window.counter = 0
     window.cnv.draw_ax2()
-    window.cnv.save_only_second_plot(os.path.join(window.path, plot_filename))
+    # summary png is drawn headless in a worker process from the mean file
+    window.report_renderer.submit(out_path, os.path.join(window.path, plot_filename), window.today_dt)
 
     return out_path
 
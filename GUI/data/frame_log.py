@@ -0,0 +1,90 @@
+# data/frame_log.py
+"""
+Per-frame log written next to the series CSV as <log>_frames.csv.
+
+The series CSV holds Δx bin means in the layout data_processing expects and
+stays as it is; this file keeps every frame the worker received while a sweep
+was running, with its timing (utils/clock_sync.py):
+
+  t_ns        time.monotonic_ns() when the line was read from the port
+  t_mcu_ns    MCU tick aligned to the same clock (0: firmware sends no tick)
+  x, y        steps, as reported in the frame
+  thr1 ...    the remaining Frame fields in SI units (utils/frame.py)
+
+Sweeps are consecutive blocks; a new sweep shows as a jump in t_ns. The
+stamps are only comparable within one program run (monotonic clock).
+
+load_frame_log() reads it back as a NumPy structured array for rate / gap /
+motion-speed analyses, e.g. FrameTiming over t_ns or np.diff(x) / np.diff(t).
+"""
+from __future__ import annotations
+
+import csv
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from utils.frame import FRAME_FIELDS, TIME_FIELDS, Frame
+
+FRAME_LOG_SUFFIX = "_frames.csv"
+FRAME_LOG_HEADER = TIME_FIELDS + FRAME_FIELDS
+FLUSH_EVERY = 50                # frames between flushes (~1 s at 50 Hz)
+
+
+def frame_log_path(csv_path: os.PathLike) -> Path:
+    """<dir>/<log stem>_frames.csv for the series CSV csv_path."""
+    p = Path(csv_path)
+    return p.with_name(p.stem + FRAME_LOG_SUFFIX)
+
+
+class FrameLog:
+    """Append-only writer; opened by the measuring worker together with the series CSV."""
+
+    def __init__(self, path: os.PathLike):
+        self.path = Path(path)
+        new = not self.path.exists()
+        self._file = open(self.path, "a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._unflushed = 0
+        if new:
+            self._writer.writerow(FRAME_LOG_HEADER)
+
+    def write(self, f: Frame):
+        self._writer.writerow((f.t_ns, f.t_mcu_ns, f.x, f.y, f.thr1, f.trq1, f.rpm1,
+                               f.airspeed, f.aoa_raw, f.aoa_abs, f.aoss_raw, f.aoss_abs,
+                               f.thr2, f.trq2, f.rpm2))
+        self._unflushed += 1
+        if self._unflushed >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        self._file.flush()
+        self._unflushed = 0
+
+    def close(self):
+        try:
+            self._file.close()
+        except OSError:
+            pass
+
+
+def load_frame_log(path: os.PathLike) -> Optional[np.ndarray]:
+    """Structured array with the FRAME_LOG_HEADER fields (None if missing or empty)."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    dtype = [(n, "<i8") for n in TIME_FIELDS] + [(n, "<f8") for n in FRAME_FIELDS]
+    rows = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if len(row) != len(FRAME_LOG_HEADER) or row[0] == FRAME_LOG_HEADER[0]:
+                continue
+            try:
+                rows.append((int(row[0]), int(row[1]), *map(float, row[2:])))
+            except ValueError:
+                continue
+    if not rows:
+        return None
+    return np.array(rows, dtype=dtype)
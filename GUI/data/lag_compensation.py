@@ -0,0 +1,178 @@
+# data/lag_compensation.py
+"""
+Pitot / probe lag compensation ahead of the Δx binning.
+
+The flow channels of a frame (airspeed, AoA, AoSS) describe the flow at the
+position the probe had some time earlier: pressure has to travel down the
+tubing and the sensors filter. The worker bins each frame at the position in
+the same frame, so at sweep speed v the profile is shifted by v·delay and
+smeared, which is why sweeps are run slowly (measure_speed, feed_y =
+feed_xy / 3).
+
+LagCompensator undoes this per frame, using the frame timestamps
+(utils/clock_sync.py):
+
+  delay_s   pure transport delay: the frame is binned at the position the
+            probe had delay_s before it (interpolated in the recent position
+            history; at the very start, x - v·delay_s with the probe velocity
+            v fitted over the last VELOCITY_WINDOW_S)
+  tau_s     first-order sensor lag: flow channels are replaced by
+            y + tau_s·dy/dt (dy/dt from consecutive frames). It adds noise, but
+            the derivative terms of a bin telescope to (y_end - y_start) /
+            (t_end - t_start), so the bin mean stays smooth. 0 = off.
+
+Thrust, torque and RPM are properties of the prop, not of the probe position,
+and pass through unchanged. Both constants are rig settings (RIG_SCHEMA
+flow_lag_s / flow_tau_s, 0 = off); estimate_delay() calibrates delay_s from
+the frame logs of a slow and a fast sweep (tools/calibrate_lag.py).
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.frame import Frame
+
+FLOW_FIELDS = ("airspeed", "aoa_raw", "aoa_abs", "aoss_raw", "aoss_abs")
+MAX_DELAY_S = 2.0               # position history kept
+VELOCITY_WINDOW_S = 0.25        # position fit for the probe velocity
+MIN_DT_S = 1e-4                 # frames closer than this give no derivative
+
+
+# =============================================================================
+# Online stage (MeasuringWorker)
+# =============================================================================
+
+class LagCompensator:
+    """One sweep's compensation state; feed every frame in arrival order."""
+
+    def __init__(self, delay_s: float = 0.0, tau_s: float = 0.0):
+        if not 0.0 <= delay_s <= MAX_DELAY_S:
+            raise ValueError(f"Voolukanalite viide peab olema 0…{MAX_DELAY_S} s: {delay_s!r}")
+        if not tau_s >= 0.0:
+            raise ValueError(f"Anduri ajakonstant ei tohi olla negatiivne: {tau_s!r}")
+        self.delay_s = float(delay_s)
+        self.tau_s = float(tau_s)
+        self._hist: Deque[Tuple[float, float, float]] = deque()    # (t s, x, y)
+        self._prev: Optional[Tuple[float, Tuple[float, ...]]] = None
+        self.velocity = (0.0, 0.0)      # steps/s (x, y), last fit
+
+    @property
+    def enabled(self) -> bool:
+        return self.delay_s > 0.0 or self.tau_s > 0.0
+
+    def reset(self):
+        self._hist.clear()
+        self._prev = None
+        self.velocity = (0.0, 0.0)
+
+    def apply(self, f: Frame) -> Frame:
+        """
+        Compensated copy of f: position delayed by delay_s, flow channels
+        de-lagged by tau_s. f itself is returned when the stage is off, the
+        frame has no timestamp or its stamp is older than the previous one.
+        """
+        t_ns = f.t_sample_ns
+        if not self.enabled or not t_ns:
+            return f
+        t = t_ns * 1e-9
+        hist = self._hist
+        if hist and t < hist[-1][0]:
+            return f                        # out of order stamp
+        if not hist or t > hist[-1][0]:
+            hist.append((t, f.x, f.y))
+            keep = max(self.delay_s, VELOCITY_WINDOW_S) + VELOCITY_WINDOW_S
+            while len(hist) > 2 and hist[1][0] < t - keep:
+                hist.popleft()
+        # else: same stamp as the last frame (several lines completed by one read);
+        # it is placed from the history as it stands and does not extend it
+
+        x, y = f.x, f.y
+        if self.delay_s > 0.0:
+            x, y = self._position_at(t - self.delay_s)
+
+        flow = tuple(getattr(f, n) for n in FLOW_FIELDS)
+        out_flow = flow
+        if self.tau_s > 0.0:
+            prev = self._prev
+            if prev is not None and t - prev[0] > MIN_DT_S:
+                k = self.tau_s / (t - prev[0])
+                out_flow = tuple(v + k * (v - p) for v, p in zip(flow, prev[1]))
+            self._prev = (t, flow)
+
+        return Frame(x, y, f.thr1, f.trq1, f.rpm1, *out_flow, f.thr2, f.trq2, f.rpm2,
+                     t_ns=f.t_ns, t_mcu_ns=f.t_mcu_ns)
+
+    def _position_at(self, t: float) -> Tuple[float, float]:
+        hist = self._hist
+        if t >= hist[0][0]:
+            # newest first: the delay is short compared with the history
+            for i in range(len(hist) - 1, 0, -1):
+                t0, x0, y0 = hist[i - 1]
+                if t0 <= t:
+                    t1, x1, y1 = hist[i]
+                    a = (t - t0) / (t1 - t0)
+                    return x0 + a * (x1 - x0), y0 + a * (y1 - y0)
+        # history does not reach back yet (sweep start): extrapolate with the velocity
+        vx, vy = self._fit_velocity()
+        tn, xn, yn = hist[-1]
+        return xn - vx * (tn - t), yn - vy * (tn - t)
+
+    def _fit_velocity(self) -> Tuple[float, float]:
+        t_end = self._hist[-1][0]
+        pts = [p for p in self._hist if p[0] >= t_end - VELOCITY_WINDOW_S]
+        if len(pts) >= 2:
+            ts = np.array([p[0] for p in pts]) - t_end
+            A = np.vstack([ts, np.ones_like(ts)]).T
+            (vx, _), (vy, _) = (np.linalg.lstsq(A, np.array([p[k] for p in pts]), rcond=None)[0]
+                                for k in (1, 2))
+            self.velocity = (float(vx), float(vy))
+        return self.velocity
+
+
+# =============================================================================
+# Calibration (frame logs, data/frame_log.py)
+# =============================================================================
+
+def delayed_positions(log: np.ndarray, delay_s: float) -> Tuple[np.ndarray, np.ndarray]:
+    """x, y of every frame of a frame log moved back by delay_s (np.interp over its own track)."""
+    t = np.where(log["t_mcu_ns"] != 0, log["t_mcu_ns"], log["t_ns"]).astype(np.float64) * 1e-9
+    return np.interp(t - delay_s, t, log["x"]), np.interp(t - delay_s, t, log["y"])
+
+
+def binned_profile(x: np.ndarray, y: np.ndarray, values: np.ndarray,
+                   bin_steps: float) -> Dict[Tuple[int, int], float]:
+    """Mean of values per (x, y) cell of bin_steps (Y levels stay apart)."""
+    ix = np.floor(x / bin_steps).astype(np.int64)
+    iy = np.round(y / bin_steps).astype(np.int64)
+    keys, inv = np.unique(np.stack([ix, iy], axis=1), axis=0, return_inverse=True)
+    inv = inv.ravel()
+    sums = np.bincount(inv, weights=values)
+    counts = np.bincount(inv)
+    return {(int(k[0]), int(k[1])): s / c for k, s, c in zip(keys, sums, counts)}
+
+
+def estimate_delay(slow: np.ndarray, fast: np.ndarray, bin_steps: float,
+                   delays: Sequence[float], field: str = "airspeed") -> Tuple[float, np.ndarray]:
+    """
+    Delay that makes the binned profile of a fast sweep match a slow one.
+
+    slow / fast: frame logs (load_frame_log) over the same trajectory at two
+    feed rates. Both are shifted by each candidate delay (the slow one moves
+    less) and the mean squared difference of the binned `field` over the
+    shared cells is taken. Returns (best delay, error per candidate).
+    """
+    if len(slow) < 2 or len(fast) < 2:
+        raise ValueError("Kalibreerimiseks on vaja kahte mõõteraamide logi")
+    errors = np.full(len(delays), np.nan)
+    for i, d in enumerate(delays):
+        ref = binned_profile(*delayed_positions(slow, d), slow[field], bin_steps)
+        cur = binned_profile(*delayed_positions(fast, d), fast[field], bin_steps)
+        shared = ref.keys() & cur.keys()
+        if shared:
+            errors[i] = float(np.mean([(ref[k] - cur[k]) ** 2 for k in shared]))
+    if np.all(np.isnan(errors)):
+        raise ValueError("Logidel puuduvad ühised positsioonid")
+    return float(delays[int(np.nanargmin(errors))]), errors
@@ -0,0 +1,146 @@
+# data/omega_estimator.py
+"""
+Rotor speed (omega, rad/s) of a measurement series from the raw log samples.
+
+statistics.mode over float samples returns whichever value happens to repeat
+first, so the estimators here work on the whole column at once:
+
+  hist_mode     peak of a histogram with bin_width rad/s bins, refined to the
+                mean of the samples in the peak bin and its two neighbours
+                (only occupied bins are counted, so outliers cost nothing)
+  trimmed_mean  mean after dropping trim of the samples at each end
+  sweep_median  median of the per-sweep medians (robust to one bad sweep)
+
+Every estimate carries its dispersion (MAD scaled to a standard deviation,
+rad/s) and the drift of the per-sweep medians over the series (least-squares
+slope, first-to-last change in % of omega). With a single sweep the series is
+cut into DRIFT_SEGMENTS equal parts instead.
+
+Sweeps are told apart by the manifest row counts when they add up to the log,
+otherwise by X jumping back towards the center (each sweep runs outwards).
+"""
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+import numpy as np
+
+ESTIMATORS = ("hist_mode", "trimmed_mean", "sweep_median")
+DEFAULT_ESTIMATOR = "hist_mode"
+DEFAULT_BIN_WIDTH = 1.0          # rad/s
+DEFAULT_TRIM = 0.1               # fraction cut at each end
+MIN_OMEGA = 1.0                  # rad/s; slower samples are motor-off frames
+SWEEP_RESET_MM = 10.0            # X drop that starts a new sweep
+DRIFT_SEGMENTS = 4
+DRIFT_LIMIT_PCT = 2.0
+
+_MAD_TO_STD = 1.4826
+
+
+@dataclass
+class OmegaEstimate:
+    value: float                    # rad/s
+    method: str
+    dispersion: float               # rad/s (scaled MAD of the samples)
+    n: int                          # samples used
+    sweep_medians: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    drift: float = 0.0              # rad/s per sweep (or per segment)
+    drift_pct: float = 0.0          # first-to-last change over the series, % of value
+
+    @property
+    def drifting(self) -> bool:
+        return abs(self.drift_pct) > DRIFT_LIMIT_PCT
+
+    @property
+    def rpm(self) -> float:
+        return self.value * 60.0 / (2.0 * np.pi)
+
+
+def hist_mode(values, bin_width: float = DEFAULT_BIN_WIDTH) -> float:
+    v = np.asarray(values, dtype=np.float64)
+    v = v[np.isfinite(v)]
+    if not len(v):
+        return 0.0
+    if not bin_width > 0:
+        raise ValueError(f"Histogrammi sammu laius peab olema positiivne: {bin_width!r}")
+    idx = np.floor(v / bin_width)
+    bins, counts = np.unique(idx, return_counts=True)
+    peak = bins[int(np.argmax(counts))]
+    return float(v[np.abs(idx - peak) <= 1].mean())
+
+
+def trimmed_mean(values, trim: float = DEFAULT_TRIM) -> float:
+    v = np.sort(np.asarray(values, dtype=np.float64))
+    if not len(v):
+        return 0.0
+    if not 0.0 <= trim < 0.5:
+        raise ValueError(f"Kärbitav osa peab olema vahemikus [0, 0.5): {trim!r}")
+    k = int(trim * len(v))
+    return float(v[k:len(v) - k].mean())
+
+
+def sweep_ids(x_mm, sweep_rows: Optional[Sequence[int]] = None,
+              reset_mm: float = SWEEP_RESET_MM) -> np.ndarray:
+    """Sweep number of every log row (manifest row counts, else X resets)."""
+    x = np.asarray(x_mm, dtype=np.float64)
+    if sweep_rows and sum(sweep_rows) == len(x):
+        return np.repeat(np.arange(len(sweep_rows)), sweep_rows)
+    if not len(x):
+        return np.zeros(0, dtype=np.int64)
+    jumps = np.diff(x) < -reset_mm
+    return np.concatenate(([0], np.cumsum(jumps))).astype(np.int64)
+
+
+def group_medians(values, gid) -> np.ndarray:
+    """Median of values per group id (ids 0..k, every id present)."""
+    v = np.asarray(values, dtype=np.float64)
+    g = np.asarray(gid, dtype=np.int64)
+    if not len(v):
+        return np.zeros(0)
+    order = np.lexsort((v, g))
+    v, g = v[order], g[order]
+    starts = np.flatnonzero(np.concatenate(([True], g[1:] != g[:-1])))
+    counts = np.diff(np.append(starts, len(v)))
+    lo = starts + (counts - 1) // 2
+    hi = starts + counts // 2
+    return (v[lo] + v[hi]) / 2.0
+
+
+def estimate_omega(values, x_mm=None, method: str = DEFAULT_ESTIMATOR,
+                   bin_width: float = DEFAULT_BIN_WIDTH, trim: float = DEFAULT_TRIM,
+                   sweep_rows: Optional[Sequence[int]] = None) -> OmegaEstimate:
+    """
+    values: omega column of the raw log (rad/s, log order). x_mm: X column of the
+    same rows for sweep detection (None: the series is one sweep).
+    """
+    if method not in ESTIMATORS:
+        raise ValueError(f"Tundmatu pöörlemiskiiruse hindaja: {method!r}")
+    v = np.asarray(values, dtype=np.float64)
+    sweeps = sweep_ids(x_mm if x_mm is not None else np.zeros(len(v)), sweep_rows)
+    if len(sweeps) != len(v):
+        sweeps = np.zeros(len(v), dtype=np.int64)
+    keep = np.isfinite(v) & (np.abs(v) > MIN_OMEGA)
+    v, sweeps = v[keep], sweeps[keep]
+    if not len(v):
+        print("No omega values found in the log file.")
+        return OmegaEstimate(value=0.0, method=method, dispersion=0.0, n=0)
+
+    # renumber sweeps that kept samples; one sweep -> equal segments for the drift
+    _, sweeps = np.unique(sweeps, return_inverse=True)
+    sweeps = sweeps.reshape(-1)
+    drift_ids = sweeps if sweeps.max() > 0 else (np.arange(len(v)) * DRIFT_SEGMENTS) // len(v)
+    medians = group_medians(v, sweeps)
+    trend = group_medians(v, drift_ids)
+
+    if method == "hist_mode":
+        value = hist_mode(v, bin_width)
+    elif method == "trimmed_mean":
+        value = trimmed_mean(v, trim)
+    else:
+        value = float(np.median(medians))
+
+    dispersion = float(_MAD_TO_STD * np.median(np.abs(v - np.median(v))))
+    drift = float(np.polyfit(np.arange(len(trend)), trend, 1)[0]) if len(trend) > 1 else 0.0
+    drift_pct = drift * (len(trend) - 1) / value * 100.0 if value else 0.0
+    return OmegaEstimate(value=value, method=method, dispersion=dispersion, n=int(len(v)),
+                         sweep_medians=medians, drift=round(drift, 9) + 0.0,
+                         drift_pct=round(float(drift_pct), 9) + 0.0)
@@ -0,0 +1,226 @@
+# data/profile_store.py
+"""
+Named rig profiles (calibration, arm lengths, axis limits, AoA/AoSS trims)
+with per-prop presets, stored as one versioned JSON document:
+
+    {
+      "schema": 1,
+      "active": "stend-A",
+      "profiles": {
+        "stend-A": {
+          "rig":   {"ratio": 24.9955, "x_center": 328, ...},
+          "props": {"APC 10x7": {"diameter_in": 10.0, "rotation_dir": -1, ...}}
+        }
+      }
+    }
+
+Every field is checked against RIG_SCHEMA / PROP_SCHEMA on load and save;
+unknown keys are dropped, missing ones fall back to the config.py defaults.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import config as _cfg
+
+SCHEMA_VERSION = 1
+DEFAULT_PATH = Path.home() / "Desktop" / "profiilid" / "profiles.json"
+
+# field -> (type, default); names match SharedData attributes
+RIG_SCHEMA: Dict[str, Tuple[type, Any]] = {
+    "first_trq_arm_length":  (float, _cfg.first_trq_arm_length_default),
+    "first_thr_arm_length":  (float, _cfg.first_thr_arm_length_default),
+    "second_trq_arm_length": (float, _cfg.second_trq_arm_length_default),
+    "second_thr_arm_length": (float, _cfg.second_thr_arm_length_default),
+    "first_trq_cal_val":     (float, _cfg.first_trq_cal_val_default),
+    "first_thr_cal_val":     (float, _cfg.first_thr_cal_val_default),
+    "second_trq_cal_val":    (float, _cfg.second_trq_cal_val_default),
+    "second_thr_cal_val":    (float, _cfg.second_thr_cal_val_default),
+    "no_of_props":           (int,   _cfg.no_of_props_default),
+    "probe_offset":          (float, _cfg.probe_offset_default),
+    "rho":                   (float, _cfg.rho_default),
+    "kin_visc":              (float, _cfg.kin_visc_default),
+    "ratio":                 (float, _cfg.ratio_default),
+    "x_center":              (float, _cfg.x_center_default),
+    "y_max":                 (float, _cfg.y_max_default),
+    "x_max_speed":           (int,   _cfg.x_max_speed_default),
+    "y_max_speed":           (int,   _cfg.y_max_speed_default),
+    "x_max_accel":           (int,   _cfg.x_max_accel_default),
+    "y_max_accel":           (int,   _cfg.y_max_accel_default),
+    "max_number_of_samples": (int,   _cfg.max_number_of_samples_default),
+    "aoa_trim":              (float, _cfg.aoa_trim_default),
+    "aoa_limit":             (int,   _cfg.aoa_limit_default),
+    "aoss_ratio":            (float, 13.3),
+    "aoss_min_limit_deg":    (float, -32.0),
+    "aoss_max_limit_deg":    (float, 0.0),
+    "aoss_enabled":          (bool,  _cfg.aoss_enabled_default),
+    "min_pwm":               (int,   _cfg.min_pwm_default),
+    "max_pwm":               (int,   _cfg.max_pwm_default),
+    "pwm_ramp_ms":           (int,   _cfg.pwm_ramp_ms_default),
+    "flow_lag_s":            (float, _cfg.flow_lag_s_default),
+    "flow_tau_s":            (float, _cfg.flow_tau_s_default),
+}
+
+PROP_SCHEMA: Dict[str, Tuple[type, Any]] = {
+    "diameter_in":      (float, 10.0),
+    "rotation_dir":     (int,   _cfg.rotation_dir),
+    "safety_over_prop": (float, _cfg.safety_over_prop_default),
+    "x_delta":          (float, _cfg.x_delta_default),
+    "first_throttle":   (int,   0),
+    "second_throttle":  (int,   0),
+    "prop_file":        (str,   ""),
+}
+
+
+def _coerce(name: str, typ: type, value: Any) -> Any:
+    if typ is bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)) and value in (0, 1):
+            return bool(value)
+        raise ValueError(f"Väli '{name}' peab olema tõeväärtus, saadi {value!r}")
+    if typ is int:
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or float(value) != int(value):
+            raise ValueError(f"Väli '{name}' peab olema täisarv, saadi {value!r}")
+        return int(value)
+    if typ is float:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Väli '{name}' peab olema arv, saadi {value!r}")
+        return float(value)
+    if not isinstance(value, typ):
+        raise ValueError(f"Väli '{name}' peab olema tekst, saadi {value!r}")
+    return value
+
+
+def validate_section(data: Dict[str, Any], schema: Dict[str, Tuple[type, Any]]) -> Dict[str, Any]:
+    """Return a complete, type-checked copy of data (defaults filled, unknown keys dropped)."""
+    if not isinstance(data, dict):
+        raise ValueError("Profiili sektsioon peab olema JSON objekt")
+    out = {}
+    for name, (typ, default) in schema.items():
+        out[name] = _coerce(name, typ, data[name]) if name in data else default
+    return out
+
+
+def _migrate(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Bring older documents up to SCHEMA_VERSION (no older versions exist yet)."""
+    version = doc.get("schema")
+    if version != SCHEMA_VERSION:
+        raise ValueError(f"Tundmatu profiilifaili versioon: {version!r} (oodati {SCHEMA_VERSION})")
+    return doc
+
+
+class ProfileStore:
+    """JSON-backed store of rig profiles; writes are atomic (temp file + replace)."""
+
+    def __init__(self, path: Optional[os.PathLike] = None):
+        self.path = Path(path) if path else DEFAULT_PATH
+        self.active: Optional[str] = None
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+
+    # ---------- file I/O ----------
+
+    def load(self) -> "ProfileStore":
+        if not self.path.exists():
+            return self
+        with open(self.path, encoding="utf-8") as f:
+            doc = _migrate(json.load(f))
+        profiles = {}
+        for name, prof in (doc.get("profiles") or {}).items():
+            try:
+                profiles[name] = {
+                    "rig": validate_section(prof.get("rig", {}), RIG_SCHEMA),
+                    "props": {p: validate_section(v, PROP_SCHEMA)
+                              for p, v in (prof.get("props") or {}).items()},
+                }
+            except (ValueError, AttributeError) as e:
+                print(f"[profiles] skipping invalid profile '{name}': {e}")
+        self._profiles = profiles
+        active = doc.get("active")
+        self.active = active if active in profiles else None
+        return self
+
+    def save(self):
+        doc = {"schema": SCHEMA_VERSION, "active": self.active, "profiles": self._profiles}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".profiles.", dir=str(self.path.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(doc, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    # ---------- rig profiles ----------
+
+    def names(self) -> List[str]:
+        return sorted(self._profiles)
+
+    def rig(self, name: str) -> Dict[str, Any]:
+        return dict(self._profiles[name]["rig"])
+
+    def put_rig(self, name: str, shared_data) -> None:
+        """Snapshot the current SharedData into profile `name` (props are kept)."""
+        rig = validate_section({k: getattr(shared_data, k) for k in RIG_SCHEMA if hasattr(shared_data, k)},
+                               RIG_SCHEMA)
+        prof = self._profiles.setdefault(name, {"rig": {}, "props": {}})
+        prof["rig"] = rig
+
+    def delete(self, name: str):
+        self._profiles.pop(name, None)
+        if self.active == name:
+            self.active = None
+
+    def apply_rig(self, name: str, shared_data) -> None:
+        for k, v in self._profiles[name]["rig"].items():
+            setattr(shared_data, k, v)
+        self.active = name
+
+    # ---------- per-prop presets ----------
+
+    def prop_names(self, name: str) -> List[str]:
+        return sorted(self._profiles.get(name, {}).get("props", {}))
+
+    def prop(self, name: str, prop: str) -> Dict[str, Any]:
+        return dict(self._profiles[name]["props"][prop])
+
+    def put_prop(self, name: str, prop: str, values: Dict[str, Any]) -> None:
+        prof = self._profiles.setdefault(name, {"rig": validate_section({}, RIG_SCHEMA), "props": {}})
+        prof["props"][prop] = validate_section(values, PROP_SCHEMA)
+
+
+def mcu_config_commands(sd) -> List[str]:
+    """
+    All MCU configuration for SharedData `sd`, in handshake order (formats as in the widgets).
+
+    No trimAoSS: the AoSS axis is zeroed on the rig (zeroAoSS, widgets/aoa_aoss.py)
+    and aoss_trim is not part of a rig profile.
+    """
+    cmds = [
+        'init|%.2f|%.2f|%.2f|%.2f|%.2f|%.2f|%.2f|%.2f|%.0f' % (
+            sd.first_trq_arm_length, sd.first_thr_arm_length,
+            sd.first_trq_cal_val, sd.first_thr_cal_val,
+            sd.second_trq_arm_length, sd.second_thr_arm_length,
+            sd.second_trq_cal_val, sd.second_thr_cal_val,
+            sd.no_of_props),
+        'l|%d|%d|%d|%d|%d|%d' % (
+            sd.x_center * sd.ratio, sd.y_max * sd.ratio,
+            sd.x_max_speed, sd.y_max_speed, sd.x_max_accel, sd.y_max_accel),
+        f"trimAoA|{float(sd.aoa_trim):.6f}",
+        f"AoAlim|{int(sd.aoa_limit):d}",
+        f"setAoSSRatio|{float(getattr(sd, 'aoss_ratio', 13.3)):.6f}",
+    ]
+    mn = float(getattr(sd, "aoss_min_limit_deg", -32.0))
+    mx = float(getattr(sd, "aoss_max_limit_deg", 0.0))
+    cmds.append(f"setAoSSLimits|{min(mn, mx):.2f}|{max(mn, mx):.2f}")
+    cmds.append("enableAoSS" if sd.aoss_enabled else "disableAoSS")
+    cmds.append('setRamp|%d' % sd.pwm_ramp_ms)
+    return cmds
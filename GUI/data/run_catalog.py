@@ -0,0 +1,347 @@
+# data/run_catalog.py
+"""
+SQLite index over the log archive (~/Desktop/logid/<run dir>/...), one row per
+run folder with the fields people search by:
+
+  prop_diameter_in, dr_ratio, tandem, rpm / omega, power, efficiency,
+  induced_speed, ct, cp, rho, status, profile, started_at
+
+Values come from manifest.json (run + results sections). Folders written
+before manifests existed fall back to the _mean.csv (prop_inch / dr_ratio
+columns and the summary block at the end) and the folder name for the date.
+
+update() only re-reads folders whose manifest / mean file changed since the
+last scan, so keeping the catalog current is cheap even with thousands of runs.
+"""
+from __future__ import annotations
+
+import csv
+import datetime
+import json
+import math
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from data.run_manifest import MANIFEST_NAME, load_manifest
+
+DEFAULT_ROOT = Path.home() / "Desktop" / "logid"
+DB_NAME = "catalog.sqlite"
+CATALOG_VERSION = 1
+
+# (column, sql type); run_dir is the primary key
+COLUMNS = (
+    ("run_dir", "TEXT PRIMARY KEY"),
+    ("name", "TEXT"),
+    ("source", "TEXT"),            # 'manifest' or 'mean_csv'
+    ("stamp", "REAL"),             # newest mtime of manifest / mean file at index time
+    ("started_at", "TEXT"),
+    ("status", "TEXT"),
+    ("prop_diameter_in", "REAL"),
+    ("dr_ratio", "REAL"),
+    ("tandem", "INTEGER"),
+    ("sweeps", "INTEGER"),
+    ("throttle1_pct", "REAL"),
+    ("throttle2_pct", "REAL"),
+    ("profile", "TEXT"),
+    ("prop_file", "TEXT"),
+    ("rho", "REAL"),
+    ("omega", "REAL"),
+    ("rpm", "REAL"),
+    ("power", "REAL"),
+    ("efficiency", "REAL"),
+    ("induced_speed", "REAL"),
+    ("ct", "REAL"),
+    ("cp", "REAL"),
+    ("log_file", "TEXT"),
+    ("mean_file", "TEXT"),
+    ("metrics_json", "TEXT"),      # full summary for anything not in a column
+)
+COLUMN_NAMES = tuple(c for c, _ in COLUMNS)
+
+# catalog column -> summary keys (single prop, tandem)
+_METRIC_KEYS = {
+    "omega":         ("Omega", "Omega1"),
+    "power":         ("Power", "Power_total"),
+    "efficiency":    ("Efficiency", "Efficiency_total"),
+    "induced_speed": ("Average_induced_speed",),
+    "ct":            ("Ct", "Ct_total"),
+    "cp":            ("Cp", "Cp_total"),
+    "rho":           ("Air_density",),
+}
+
+# search tolerances for the "equals" filters (values are typed in the GUI with 1-2 decimals)
+DIAMETER_TOL_IN = 0.05
+DR_TOL = 0.005
+
+
+def _float(v) -> Optional[float]:
+    try:
+        f = float(v)
+    except (TypeError, ValueError):
+        return None
+    return f if math.isfinite(f) else None
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def _mean_file(run_dir: Path, manifest: Optional[Dict[str, Any]]) -> Optional[Path]:
+    if manifest and manifest.get("mean_file"):
+        p = run_dir / manifest["mean_file"]
+        if p.exists():
+            return p
+    found = sorted(run_dir.glob("*_mean.csv"))
+    return found[0] if found else None
+
+
+def _started_from_name(name: str) -> Optional[str]:
+    """Run folders are named dd-mm-YYYY-HH:MM:SS."""
+    try:
+        return datetime.datetime.strptime(name, "%d-%m-%Y-%H:%M:%S").isoformat(timespec="seconds")
+    except ValueError:
+        return None
+
+
+def read_mean_summary(mean_path: Path) -> Dict[str, Any]:
+    """
+    Summary block and first data row of a _mean.csv:
+    {"metrics": {"Omega": 612.3, ...}, "prop_inch": 16.0, "dr_ratio": 0.8}
+    """
+    metrics: Dict[str, float] = {}
+    first: Optional[Dict[str, str]] = None
+    header: Optional[List[str]] = None
+    in_summary = False
+    try:
+        with open(mean_path, newline="") as f:
+            for row in csv.reader(f):
+                if not row or not any(c.strip() for c in row):
+                    if header is not None:
+                        in_summary = True
+                    continue
+                if header is None:
+                    header = [c.strip() for c in row]
+                    continue
+                if in_summary:
+                    val = _float(row[1]) if len(row) > 1 else None
+                    if val is not None:
+                        metrics[row[0].strip()] = val
+                elif first is None:
+                    first = dict(zip(header, row))
+    except OSError:
+        pass
+    first = first or {}
+    return {"metrics": metrics,
+            "prop_inch": _float(first.get("prop_inch")),
+            "dr_ratio": _float(first.get("dr_ratio"))}
+
+
+def _pick(metrics: Dict[str, Any], keys) -> Optional[float]:
+    for k in keys:
+        v = _float(metrics.get(k))
+        if v is not None:
+            return v
+    return None
+
+
+def describe_run(run_dir: os.PathLike) -> Optional[Dict[str, Any]]:
+    """Catalog row for one run folder, or None if it holds no log / manifest."""
+    run_dir = Path(run_dir)
+    manifest = load_manifest(run_dir)
+    mean_path = _mean_file(run_dir, manifest)
+    if manifest is None and mean_path is None:
+        return None
+
+    row: Dict[str, Any] = dict.fromkeys(COLUMN_NAMES)
+    row["run_dir"] = str(run_dir.resolve())
+    row["name"] = run_dir.name
+    row["stamp"] = max(_mtime(run_dir / MANIFEST_NAME), _mtime(mean_path) if mean_path else 0.0)
+    row["mean_file"] = mean_path.name if mean_path else None
+    summary = read_mean_summary(mean_path) if mean_path else {"metrics": {}, "prop_inch": None, "dr_ratio": None}
+
+    if manifest is not None:
+        run = manifest.get("run") or {}
+        timing = manifest.get("timing") or {}
+        metrics = dict(summary["metrics"])
+        metrics.update(manifest.get("results") or {})
+        row.update(
+            source="manifest",
+            started_at=timing.get("started_at"),
+            status=manifest.get("status"),
+            prop_diameter_in=_float(run.get("prop_diameter_in")),
+            dr_ratio=_float(run.get("dr_ratio")),
+            tandem=int(bool(run.get("tandem"))),
+            sweeps=run.get("sweeps"),
+            throttle1_pct=_float(run.get("throttle1_pct")),
+            throttle2_pct=_float(run.get("throttle2_pct")),
+            profile=run.get("profile"),
+            prop_file=run.get("prop_file"),
+            log_file=manifest.get("log_file"),
+        )
+        rho_setting = _float((manifest.get("settings") or {}).get("rho"))
+    else:
+        metrics = summary["metrics"]
+        logs = [p.name for p in run_dir.glob("log*.csv") if not p.name.endswith(("_mean.csv", "_ct.csv", "_frames.csv"))]
+        row.update(
+            source="mean_csv",
+            started_at=_started_from_name(run_dir.name),
+            status="completed" if metrics else None,
+            prop_diameter_in=summary["prop_inch"],
+            dr_ratio=summary["dr_ratio"],
+            tandem=int("Omega2" in metrics),
+            log_file=logs[0] if logs else None,
+        )
+        rho_setting = None
+
+    for col, keys in _METRIC_KEYS.items():
+        row[col] = _pick(metrics, keys)
+    if row["rho"] is None:
+        row["rho"] = rho_setting
+    if row["omega"] is not None:
+        row["rpm"] = row["omega"] * 60.0 / (2.0 * math.pi)
+    row["metrics_json"] = json.dumps(metrics, ensure_ascii=False)
+    return row
+
+
+class RunCatalog:
+    """SQLite catalog of run folders under `root`."""
+
+    def __init__(self, root: Optional[os.PathLike] = None, db_path: Optional[os.PathLike] = None):
+        self.root = Path(root) if root else DEFAULT_ROOT
+        self.db_path = Path(db_path) if db_path else self.root / DB_NAME
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self._create()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _create(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != CATALOG_VERSION:
+            # the catalog is only a cache of the folders, rebuild on any layout change
+            self.conn.execute("DROP TABLE IF EXISTS runs")
+        cols = ", ".join(f"{c} {t}" for c, t in COLUMNS)
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS runs ({cols})")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS runs_prop ON runs (prop_diameter_in, dr_ratio, rpm)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS runs_rpm ON runs (rpm)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS runs_started ON runs (started_at)")
+        self.conn.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+        self.conn.commit()
+
+    # ---------- indexing ----------
+
+    def _store(self, row: Dict[str, Any]):
+        marks = ", ".join("?" for _ in COLUMN_NAMES)
+        self.conn.execute(f"INSERT OR REPLACE INTO runs ({', '.join(COLUMN_NAMES)}) VALUES ({marks})",
+                          [row[c] for c in COLUMN_NAMES])
+
+    def index_run(self, run_dir: os.PathLike) -> bool:
+        """(Re)index one folder right away, e.g. after process_data(). Returns True if stored."""
+        row = describe_run(run_dir)
+        if row is None:
+            return False
+        self._store(row)
+        self.conn.commit()
+        return True
+
+    def update(self, rebuild: bool = False) -> Dict[str, int]:
+        """Scan root; re-read only new / changed folders and drop vanished ones."""
+        if rebuild:
+            self.conn.execute("DELETE FROM runs")
+        known = {r["run_dir"]: r["stamp"] for r in self.conn.execute("SELECT run_dir, stamp FROM runs")}
+        seen = set()
+        added = changed = 0
+        try:
+            entries = list(os.scandir(self.root))
+        except OSError:
+            entries = []
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            run_dir = Path(entry.path).resolve()
+            key = str(run_dir)
+            manifest_mtime = _mtime(run_dir / MANIFEST_NAME)
+            if key in known:
+                seen.add(key)
+                # cheap check first: nothing newer than what we indexed -> skip
+                newest = manifest_mtime
+                if not newest:
+                    newest = max((_mtime(p) for p in run_dir.glob("*_mean.csv")), default=0.0)
+                if newest <= (known[key] or 0.0):
+                    continue
+            row = describe_run(run_dir)
+            if row is None:
+                continue
+            seen.add(key)
+            self._store(row)
+            if key in known:
+                changed += 1
+            else:
+                added += 1
+        gone = [k for k in known if k not in seen]
+        self.conn.executemany("DELETE FROM runs WHERE run_dir = ?", [(k,) for k in gone])
+        self.conn.commit()
+        return {"added": added, "changed": changed, "removed": len(gone), "total": self.count()}
+
+    # ---------- queries ----------
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def query(self, diameter: Optional[float] = None, dr: Optional[float] = None,
+              rpm_min: Optional[float] = None, rpm_max: Optional[float] = None,
+              tandem: Optional[bool] = None, status: Optional[str] = None,
+              profile: Optional[str] = None, since: Optional[str] = None,
+              order_by: str = "started_at", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Runs matching every given filter, e.g. all 16" props at 0.8R above 4000 RPM:
+            catalog.query(diameter=16, dr=0.8, rpm_min=4000)
+        """
+        where, args = [], []
+        if diameter is not None:
+            where.append("prop_diameter_in BETWEEN ? AND ?")
+            args += [diameter - DIAMETER_TOL_IN, diameter + DIAMETER_TOL_IN]
+        if dr is not None:
+            where.append("dr_ratio BETWEEN ? AND ?")
+            args += [dr - DR_TOL, dr + DR_TOL]
+        if rpm_min is not None:
+            where.append("rpm >= ?")
+            args.append(rpm_min)
+        if rpm_max is not None:
+            where.append("rpm <= ?")
+            args.append(rpm_max)
+        if tandem is not None:
+            where.append("tandem = ?")
+            args.append(int(bool(tandem)))
+        if status is not None:
+            where.append("status = ?")
+            args.append(status)
+        if profile is not None:
+            where.append("profile = ?")
+            args.append(profile)
+        if since is not None:
+            where.append("started_at >= ?")
+            args.append(since)
+        if order_by not in COLUMN_NAMES:
+            raise ValueError(f"Tundmatu sorteerimisveerg: {order_by!r}")
+        sql = "SELECT * FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order_by} DESC"
+        if limit:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        return [dict(r) for r in self.conn.execute(sql, args)]
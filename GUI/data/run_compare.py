@@ -0,0 +1,276 @@
+# data/run_compare.py
+"""
+Side-by-side comparison of processed runs (_mean.csv files).
+
+Each run's section table is parsed once and cached next to the mean file as
+".<name>.<key>.npy" (utils/npy_cache.py, shared with the trajectory cache;
+loaded memory-mapped),
+put on the normalized radius r/R = x_mm / (D/2), and resampled onto one common
+r/R grid. All runs of a comparison then live in one (runs, quantity, r/R)
+array, so differences and ratios against the baseline are single numpy ops.
+
+Tandem mean files carry the section kinematics per prop (CL1 / CL2, CD1 / CD2,
+alpha_angle1_deg / alpha_angle2_deg): the first prop's columns fill CL / CD /
+alpha, the second prop's fill CL2 / CD2 / alpha2, which stay NaN for single
+prop runs.
+"""
+import csv
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from data.run_manifest import load_manifest
+from utils.npy_cache import cache_key, cache_path, read_cache, write_cache
+
+CACHE_VERSION = 2
+
+# quantity -> (_mean.csv columns, first one present wins; axis label)
+QUANTITIES = {
+    "v_tan":   (("v_tan_mps",),                        "V_tan (m/s)"),
+    "v_rad":   (("v_rad_mps",),                        "V_rad (m/s)"),
+    "v_axial": (("v_axial_mps",),                      "V_axial (m/s)"),
+    "CL":      (("CL", "CL1"),                         "CL"),
+    "CD":      (("CD", "CD1"),                         "CD"),
+    "alpha":   (("alpha_angle_deg", "alpha_angle1_deg"), "alpha (°)"),
+    "CL2":     (("CL2",),                              "CL, 2. propeller"),
+    "CD2":     (("CD2",),                              "CD, 2. propeller"),
+    "alpha2":  (("alpha_angle2_deg",),                 "alpha, 2. propeller (°)"),
+}
+_COLUMNS = [("x_mm",), ("prop_inch",)] + [cols for cols, _ in QUANTITIES.values()]
+
+
+@dataclass
+class RunData:
+    label: str
+    mean_file: str
+    radius_mm: float
+    table: np.ndarray              # (rows, len(_COLUMNS)) float64, NaN where missing
+
+    @property
+    def r_R(self) -> np.ndarray:
+        return self.table[:, 0] / self.radius_mm
+
+    def column(self, quantity: str) -> np.ndarray:
+        return self.table[:, 2 + list(QUANTITIES).index(quantity)]
+
+
+@dataclass
+class Comparison:
+    runs: List[RunData]
+    r_R: np.ndarray                # (points,)
+    values: np.ndarray             # (runs, quantities, points)
+    baseline: int = 0
+    quantities: List[str] = field(default_factory=lambda: list(QUANTITIES))
+
+    def series(self, quantity: str) -> np.ndarray:
+        """(runs, points) for one quantity."""
+        return self.values[:, self.quantities.index(quantity), :]
+
+    def differences(self) -> np.ndarray:
+        """values - baseline, same shape as values."""
+        return self.values - self.values[self.baseline]
+
+    def ratios(self) -> np.ndarray:
+        """values / baseline (NaN where the baseline is 0 or missing)."""
+        base = self.values[self.baseline]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = self.values / base
+        out[~np.isfinite(out)] = np.nan
+        return out
+
+
+# ============================================================
+# Loading + cache
+# ============================================================
+
+def find_mean_file(path) -> Path:
+    """Accept a _mean.csv or a run folder (manifest mean_file, else the first *_mean.csv)."""
+    path = Path(path)
+    if path.is_file():
+        return path
+    manifest = load_manifest(path)
+    if manifest and manifest.get("mean_file") and (path / manifest["mean_file"]).exists():
+        return path / manifest["mean_file"]
+    found = sorted(path.glob("*_mean.csv"))
+    if not found:
+        raise FileNotFoundError(f"Kaustas {path} pole _mean.csv faili")
+    return found[0]
+
+
+def _to_float(s: str) -> float:
+    try:
+        return float(s)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def parse_mean_table(text: str) -> np.ndarray:
+    """Section rows of a _mean.csv (everything before the blank line + summary block)."""
+    rows = []
+    header = None
+    for row in csv.reader(text.splitlines()):
+        if not row or not any(c.strip() for c in row):
+            if header is not None:
+                break
+            continue
+        if header is None:
+            header = [c.strip() for c in row]
+            idx = [next((header.index(c) for c in cols if c in header), None) for cols in _COLUMNS]
+            continue
+        rows.append([_to_float(row[i]) if i is not None and i < len(row) else np.nan for i in idx])
+    if header is None or "x_mm" not in header:
+        raise ValueError("Fail ei ole _mean.csv (x_mm veerg puudub)")
+    return np.array(rows, dtype=np.float64).reshape(-1, len(_COLUMNS))
+
+
+def _cache_key(data: bytes) -> str:
+    return cache_key(data, f"|v{CACHE_VERSION}|{';'.join('/'.join(cols) for cols in _COLUMNS)}")
+
+
+def load_mean_table(mean_file, use_cache: bool = True) -> np.ndarray:
+    path = Path(mean_file)
+    data = path.read_bytes()
+    cache = cache_path(path, _cache_key(data))
+    arr = read_cache(cache, "Mean", mmap=True) if use_cache else None
+    if arr is not None and arr.ndim == 2 and arr.shape[1] == len(_COLUMNS):
+        return arr
+    table = parse_mean_table(data.decode("utf-8", errors="replace"))
+    if use_cache:
+        write_cache(path, cache, table, "Mean")
+    return table
+
+
+def load_run(path, label: Optional[str] = None, use_cache: bool = True) -> RunData:
+    mean = find_mean_file(path)
+    table = load_mean_table(mean, use_cache)
+    manifest = load_manifest(mean.parent)
+    diameter = None
+    if manifest:
+        diameter = (manifest.get("run") or {}).get("prop_diameter_in")
+    if not diameter:
+        col = np.asarray(table[:, 1])
+        col = col[np.isfinite(col)]
+        diameter = float(col[0]) if len(col) else None
+    if not diameter:
+        raise ValueError(f"Propelleri läbimõõt puudub: {mean}")
+    if label is None:
+        label = mean.parent.name
+        if manifest:
+            run = manifest.get("run") or {}
+            label = f"{mean.parent.name} ({run.get('prop_diameter_in')}\" {run.get('dr_ratio')}R)"
+    return RunData(label=label, mean_file=str(mean), radius_mm=float(diameter) * 25.4 / 2.0, table=table)
+
+
+# ============================================================
+# Alignment
+# ============================================================
+
+def _resample(r: np.ndarray, y: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """Linear interpolation onto grid; NaN outside the measured span or where y is missing."""
+    ok = np.isfinite(r) & np.isfinite(y)
+    out = np.full(grid.shape, np.nan)
+    if ok.sum() < 2:
+        return out
+    r, y = r[ok], y[ok]
+    order = np.argsort(r, kind="stable")
+    r, y = r[order], y[order]
+    inside = (grid >= r[0]) & (grid <= r[-1])
+    out[inside] = np.interp(grid[inside], r, y)
+    return out
+
+
+def compare(runs: Sequence[RunData], step: float = 0.01, baseline: int = 0) -> Comparison:
+    """Put all runs on one r/R grid (0 .. largest measured r/R, `step` apart)."""
+    if not runs:
+        raise ValueError("Võrdlemiseks on vaja vähemalt ühte mõõtmist")
+    if not 0 <= baseline < len(runs):
+        raise ValueError(f"Vale baasmõõtmise indeks: {baseline}")
+    r_max = max(float(np.nanmax(r.r_R)) if len(r.table) else 0.0 for r in runs)
+    grid = np.round(np.arange(0.0, r_max + step / 2, step), 6)
+    values = np.stack([
+        np.stack([_resample(run.r_R, run.column(q), grid) for q in QUANTITIES])
+        for run in runs
+    ])
+    return Comparison(runs=list(runs), r_R=grid, values=values, baseline=baseline)
+
+
+# ============================================================
+# Export
+# ============================================================
+
+def write_comparison_csv(cmp: Comparison, out_path) -> Path:
+    """
+    One wide table on the common r/R grid:
+      r_R, <q>|<run> for every run, then d_<q>|<run> and ratio_<q>|<run>
+      against the baseline for every other run.
+    """
+    out_path = Path(out_path)
+    labels = [r.label for r in cmp.runs]
+    others = [i for i in range(len(cmp.runs)) if i != cmp.baseline]
+    diff, ratio = cmp.differences(), cmp.ratios()
+
+    header = ["r_R"]
+    blocks = []
+    for qi, q in enumerate(cmp.quantities):
+        header += [f"{q}|{labels[i]}" for i in range(len(labels))]
+        blocks.append(cmp.values[:, qi, :])
+    for qi, q in enumerate(cmp.quantities):
+        header += [f"d_{q}|{labels[i]}" for i in others]
+        header += [f"ratio_{q}|{labels[i]}" for i in others]
+        blocks += [diff[others, qi, :], ratio[others, qi, :]]
+    table = np.vstack([cmp.r_R[None, :]] + blocks).T
+
+    with open(out_path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        for row in table:
+            w.writerow(["" if not np.isfinite(v) else f"{v:.6g}" for v in row])
+    return out_path
+
+
+def comparison_figure(cmp: Comparison):
+    """matplotlib Figure (no pyplot) with one panel per quantity, all runs overlaid."""
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(14, 11))
+    axes = fig.subplots(nrows=3, ncols=3, sharex=True).ravel()
+    for ax, q in zip(axes, cmp.quantities):
+        data = cmp.series(q)
+        for i, run in enumerate(cmp.runs):
+            style = "-" if i == cmp.baseline else "--"
+            ax.plot(cmp.r_R, data[i], style, label=run.label)
+        ax.set_ylabel(QUANTITIES[q][1])
+        ax.grid(True)
+    for ax in axes[-3:]:
+        ax.set_xlabel("r/R")
+    axes[0].legend(fontsize="small")
+    fig.tight_layout()
+    return fig
+
+
+def save_comparison_figure(cmp: Comparison, out_path) -> Path:
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = comparison_figure(cmp)
+    FigureCanvasAgg(fig)
+    fig.savefig(str(out_path), dpi=120)
+    return Path(out_path)
+
+
+
+DEFAULT_OUT_ROOT = Path.home() / "Desktop" / "vordlused"
+
+
+def export_comparison(paths: Sequence, out_dir=None, step: float = 0.01, baseline: int = 0,
+                      use_cache: bool = True):
+    """Load, align and write comparison.csv + comparison.png; returns (Comparison, csv path, png path)."""
+    import datetime
+    runs = [load_run(p, use_cache=use_cache) for p in paths]
+    cmp = compare(runs, step=step, baseline=baseline)
+    if out_dir is None:
+        out_dir = DEFAULT_OUT_ROOT / datetime.datetime.today().strftime('%d-%m-%Y-%H:%M:%S')
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    csv_path = write_comparison_csv(cmp, out_dir / "comparison.csv")
+    png_path = save_comparison_figure(cmp, out_dir / "comparison.png")
+    return cmp, csv_path, png_path
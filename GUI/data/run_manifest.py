@@ -0,0 +1,218 @@
+# data/run_manifest.py
+"""
+Machine-readable record of one measurement series, written next to the log as
+<run dir>/manifest.json when the series starts and updated as it progresses:
+
+  settings    SharedData snapshot (rho, kin_visc, ratio, x_center, rotation_dir,
+              arm lengths, cal factors, PWM limits, ...)
+  run         prop diameter, D/R, tandem flag, throttles/PWM, sweeps, Y0,
+              prop config file, trajectory (waypoints in steps)
+  timing      start/finish, per-sweep durations, rows logged, frame rate,
+              per-sweep frame timing (rate, jitter, gaps; utils/clock_sync.py)
+              and the MCU clock drift when the firmware sends a tick counter
+  results     processed mean file and summary metrics (Omega, Power, Ct, ...)
+  events      disconnects, aborts, ...
+
+Reprocessing / batch tools use load_manifest() or manifest_for(<any file in
+the run dir>) instead of scraping summaries or asking the operator.
+"""
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from data.frame_log import frame_log_path
+from data.profile_store import RIG_SCHEMA
+from utils.clock_sync import FrameTiming
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+_EXTRA_SETTINGS = ("rotation_dir", "safety_over_prop", "x_delta", "mount_sign", "pre_settle_mm",
+                   "omega_estimator", "omega_bin_width")
+
+
+def _now_iso() -> str:
+    return datetime.datetime.now().astimezone().isoformat(timespec="seconds")
+
+
+def settings_snapshot(shared_data) -> Dict[str, Any]:
+    out = {}
+    for key in list(RIG_SCHEMA) + [k for k in _EXTRA_SETTINGS if k not in RIG_SCHEMA]:
+        if hasattr(shared_data, key):
+            val = getattr(shared_data, key)
+            if isinstance(val, (int, float, bool, str)) or val is None:
+                out[key] = val
+    return out
+
+
+def write_manifest(run_dir: os.PathLike, doc: Dict[str, Any]) -> Path:
+    """Atomic write (temp file + replace) so readers never see a half-written manifest."""
+    run_dir = Path(run_dir)
+    run_dir.mkdir(parents=True, exist_ok=True)
+    path = run_dir / MANIFEST_NAME
+    fd, tmp = tempfile.mkstemp(prefix=".manifest.", dir=str(run_dir))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+def load_manifest(run_dir: os.PathLike) -> Optional[Dict[str, Any]]:
+    path = Path(run_dir) / MANIFEST_NAME
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def manifest_for(file_path: os.PathLike) -> Optional[Dict[str, Any]]:
+    """Manifest of the run a log / mean / _ct file belongs to (same directory)."""
+    return load_manifest(Path(file_path).resolve().parent)
+
+
+class RunManifest:
+    """Owns manifest.json for the series in progress; every change is saved immediately."""
+
+    def __init__(self, run_dir: os.PathLike, doc: Dict[str, Any]):
+        self.run_dir = Path(run_dir)
+        self.doc = doc
+        self._sweep_t0: Dict[int, float] = {}
+        self._frame_timing: Dict[int, FrameTiming] = {}
+        self._series_t0 = time.monotonic()
+
+    @classmethod
+    def start(cls, run_dir: os.PathLike, log_file: str, shared_data, run: Dict[str, Any]) -> "RunManifest":
+        doc = {
+            "manifest_version": MANIFEST_VERSION,
+            "status": "running",
+            "log_file": os.path.basename(log_file),
+            "frame_log": frame_log_path(log_file).name,
+            "mean_file": None,
+            "settings": settings_snapshot(shared_data),
+            "run": run,
+            "timing": {
+                "started_at": _now_iso(),
+                "finished_at": None,
+                "duration_s": None,
+                "rows_logged": 0,
+                "frames": 0,
+                "frame_rate_hz": None,
+                "sweeps": [],
+            },
+            "results": {},
+            "events": [],
+        }
+        m = cls(run_dir, doc)
+        m.save()
+        return m
+
+    @classmethod
+    def for_file(cls, file_path: os.PathLike) -> Optional["RunManifest"]:
+        """Existing manifest of the run file_path belongs to (see manifest_for), None if there is none."""
+        doc = manifest_for(file_path)
+        if doc is None:
+            return None
+        return cls(Path(file_path).resolve().parent, doc)
+
+    def save(self):
+        try:
+            write_manifest(self.run_dir, self.doc)
+        except OSError as e:
+            print("manifest write error:", e)
+
+    # ---------- progress ----------
+
+    def sweep_started(self, index: int, resume_bins: int = 0):
+        self._sweep_t0[index] = time.monotonic()
+        self._frame_timing[index] = FrameTiming()
+        entry = {"index": index, "started_at": _now_iso(), "finished_at": None,
+                 "duration_s": None, "rows": 0, "frames": 0}
+        if resume_bins:
+            entry["resumed_from_bin"] = resume_bins
+            self.event("resume", sweep=index, bin=resume_bins)
+        self.doc["timing"]["sweeps"].append(entry)
+        self.save()
+
+    def _sweep(self, index: int) -> Optional[Dict[str, Any]]:
+        for entry in reversed(self.doc["timing"]["sweeps"]):
+            if entry["index"] == index:
+                return entry
+        return None
+
+    def count_row(self, index: int):
+        """One CSV row logged (not saved per row; saved at sweep end)."""
+        self.doc["timing"]["rows_logged"] += 1
+        entry = self._sweep(index)
+        if entry is not None:
+            entry["rows"] += 1
+
+    def count_frame(self, index: int, t_ns: int = 0):
+        """One frame received; t_ns (Frame.t_sample_ns) feeds the sweep's rate / gap statistics."""
+        self.doc["timing"]["frames"] += 1
+        entry = self._sweep(index)
+        if entry is not None:
+            entry["frames"] += 1
+        timing = self._frame_timing.get(index)
+        if timing is not None:
+            timing.add(t_ns)
+
+    def count_frames(self, index: int, stamps):
+        """count_frame() for a batch of frames (acquisition ring), stamps in ns."""
+        stamps = list(stamps)
+        self.doc["timing"]["frames"] += len(stamps)
+        entry = self._sweep(index)
+        if entry is not None:
+            entry["frames"] += len(stamps)
+        timing = self._frame_timing.get(index)
+        if timing is not None:
+            for t_ns in stamps:
+                timing.add(t_ns)
+
+    def sweep_finished(self, index: int, clock: Optional[Dict[str, Any]] = None):
+        """clock: ClockSync.summary() when the frames carry an MCU tick."""
+        entry = self._sweep(index)
+        if entry is not None and entry["finished_at"] is None:
+            entry["finished_at"] = _now_iso()
+            t0 = self._sweep_t0.get(index)
+            if t0 is not None:
+                entry["duration_s"] = round(time.monotonic() - t0, 3)
+            timing = self._frame_timing.pop(index, None)
+            if timing is not None and timing.frames:
+                entry["frame_timing"] = timing.summary()
+        if clock is not None:
+            self.doc["timing"]["mcu_clock"] = clock
+        self.save()
+
+    def event(self, kind: str, **info):
+        self.doc["events"].append(dict(info, kind=kind, at=_now_iso()))
+        self.save()
+
+    def finish(self, status: str = "completed"):
+        timing = self.doc["timing"]
+        if timing["finished_at"] is None:
+            timing["finished_at"] = _now_iso()
+            timing["duration_s"] = round(time.monotonic() - self._series_t0, 3)
+            sweep_time = sum(s["duration_s"] or 0.0 for s in timing["sweeps"])
+            if sweep_time > 0:
+                timing["frame_rate_hz"] = round(timing["frames"] / sweep_time, 2)
+        self.doc["status"] = status
+        self.save()
+
+    def set_results(self, mean_file: Optional[str], metrics: Dict[str, Any]):
+        self.doc["mean_file"] = os.path.basename(mean_file) if mean_file else None
+        self.doc["results"] = {k: (float(v) if isinstance(v, (int, float)) else v) for k, v in metrics.items()}
+        self.save()
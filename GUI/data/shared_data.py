@@ -5,7 +5,8 @@ from config import (
     x_max_speed_default, y_max_speed_default, x_max_accel_default, y_max_accel_default,
     aoa_trim_default, aoa_limit_default, aoss_trim_default, aoss_max_limit_default,
     aoss_min_limit_default, min_pwm_default, max_pwm_default, no_of_props_default, probe_offset_default, first_trq_cal_val_default, first_thr_cal_val_default,
-    second_trq_cal_val_default, second_thr_cal_val_default, pwm_ramp_ms_default, aoss_enabled_default, rotation_dir
+    second_trq_cal_val_default, second_thr_cal_val_default, pwm_ramp_ms_default, aoss_enabled_default, rotation_dir,
+    omega_estimator_default, omega_bin_width_default, flow_lag_s_default, flow_tau_s_default
 )
 
 class SharedData:
@@ -47,6 +48,12 @@ class SharedData:
         # One-time probe mounting sign (global flip if your rig’s sign is inverted)
         # Keep at +1 unless the S-test shows it needs flipping.
         self._mount_sign = 1
+        # Series omega for Ct/Cp/power (see data/omega_estimator.py)
+        self._omega_estimator = omega_estimator_default
+        self._omega_bin_width = omega_bin_width_default
+        # Flow channel lag compensation before Δx binning (see data/lag_compensation.py)
+        self._flow_lag_s = flow_lag_s_default
+        self._flow_tau_s = flow_tau_s_default
 
 #    def _coerce_pm_one(x):
 #        try:
@@ -90,3 +97,7 @@ class SharedData:
     aoss_enabled   = property(lambda s: s._aoss_enabled,   lambda s, v: setattr(s, "_aoss_enabled", bool(v)))
     rotation_dir = property(lambda s: s._rotation_dir,     lambda s, v: setattr(s, "_rotation_dir", v))
     mount_sign = property(lambda s: s._mount_sign,         lambda s, v: setattr(s, "_mount_sign", v))
+    omega_estimator = property(lambda s: s._omega_estimator, lambda s, v: setattr(s, "_omega_estimator", v))
+    omega_bin_width = property(lambda s: s._omega_bin_width, lambda s, v: setattr(s, "_omega_bin_width", float(v)))
+    flow_lag_s = property(lambda s: s._flow_lag_s,         lambda s, v: setattr(s, "_flow_lag_s", float(v)))
+    flow_tau_s = property(lambda s: s._flow_tau_s,         lambda s, v: setattr(s, "_flow_tau_s", float(v)))
@@ -0,0 +1,175 @@
+# data/station_align.py
+"""
+Pairing of two runs of the same prop on radial station (0R / 0.8R inputs of
+the center-of-thrust calculation, or any two mean files).
+
+  merge   sorted merge on X: stations closer than tol_mm are the same
+          station, everything else is dropped (no row-order assumptions,
+          stations may be missing on either side)
+  interp  run B is linearly interpolated onto A's stations inside B's
+          measured span (different x_delta, shifted start, ...)
+  grid    both runs interpolated onto a regular step_mm grid over the span
+          they share
+  auto    merge, or interp when fewer than half of A's stations match
+
+Interpolation carries the variances of the station means along
+(var = (1-t)^2 var_i + t^2 var_j), so the uncertainty of the
+center-of-thrust stays meaningful after alignment.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from data.run_manifest import manifest_for
+from data.thrust_integration import read_mean_stations, station_variance_from_log
+
+MODES = ("merge", "interp", "grid", "auto")
+
+
+def merge_stations(x_a: Sequence[float], x_b: Sequence[float], tol_mm: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Indices (ia, ib) of stations present in both runs, ascending in x.
+    x_a and x_b must be sorted; each station is used at most once.
+    """
+    a = np.asarray(x_a, dtype=np.float64)
+    b = np.asarray(x_b, dtype=np.float64)
+    if not len(a) or not len(b):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    j = np.searchsorted(b, a)
+    lo = np.clip(j - 1, 0, len(b) - 1)
+    hi = np.clip(j, 0, len(b) - 1)
+    nearest = np.where(np.abs(b[lo] - a) <= np.abs(b[hi] - a), lo, hi)
+    ok = np.abs(b[nearest] - a) <= tol_mm
+    ia = np.flatnonzero(ok)
+    ib = nearest[ok]
+    # keep the first A station per B station (one-to-one)
+    if len(ib):
+        first = np.concatenate(([True], ib[1:] != ib[:-1]))
+        ia, ib = ia[first], ib[first]
+    return ia.astype(np.int64), ib.astype(np.int64)
+
+
+def interp_weights(x_src: Sequence[float], x_dst: Sequence[float]):
+    """(i, t, inside): y_dst = (1-t) y[i] + t y[i+1] for x_dst inside [x_src[0], x_src[-1]]."""
+    xs = np.asarray(x_src, dtype=np.float64)
+    xd = np.asarray(x_dst, dtype=np.float64)
+    if len(xs) < 2:
+        inside = np.isclose(xd, xs[0]) if len(xs) else np.zeros(len(xd), dtype=bool)
+        return np.zeros(len(xd), dtype=np.int64), np.zeros(len(xd)), inside
+    inside = (xd >= xs[0]) & (xd <= xs[-1])
+    i = np.clip(np.searchsorted(xs, xd, side="right") - 1, 0, len(xs) - 2)
+    h = xs[i + 1] - xs[i]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(h > 0, (xd - xs[i]) / h, 0.0)
+    return i, np.clip(t, 0.0, 1.0), inside
+
+
+def apply_interp(y, i, t, variance: bool = False):
+    """Apply interp_weights to values (or to variances of independent values)."""
+    y = np.asarray(y, dtype=np.float64)
+    if len(y) < 2:
+        return np.repeat(y[:1], len(i)) if len(y) else np.full(len(i), np.nan)
+    if variance:
+        return (1.0 - t) ** 2 * y[i] + t ** 2 * y[i + 1]
+    return (1.0 - t) * y[i] + t * y[i + 1]
+
+
+# ============================================================
+# Paired 0R / 0.8R inputs
+# ============================================================
+
+def raw_log_for(mean_file) -> Optional[str]:
+    """Series log next to a _mean.csv (manifest log_file, else log<dt>.csv by name)."""
+    p = Path(mean_file)
+    manifest = manifest_for(p)
+    if manifest and manifest.get("log_file"):
+        return str(p.with_name(manifest["log_file"]))
+    if p.stem.endswith("_mean"):
+        return str(p.with_name(p.stem[:-len("_mean")] + p.suffix))
+    return None
+
+
+@dataclass
+class AlignedPair:
+    mode: str                       # mode actually used
+    x_mm: np.ndarray                # common stations
+    va0: np.ndarray
+    va8: np.ndarray
+    thrust: np.ndarray              # 0R thrust at the common stations
+    va0_var: Optional[np.ndarray]
+    va8_var: Optional[np.ndarray]
+    thrust_var: Optional[np.ndarray]
+    header: List[str]               # 0R mean file header
+    rows0: Optional[List[List[str]]]  # 0R rows per station (None on a synthetic grid)
+    prop_inch: Optional[float]
+    n_zero: int                     # stations in each input
+    n_point8: int
+
+
+def _variances(mean_file, x_mm) -> Optional[Dict[str, np.ndarray]]:
+    return station_variance_from_log(raw_log_for(mean_file), x_mm)
+
+
+def align_pair(zero: Dict[str, object], point8: Dict[str, object],
+               var0: Optional[Dict[str, np.ndarray]] = None, var8: Optional[Dict[str, np.ndarray]] = None,
+               mode: str = "auto", tol_mm: float = 0.5, step_mm: float = 3.0) -> AlignedPair:
+    """Align two read_mean_stations() tables (+ optional station variances) on X."""
+    if mode not in MODES:
+        raise ValueError(f"Tundmatu joondusviis: {mode!r}")
+    x0, x8 = zero["x_mm"], point8["x_mm"]
+    ia, ib = merge_stations(x0, x8, tol_mm)
+    if mode == "auto":
+        mode = "merge" if len(ia) * 2 >= len(x0) else "interp"
+
+    def take0(key, idx):
+        return None if var0 is None else var0[key][idx]
+
+    if mode == "merge":
+        x = x0[ia]
+        va8 = point8["v_axial"][ib]
+        va8_var = None if var8 is None else var8["v_axial"][ib]
+        idx0, rows = ia, [zero["rows"][k] for k in ia]
+    elif mode == "interp":
+        i, t, inside = interp_weights(x8, x0)
+        idx0 = np.flatnonzero(inside)
+        x = x0[idx0]
+        i, t = i[idx0], t[idx0]
+        va8 = apply_interp(point8["v_axial"], i, t)
+        va8_var = None if var8 is None else apply_interp(var8["v_axial"], i, t, variance=True)
+        rows = [zero["rows"][k] for k in idx0]
+    else:
+        lo = max(x0[0], x8[0]) if len(x0) and len(x8) else 0.0
+        hi = min(x0[-1], x8[-1]) if len(x0) and len(x8) else -1.0
+        x = np.arange(lo, hi + 1e-9, step_mm) if hi >= lo else np.zeros(0)
+        i0, t0, _ = interp_weights(x0, x)
+        i8, t8, _ = interp_weights(x8, x)
+        va8 = apply_interp(point8["v_axial"], i8, t8)
+        va8_var = None if var8 is None else apply_interp(var8["v_axial"], i8, t8, variance=True)
+        return AlignedPair(
+            mode=mode, x_mm=x,
+            va0=apply_interp(zero["v_axial"], i0, t0), va8=va8,
+            thrust=apply_interp(zero["thrust"], i0, t0),
+            va0_var=None if var0 is None else apply_interp(var0["v_axial"], i0, t0, variance=True),
+            va8_var=va8_var,
+            thrust_var=None if var0 is None else apply_interp(var0["thrust"], i0, t0, variance=True),
+            header=list(zero["header"]), rows0=None, prop_inch=zero["prop_inch"],
+            n_zero=len(x0), n_point8=len(x8))
+
+    return AlignedPair(
+        mode=mode, x_mm=x,
+        va0=zero["v_axial"][idx0], va8=va8, thrust=zero["thrust"][idx0],
+        va0_var=take0("v_axial", idx0), va8_var=va8_var, thrust_var=take0("thrust", idx0),
+        header=list(zero["header"]), rows0=rows, prop_inch=zero["prop_inch"],
+        n_zero=len(x0), n_point8=len(x8))
+
+
+def load_pair(zero_file, point8_file, mode: str = "auto", tol_mm: float = 0.5,
+              step_mm: float = 3.0, with_variance: bool = True) -> AlignedPair:
+    """Read two mean files (and their raw logs for variances) and align them."""
+    zero = read_mean_stations(zero_file)
+    point8 = read_mean_stations(point8_file)
+    var0 = _variances(zero_file, zero["x_mm"]) if with_variance else None
+    var8 = _variances(point8_file, point8["x_mm"]) if with_variance else None
+    return align_pair(zero, point8, var0, var8, mode=mode, tol_mm=tol_mm, step_mm=step_mm)
@@ -0,0 +1,230 @@
+# data/thrust_integration.py
+"""
+Center of thrust from a 0R / 0.8R pair of processed runs.
+
+Per station r (m) the annular thrust loading is
+
+    g(r) = pi * rho * va0 * (va0 + dva),   dva = max(va08 - va0, 0)
+
+and the thrust moment is M = integral g(r) * r^2 dr from the first station to
+R; r_CT = 2 M / T with T the mean 0R thrust. The integral is evaluated in
+closed form per segment, so it is a dot product of g with precomputed
+station weights:
+
+  "step"     g constant from one station to the next (the model the old
+             quad(limit=1500) over searchsorted approximated)
+  "linear"   g linear between stations
+
+In both, the last station's g is held out to R (hold_to_radius=True) as
+before. Because M is linear in g, per-station variances of va0 / va08 / T
+propagate to M and r_CT exactly (first order, stations independent).
+
+Everything broadcasts over leading axes, so many 0R/0.8R pairs measured on
+the same station grid are evaluated in one call.
+"""
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+METHODS = ("step", "linear")
+
+
+def moment_weights(x_m: Sequence[float], radius_m: float, method: str = "step",
+                   hold_to_radius: bool = True) -> np.ndarray:
+    """w such that integral g(r) r^2 dr == w @ g for stations x_m (ascending, metres)."""
+    x = np.asarray(x_m, dtype=np.float64)
+    n = len(x)
+    if method not in METHODS:
+        raise ValueError(f"Tundmatu integreerimismeetod: {method!r}")
+    w = np.zeros(n)
+    if n == 0:
+        return w
+    a, b = x[:-1], x[1:]
+    i0 = (b ** 3 - a ** 3) / 3.0          # integral r^2
+    if method == "step":
+        w[:-1] += i0
+    else:
+        i1 = (b ** 4 - a ** 4) / 4.0      # integral r^3
+        h = b - a
+        with np.errstate(divide="ignore", invalid="ignore"):
+            wa = np.where(h > 0, (b * i0 - i1) / h, 0.0)
+            wb = np.where(h > 0, (i1 - a * i0) / h, 0.0)
+        w[:-1] += wa
+        w[1:] += wb
+    if hold_to_radius and radius_m > x[-1]:
+        w[-1] += (radius_m ** 3 - x[-1] ** 3) / 3.0
+    return w
+
+
+def section_loading(va0, va08, rho: float):
+    """g and its partial derivatives dg/dva0, dg/dva08 (arrays, broadcasting)."""
+    va0 = np.asarray(va0, dtype=np.float64)
+    va08 = np.asarray(va08, dtype=np.float64)
+    dva = np.maximum(va08 - va0, 0.0)
+    g = math.pi * rho * va0 * (va0 + dva)
+    grow = va08 > va0
+    # grow: g = pi rho va0 va08; else g = pi rho va0^2
+    dg_dva0 = np.where(grow, math.pi * rho * va08, 2.0 * math.pi * rho * va0)
+    dg_dva08 = np.where(grow, math.pi * rho * va0, 0.0)
+    return g, dg_dva0, dg_dva08
+
+
+@dataclass
+class CenterOfThrust:
+    thrust_moment: np.ndarray      # Nm
+    thrust_moment_std: np.ndarray
+    thrust: np.ndarray             # mean 0R thrust, N
+    thrust_std: np.ndarray
+    r_ct: np.ndarray               # m
+    r_ct_std: np.ndarray
+    radius_m: float
+
+    @property
+    def pct(self) -> np.ndarray:
+        return self.r_ct / self.radius_m * 100.0
+
+    @property
+    def pct_std(self) -> np.ndarray:
+        return self.r_ct_std / self.radius_m * 100.0
+
+
+def center_of_thrust(x_m, va0, va08, thrust, radius_m: float, rho: float,
+                     va0_var=None, va08_var=None, thrust_var=None,
+                     method: str = "step", hold_to_radius: bool = True) -> CenterOfThrust:
+    """
+    x_m: (n,) station radii. va0 / va08 / thrust (and the *_var variances of the
+    station means) are (..., n); leading axes are independent pairs.
+    """
+    w = moment_weights(x_m, radius_m, method, hold_to_radius)
+    g, d0, d8 = section_loading(va0, va08, rho)
+    M = g @ w
+    var_g = np.zeros_like(g)
+    if va0_var is not None:
+        var_g = var_g + d0 ** 2 * np.asarray(va0_var, dtype=np.float64)
+    if va08_var is not None:
+        var_g = var_g + d8 ** 2 * np.asarray(va08_var, dtype=np.float64)
+    M_var = var_g @ (w ** 2)
+
+    thrust = np.asarray(thrust, dtype=np.float64)
+    n = thrust.shape[-1]
+    T = thrust.mean(axis=-1)
+    T_var = (np.asarray(thrust_var, dtype=np.float64).sum(axis=-1) / n ** 2
+             if thrust_var is not None else np.zeros_like(T))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r_ct = np.where(T != 0, 2.0 * M / T, 0.0)
+        r_var = np.where(T != 0, (2.0 / T) ** 2 * M_var + (2.0 * M / T ** 2) ** 2 * T_var, 0.0)
+    return CenterOfThrust(thrust_moment=M, thrust_moment_std=np.sqrt(M_var),
+                          thrust=T, thrust_std=np.sqrt(T_var),
+                          r_ct=r_ct, r_ct_std=np.sqrt(r_var), radius_m=float(radius_m))
+
+
+# ============================================================
+# Station data from processed files
+# ============================================================
+
+# legacy space-delimited mean files: '#_of_samples Prop_diam(inch) X_position(mm) Y_position(mm) Torque(Nm) Thrust(N) ... V_axial(m/s)'
+_LEGACY_COLS = {"samples": 0, "prop_inch": 1, "x_mm": 2, "thrust": 5, "v_axial": 11}
+_MEAN_COLS = {"samples": "samples", "prop_inch": "prop_inch", "x_mm": "x_mm",
+              "thrust": "thrust1_N", "v_axial": "v_axial_mps"}
+
+
+def _split(line: str):
+    return [t.strip() for t in line.split(",")] if "," in line else line.split()
+
+
+def read_mean_stations(path) -> Dict[str, object]:
+    """
+    Station table of a _mean.csv (current comma format or legacy space format):
+    {"header": [...], "rows": [[str]...], "x_mm", "v_axial", "thrust", "samples": arrays, "prop_inch": float}
+    Rows are sorted by x; the summary block is skipped.
+    """
+    header, rows, cols = None, [], None
+    with open(path, newline="") as f:
+        for raw in f:
+            s = raw.strip()
+            if not s:
+                if rows:
+                    break
+                continue
+            tokens = _split(s)
+            try:
+                float(tokens[0])
+            except ValueError:
+                if header is None and not rows:
+                    header = tokens
+                continue
+            rows.append(tokens)
+    if header and "x_mm" in header:
+        cols = {k: header.index(v) for k, v in _MEAN_COLS.items()}
+    else:
+        cols = dict(_LEGACY_COLS)
+
+    def col(key):
+        out = []
+        for r in rows:
+            try:
+                out.append(float(r[cols[key]]))
+            except (IndexError, ValueError):
+                out.append(np.nan)
+        return np.array(out, dtype=np.float64)
+
+    x = col("x_mm")
+    ok = np.isfinite(x)
+    order = np.argsort(x[ok], kind="stable")
+    keep = np.flatnonzero(ok)[order]
+    prop = col("prop_inch")[keep]
+    return {
+        "header": header or [],
+        "rows": [rows[i] for i in keep],
+        "x_mm": x[keep],
+        "v_axial": col("v_axial")[keep],
+        "thrust": col("thrust")[keep],
+        "samples": col("samples")[keep],
+        "prop_inch": float(prop[np.isfinite(prop)][0]) if np.isfinite(prop).any() else None,
+    }
+
+
+def station_variance_from_log(log_path, x_mm: Sequence[float]) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Variance of the station means of V_axial and thrust from the raw series log
+    (rows 'Prop_in X Y Trq1 Thr1 Omega1 Air AoA AoSS V_tan V_rad V_ax ...',
+    grouped on int(X) like data_processing). None if the log is unreadable.
+    """
+    if not log_path:
+        return None
+    try:
+        data = []
+        with open(log_path, newline="") as f:
+            for raw in f:
+                t = _split(raw.strip())
+                if len(t) < 12:
+                    continue
+                try:
+                    data.append((int(float(t[1])), float(t[4]), float(t[11])))
+                except ValueError:
+                    continue
+    except OSError:
+        return None
+    if not data:
+        return None
+    arr = np.array(data, dtype=np.float64)
+    keys = np.asarray(x_mm, dtype=np.float64).astype(np.int64)
+    idx = np.searchsorted(keys, arr[:, 0].astype(np.int64))
+    idx_c = np.clip(idx, 0, len(keys) - 1)
+    hit = keys[idx_c] == arr[:, 0].astype(np.int64)
+    idx_c, vals = idx_c[hit], arr[hit]
+
+    n = np.bincount(idx_c, minlength=len(keys)).astype(np.float64)
+    out = {}
+    for name, c in (("thrust", 1), ("v_axial", 2)):
+        s1 = np.bincount(idx_c, weights=vals[:, c], minlength=len(keys))
+        s2 = np.bincount(idx_c, weights=vals[:, c] ** 2, minlength=len(keys))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = s1 / n
+            var = np.where(n > 1, (s2 - n * mean ** 2) / (n - 1), 0.0)   # sample variance
+            out[name] = np.where(n > 0, np.maximum(var, 0.0) / n, 0.0)  # variance of the mean
+    return out
+
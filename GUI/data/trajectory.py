@@ -0,0 +1,337 @@
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from utils.npy_cache import cache_key, cache_path, read_cache, write_cache
+
+
+# ============================================================
+# Trajectory files
+#
+# One waypoint per line: "<X> <dY>"
+#   X  = absolute X axis position (steps from home, or mm)
+#   dY = Y offset relative to the series start Y (steps or mm)
+#
+# Numbers may carry a unit suffix ('mm', 'step', 'steps'). Without a
+# suffix a decimal is read as mm and an integer as steps, unless a
+# "units: mm" / "units: steps" directive sets the default for the file.
+# Everything after '#' is a comment. Columns may be separated by spaces,
+# tabs or ';'. Decimal comma ('2,2') is accepted; a single comma between
+# two plain integers ("1200,300") is a column separator.
+# ============================================================
+
+CACHE_VERSION = 1
+
+_NUM_RE = re.compile(r'([+-]?\d+(?:\.\d+)?)(?:\s*(mm|steps?))?', re.I)
+_WS_RE = re.compile(r'\s*')
+_UNITS_RE = re.compile(r'^\s*units?\s*[:=]?\s*(mm|steps?)\s*$', re.I)
+
+
+def parse_num_to_steps(token: str, steps_per_mm: float, default_unit: Optional[str] = None) -> int:
+    """
+    Accept integers/decimals, optional unit suffix 'mm' or 'steps'.
+    If unit missing: default_unit if given, else decimal -> mm, integer -> steps.
+    Examples: '123', '123.5', '2,2', '40 mm', '1200 steps'
+    """
+    t_norm = token.strip().replace(',', '.')
+    m = re.fullmatch(r'([+-]?\d+(?:\.\d+)?)(?:\s*(mm|steps?))?', t_norm, flags=re.I)
+    if not m:
+        raise ValueError(f"Vigane number: “{token}”")
+    val = float(m.group(1))
+    unit = (m.group(2) or default_unit or '').lower()
+    if unit.startswith('mm') or (not unit and '.' in t_norm):
+        return int(round(val * float(steps_per_mm)))
+    return int(round(val))
+
+
+def _split_fields(body: str) -> List[str]:
+    """Split one (comment-free) line into number tokens, keeping unit suffixes attached."""
+    s = body.strip()
+    if ';' in s or '\t' in s:
+        parts = [p for p in re.split(r'[;\t]+', s) if p.strip()]
+        if len(parts) > 1:
+            return [p.strip() for p in parts]
+    # "1200,300" -> CSV-style comma separator; "2,2 40,5" -> decimal commas
+    if s.count(',') == 1 and not re.search(r'\s', s):
+        left, right = s.split(',')
+        if re.fullmatch(r'[+-]?\d+', left) and re.fullmatch(r'[+-]?\d+(?:\s*(mm|steps?))?', right, re.I):
+            return [left, right]
+    s = re.sub(r'(\d),(\d)', r'\1.\2', s)
+    s = re.sub(r'\s*,\s*', ' ', s)
+    # the whole line must be numbers (with units): "12abc 30" is an error, not (12, 30)
+    tokens = []
+    pos = _WS_RE.match(s).end()
+    while pos < len(s):
+        m = _NUM_RE.match(s, pos)
+        if not m or (m.end() < len(s) and not s[m.end()].isspace()):
+            raise ValueError(f"Vigane väärtus: “{s[pos:].split()[0]}”")
+        tokens.append(m.group(0))
+        pos = _WS_RE.match(s, m.end()).end()
+    return tokens
+
+
+def parse_trajectory_text(text: str, steps_per_mm: float) -> np.ndarray:
+    """Parse trajectory file contents into an (N, 2) int64 array of [x_steps, dy_steps]."""
+    default_unit = None
+    rows = []
+    for lineno, raw in enumerate(text.splitlines(), start=1):
+        body, _, comment = raw.partition('#')
+        um = _UNITS_RE.match(comment) or _UNITS_RE.match(body)
+        if um:
+            default_unit = 'mm' if um.group(1).lower() == 'mm' else 'steps'
+            continue
+        if not body.strip():
+            continue
+        try:
+            tokens = _split_fields(body)
+            if len(tokens) != 2:
+                raise ValueError(f"oodati kahte väärtust (X ja Y), leiti {len(tokens)}: “{raw.strip()}”")
+            rows.append((parse_num_to_steps(tokens[0], steps_per_mm, default_unit),
+                         parse_num_to_steps(tokens[1], steps_per_mm, default_unit)))
+        except ValueError as e:
+            raise ValueError(f"Rida {lineno}: {e}") from None
+    if not rows:
+        raise ValueError("Trajektoori failis pole ühtegi punkti.")
+    return np.asarray(rows, dtype=np.int64)
+
+
+# ============================================================
+# Validation / planning helpers
+# ============================================================
+
+def resample_path(steps: np.ndarray, spacing_steps: float) -> np.ndarray:
+    """
+    Re-space a polyline to (approximately) uniform arc-length spacing.
+    Original end points are always kept; spacing <= 0 returns the input unchanged.
+    """
+    if spacing_steps is None or spacing_steps <= 0 or len(steps) < 2:
+        return steps
+    pts = steps.astype(float)
+    seg = np.hypot(*np.diff(pts, axis=0).T)
+    keep = np.concatenate(([True], seg > 0))      # drop repeated points, they break interpolation
+    pts = pts[keep]
+    if len(pts) < 2:
+        return steps[:1].copy()
+    s = np.concatenate(([0.0], np.cumsum(np.hypot(*np.diff(pts, axis=0).T))))
+    n = max(1, int(round(s[-1] / float(spacing_steps))))
+    s_new = np.linspace(0.0, s[-1], n + 1)
+    out = np.column_stack((np.interp(s_new, s, pts[:, 0]), np.interp(s_new, s, pts[:, 1])))
+    return np.rint(out).astype(np.int64)
+
+
+@dataclass
+class TrajectoryLimits:
+    """
+    Everything the checks need, all in steps.
+    - x_min..x_max / y_min..y_max: axis limits (MainWindow._axis_limits_steps)
+    - y_base: series start Y; if None only the Y span is checked
+    - x_center / radius / tip_margin: radial reach only - the outermost
+      waypoint must get radius + tip_margin from the shaft, so the sweep
+      covers the whole blade and clears the tip. Axial distance from the
+      blade is not checked here; generate_0r_trajectory keeps to the
+      trailing-edge envelope.
+    """
+    x_min: int
+    x_max: int
+    y_min: int
+    y_max: int
+    y_base: Optional[int] = None
+    x_center: Optional[int] = None
+    radius: Optional[int] = None
+    tip_margin: int = 0
+
+
+def validate_trajectory(steps: np.ndarray, limits: TrajectoryLimits) -> List[str]:
+    """Return a list of human readable problems (empty list == trajectory is OK)."""
+    problems = []
+    xs, dys = steps[:, 0], steps[:, 1]
+
+    bad_x = np.flatnonzero((xs < limits.x_min) | (xs > limits.x_max))
+    if bad_x.size:
+        problems.append(f"{bad_x.size} punkti X väljaspool telje piire "
+                        f"[{limits.x_min}..{limits.x_max}] (esimene rida {bad_x[0] + 1})")
+
+    y_range = limits.y_max - limits.y_min
+    if limits.y_base is not None:
+        ys = limits.y_base + dys
+        bad_y = np.flatnonzero((ys < limits.y_min) | (ys > limits.y_max))
+        if bad_y.size:
+            problems.append(f"{bad_y.size} punkti Y väljaspool telje piire "
+                            f"[{limits.y_min}..{limits.y_max}] (esimene rida {bad_y[0] + 1})")
+    elif int(dys.max() - dys.min()) > y_range:
+        problems.append(f"Y nihete ulatus {int(dys.max() - dys.min())} ületab Y telje käigu {y_range}")
+
+    if limits.x_center is not None and limits.radius is not None:
+        reach = int(np.abs(xs - limits.x_center).max())
+        need = int(limits.radius) + int(limits.tip_margin)
+        if reach < need:
+            problems.append(f"Trajektoori radiaalne ulatus tsentrist on {reach} sammu, "
+                            f"propelleri raadius + otsavaru on {need} sammu")
+    return problems
+
+
+# ============================================================
+# Compile + .npy cache
+# ============================================================
+
+@dataclass
+class CompiledTrajectory:
+    steps: np.ndarray                      # (N, 2) int64: [x_steps, dy_steps]
+    source: str
+    from_cache: bool = False
+    problems: List[str] = field(default_factory=list)
+
+    @property
+    def xs(self) -> List[int]:
+        return self.steps[:, 0].tolist()
+
+    @property
+    def ys(self) -> List[int]:
+        return self.steps[:, 1].tolist()
+
+    def __len__(self):
+        return len(self.steps)
+
+
+def _cache_key(data: bytes, steps_per_mm: float, spacing_steps: Optional[float]) -> str:
+    return cache_key(data, f"|v{CACHE_VERSION}|{float(steps_per_mm):.6f}|{float(spacing_steps or 0):.3f}")
+
+
+def compile_trajectory(path, steps_per_mm: float, spacing_steps: Optional[float] = None,
+                       limits: Optional[TrajectoryLimits] = None,
+                       use_cache: bool = True) -> CompiledTrajectory:
+    """
+    Parse (or load from cache), optionally resample and validate a trajectory file.
+    The compiled step array is cached next to the source as ".<name>.<key>.npy";
+    the key covers file contents, steps/mm and spacing, so edits invalidate it.
+    Validation always runs (limits may change between loads).
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    key = _cache_key(data, steps_per_mm, spacing_steps)
+    cache = cache_path(path, key)
+
+    steps = None
+    from_cache = False
+    arr = read_cache(cache, "Trajectory") if use_cache else None
+    if arr is not None and arr.ndim == 2 and arr.shape[1] == 2 and len(arr):
+        steps, from_cache = arr.astype(np.int64, copy=False), True
+
+    if steps is None:
+        steps = parse_trajectory_text(data.decode('utf-8', errors='replace'), steps_per_mm)
+        steps = resample_path(steps, spacing_steps)
+        if use_cache:
+            write_cache(path, cache, steps, "Trajectory")
+
+    problems = validate_trajectory(steps, limits) if limits is not None else []
+    return CompiledTrajectory(steps=steps, source=str(path), from_cache=from_cache, problems=problems)
+
+
+def write_trajectory_file(path, steps, header_lines: Tuple[str, ...] = ()):
+    """Write waypoints in the classic space-delimited 'x dy' step format (optional '#' header)."""
+    with open(path, "w", newline='', encoding="utf-8") as f:
+        for line in header_lines:
+            f.write(f"# {line}\n")
+        for x, dy in steps:
+            f.write(f"{int(x)} {int(dy)}\n")
+
+
+# ============================================================
+# 0R trajectory generator (trailing-edge envelope)
+#
+# Y steps grow toward the propeller: Y=0 is the retracted position the
+# post-sweep chain uses for safe X moves. The probe start Y (series Y0) is
+# set so that the Pitot tip is hub_offset_mm behind the blade pitch-axis
+# plane; each waypoint's dY moves the tip as close to the trailing edge as
+# the clearance margin allows.
+# ============================================================
+
+Y_TOWARD_PROP = 1
+
+
+def read_blade_stations(prop_cfg_path):
+    """
+    Read a propeller configuration file ("r_mm chord_angle_deg chord_length_mm" rows).
+    Returns (r_mm, angle_deg, chord_mm) arrays sorted by radius.
+    """
+    from data.data_processing import _read_rows_space_delimited
+    rows = []
+    for tokens in _read_rows_space_delimited(prop_cfg_path):
+        if len(tokens) < 3:
+            continue
+        try:
+            rows.append((float(tokens[0]), float(tokens[1]), float(tokens[2])))
+        except ValueError:
+            continue
+    if not rows:
+        raise ValueError("Propelleri konfiguratsiooni failis pole sektsioone (r nurk kõõl).")
+    arr = np.asarray(sorted(rows), dtype=float)
+    return arr[:, 0], arr[:, 1], arr[:, 2]
+
+
+def trailing_edge_depth(angle_deg, chord_mm, te_fraction: float = 0.75):
+    """Axial distance of the trailing edge behind the pitch-axis plane (mm)."""
+    return te_fraction * np.asarray(chord_mm, dtype=float) * np.abs(np.sin(np.radians(angle_deg)))
+
+
+def _corridor_polyline(r, upper, tol):
+    """
+    Sparse polyline through the corridor [upper - tol, upper] on the grid r.
+    Vertices sit on the corridor centre line; each segment is extended as far
+    as it stays inside the corridor (greedy, first-failure stop).
+    """
+    mid = upper - tol / 2.0
+    lower = upper - tol
+    idx = [0]
+    i = 0
+    n = len(r)
+    while i < n - 1:
+        best = i + 1
+        for j in range(i + 2, n):
+            t = (r[i:j + 1] - r[i]) / (r[j] - r[i])
+            line = mid[i] + t * (mid[j] - mid[i])
+            if np.any(line > upper[i:j + 1] + 1e-9) or np.any(line < lower[i:j + 1] - 1e-9):
+                break
+            best = j
+        idx.append(best)
+        i = best
+    return r[idx], mid[idx]
+
+
+def generate_0r_trajectory(prop_cfg_path, x_center_steps: int, steps_per_mm: float,
+                           hub_offset_mm: float, clearance_mm: float,
+                           radius_mm: Optional[float] = None, r_end_mm: Optional[float] = None,
+                           te_fraction: float = 0.75, probe_halfwidth_mm: float = 2.0,
+                           tolerance_mm: float = 1.0, grid_mm: float = 0.5) -> np.ndarray:
+    """
+    Build a collision-free 0R waypoint list (N, 2) [x_steps, dy_steps] from blade geometry.
+    - the required axial standoff at radius r is TE depth + clearance, taken as the
+      maximum over [r - probe_halfwidth, r + probe_halfwidth] (probe has a width)
+    - inboard of the first station the first station is used, outboard of the tip
+      the tip value is held until r_end_mm (default: radius + clearance)
+    - waypoints are as sparse as a straight segment allows while staying within
+      tolerance_mm of the envelope on the safe side
+    """
+    r_st, ang, chord = read_blade_stations(prop_cfg_path)
+    standoff = trailing_edge_depth(ang, chord, te_fraction) + float(clearance_mm)
+    radius_mm = float(radius_mm) if radius_mm else float(r_st[-1])
+    r_end = float(r_end_mm) if r_end_mm else radius_mm + float(clearance_mm)
+
+    r = np.arange(0.0, r_end + grid_mm / 2.0, grid_mm)
+    need = np.interp(r, r_st, standoff)                 # holds end values outside the stations
+    w = max(0, int(round(probe_halfwidth_mm / grid_mm)))
+    if w:
+        padded = np.pad(need, w, mode='edge')
+        windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * w + 1)
+        need = windows.max(axis=1)
+
+    upper = float(hub_offset_mm) - need                 # how far toward the prop the tip may go
+    r_pts, p_pts = _corridor_polyline(r, upper, max(float(tolerance_mm), 1e-3))
+
+    spmm = float(steps_per_mm)
+    xs = int(x_center_steps) - np.rint(r_pts * spmm).astype(np.int64)
+    dys = np.rint(Y_TOWARD_PROP * p_pts * spmm).astype(np.int64)
+    return np.column_stack((xs, dys))
@@ -1,10 +1,12 @@
 import numpy as np
-from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 
 class Canvas(FigureCanvasQTAgg):
     def __init__(self):
-        self.fig, (self.ax1, self.ax2) = plt.subplots(nrows=2, sharex=True)
+        # Figure directly (not pyplot): no global figure manager / backend probing at import
+        self.fig = Figure()
+        self.ax1, self.ax2 = self.fig.subplots(nrows=2, sharex=True)
         super().__init__(self.fig)
         self.ax1.grid(True)
         self.ax2.grid(True)
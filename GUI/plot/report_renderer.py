@@ -0,0 +1,167 @@
+# plot/report_renderer.py
+"""
+Headless summary plots for processed runs.
+
+render_report() reads a _mean.csv and draws the summary figure with the Agg
+backend (no Qt, no pyplot): velocity profiles over X, CL / CD, alpha and Re
+(tandem mean files: both props' columns in the same panels). It is a plain module-level
+function so it can run in a worker process:
+
+  - ReportRenderer   one-process pool owned by the GUI; processing submits the
+                     figure and gets rendered / failed signals back, the UI
+                     thread never waits for savefig.
+  - render_batch()   the archive re-plot: one task per mean file over a pool
+                     of N processes (tools/render_reports.py).
+
+Workers are started with 'spawn' so they never inherit a forked copy of the Qt
+application.
+"""
+import csv
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# columns read from the mean file; missing ones are simply not drawn
+_COLUMNS = ("x_mm", "v_tan_mps", "v_rad_mps", "v_axial_mps",
+            "CL", "CD", "alpha_angle_deg", "helix_angle_eff_deg", "Re",
+            "CL1", "CD1", "alpha_angle1_deg", "helix_angle_eff1_deg", "Re1",
+            "CL2", "CD2", "alpha_angle2_deg", "helix_angle_eff2_deg", "Re2")
+
+
+def read_mean_columns(mean_file) -> Dict[str, List[float]]:
+    """Section rows of a _mean.csv as {column: values} (summary block skipped)."""
+    cols: Dict[str, List[float]] = {}
+    header = None
+    with open(mean_file, newline="") as f:
+        for row in csv.reader(f):
+            if not row or not any(c.strip() for c in row):
+                if header is not None:
+                    break
+                continue
+            if header is None:
+                header = [c.strip() for c in row]
+                cols = {c: [] for c in _COLUMNS if c in header}
+                idx = {c: header.index(c) for c in cols}
+                continue
+            for c, i in idx.items():
+                try:
+                    cols[c].append(float(row[i]))
+                except (IndexError, ValueError):
+                    cols[c].append(float("nan"))
+    if "x_mm" not in cols:
+        raise ValueError(f"{mean_file}: x_mm veerg puudub")
+    return cols
+
+
+def default_png(mean_file) -> str:
+    """log<dt>_mean.csv -> log<dt>.png (the name processing always used)."""
+    p = Path(mean_file)
+    stem = p.stem[:-len("_mean")] if p.stem.endswith("_mean") else p.stem
+    return str(p.with_name(stem + ".png"))
+
+
+def render_report(mean_file, out_png: Optional[str] = None, title: Optional[str] = None,
+                  dpi: int = 120) -> str:
+    """Draw the summary figure of one run and save it; returns the png path."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    cols = read_mean_columns(mean_file)
+    out_png = out_png or default_png(mean_file)
+    x = cols["x_mm"]
+
+    panels = [("velocity", ["v_tan_mps", "v_rad_mps", "v_axial_mps"], "V (m/s)"),
+              ("coeff", ["CL", "CD", "CL1", "CD1", "CL2", "CD2"], "CL / CD"),
+              ("angle", ["alpha_angle_deg", "helix_angle_eff_deg",
+                         "alpha_angle1_deg", "helix_angle_eff1_deg",
+                         "alpha_angle2_deg", "helix_angle_eff2_deg"], "nurk (°)"),
+              ("re", ["Re", "Re1", "Re2"], "Re")]
+    panels = [(k, [c for c in names if c in cols], label) for k, names, label in panels]
+    panels = [p for p in panels if p[1]]
+
+    fig = Figure(figsize=(8, 3.2 * len(panels)))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(nrows=len(panels), sharex=True, squeeze=False)[:, 0]
+    labels = {"v_tan_mps": "V_tan", "v_rad_mps": "V_rad", "v_axial_mps": "V_axial",
+              "alpha_angle_deg": "alpha", "helix_angle_eff_deg": "helix",
+              "alpha_angle1_deg": "alpha1", "helix_angle_eff1_deg": "helix1",
+              "alpha_angle2_deg": "alpha2", "helix_angle_eff2_deg": "helix2"}
+    for ax, (_, names, ylabel) in zip(axes, panels):
+        for c in names:
+            ax.plot(x, cols[c], marker=".", label=labels.get(c, c))
+        ax.set_ylabel(ylabel)
+        ax.grid(True)
+        ax.legend()
+    axes[-1].set_xlabel("X (mm)")
+    axes[0].set_title(title or Path(mean_file).resolve().parent.name)
+    fig.tight_layout()
+
+    tmp = out_png + ".tmp.png"
+    fig.savefig(tmp, dpi=dpi)
+    os.replace(tmp, out_png)
+    return out_png
+
+
+def _context():
+    return multiprocessing.get_context("spawn")
+
+
+def render_batch(jobs: Iterable[Tuple[str, Optional[str]]], workers: Optional[int] = None,
+                 progress=None) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    Render (mean_file, out_png) jobs in parallel. progress(done, total, mean_file)
+    is called as results come in. Returns (written pngs, [(mean_file, error)]).
+    """
+    jobs = list(jobs)
+    done, errors = [], []
+    if not jobs:
+        return done, errors
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_context()) as pool:
+        futures = {pool.submit(render_report, mean, png): mean for mean, png in jobs}
+        for n, fut in enumerate(as_completed(futures), 1):
+            mean = futures[fut]
+            try:
+                done.append(fut.result())
+            except Exception as e:
+                errors.append((mean, str(e)))
+            if progress:
+                progress(n, len(jobs), mean)
+    return done, errors
+
+
+class ReportRenderer(QObject):
+    """Renders summary figures in a background process; signals fire on the GUI thread."""
+    rendered = pyqtSignal(str)          # png path
+    failed = pyqtSignal(str, str)       # mean file, error
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def submit(self, mean_file: str, out_png: Optional[str] = None, title: Optional[str] = None):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=1, mp_context=_context())
+        try:
+            fut = self._pool.submit(render_report, mean_file, out_png, title)
+        except RuntimeError as e:           # pool broken / shut down
+            self._pool = None
+            self.failed.emit(mean_file, str(e))
+            return
+        # done-callbacks run on a pool thread; emitting from there is queued to the GUI thread
+        fut.add_done_callback(lambda f, m=mean_file: self._done(m, f))
+
+    def _done(self, mean_file, fut):
+        try:
+            self.rendered.emit(fut.result())
+        except Exception as e:
+            self.failed.emit(mean_file, str(e))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,8 @@
+# tests/conftest.py
+"""Tests import the GUI modules the way app.py does (GUI/ on sys.path)."""
+import sys
+from pathlib import Path
+
+GUI_DIR = Path(__file__).resolve().parent.parent
+if str(GUI_DIR) not in sys.path:
+    sys.path.insert(0, str(GUI_DIR))
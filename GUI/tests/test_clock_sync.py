@@ -0,0 +1,113 @@
+# tests/test_clock_sync.py
+import numpy as np
+import pytest
+
+from utils.clock_sync import MIN_SPAN_S, ClockSync, FrameTiming
+
+PERIOD_MS = 20                      # 50 Hz frames, millis() ticks
+
+
+def _stream(seconds, drift_ppm=0.0, jitter_ms=0.0, seed=1, t0_ns=10**12, tick0=0):
+    """(tick, host_ns) of a frame stream; the MCU clock runs drift_ppm slow vs the host."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * 1000 / PERIOD_MS)
+    ticks = tick0 + np.arange(n) * PERIOD_MS
+    true_ns = t0_ns + (ticks - tick0) * 1e6 * (1 + drift_ppm * 1e-6)
+    latency = 1e6 + rng.exponential(jitter_ms * 1e6, n) if jitter_ms else np.full(n, 1e6)
+    return ticks, (true_ns + latency).astype(np.int64), true_ns
+
+
+def test_aligned_time_removes_jitter():
+    ticks, host, true_ns = _stream(30, jitter_ms=3.0)
+    sync = ClockSync(1000.0)
+    aligned = np.array([sync.add(t, h) for t, h in zip(ticks, host)])
+    tail = slice(len(ticks) // 2, None)
+    raw_err = np.std(host[tail] - true_ns[tail])
+    aligned_err = np.std(aligned[tail] - true_ns[tail])
+    assert aligned_err < raw_err / 5
+    assert np.all(np.diff(aligned) > 0)
+
+
+def test_drift_estimate_after_min_span():
+    ticks, host, _ = _stream(MIN_SPAN_S + 40, drift_ppm=50.0, jitter_ms=1.0)
+    sync = ClockSync(1000.0)
+    early = int(MIN_SPAN_S * 1000 / PERIOD_MS) - 50
+    for t, h in zip(ticks[:early], host[:early]):
+        sync.add(t, h)
+    assert sync.drift_ppm is None                  # span too short to trust the slope
+    for t, h in zip(ticks[early:], host[early:]):
+        sync.add(t, h)
+    assert sync.drift_ppm == pytest.approx(50.0, abs=10.0)
+    assert sync.summary()["frames"] == len(ticks)
+
+
+def test_counter_wrap_is_unwrapped():
+    wrap = 2 ** 16
+    ticks, host, true_ns = _stream(5, tick0=wrap - 1000)
+    sync = ClockSync(1000.0, wrap=wrap)
+    aligned = [sync.add(t % wrap, h) for t, h in zip(ticks, host)]
+    assert sync.resets == 0
+    assert np.all(np.diff(aligned) > 0)
+
+
+def test_counter_going_backwards_restarts_the_fit():
+    sync = ClockSync(1000.0)
+    sync.add(50_000, 10**9)
+    sync.add(50_020, 10**9 + 20 * 10**6)
+    sync.add(10, 10**9 + 40 * 10**6)             # MCU reboot
+    assert sync.resets == 1 and sync.samples == 1
+
+
+def test_bad_parameters():
+    with pytest.raises(ValueError):
+        ClockSync(0)
+    with pytest.raises(ValueError):
+        ClockSync(1000.0, window=1)
+
+
+def test_frame_timing_rate_and_gaps():
+    timing = FrameTiming()
+    t = 0
+    for k in range(100):
+        t += 20_000_000 if k != 50 else 100_000_000     # one 100 ms gap = 4 missing frames
+        timing.add(t)
+    timing.add(0)                                       # unstamped frames are ignored
+    s = timing.summary()
+    assert s["frames"] == 100
+    assert s["gaps"] == 1 and s["missing_est"] == 4
+    assert s["period_ms"] == pytest.approx(20.0)
+    assert s["jitter_ms"] == pytest.approx(0.0, abs=1e-3)
+    assert s["max_gap_ms"] == pytest.approx(100.0)
+    assert FrameTiming().summary() == {"frames": 0}
+
+
+def test_frame_timing_frames_of_one_read_are_a_batch():
+    # 50 Hz frames delivered two per read: one stamp per read, no frame lost
+    timing = FrameTiming()
+    t = 0
+    for _ in range(200):
+        t += 40_000_000
+        timing.add(t)
+        timing.add(t)
+    s = timing.summary()
+    assert s["frames"] == 400
+    assert s["gaps"] == 0 and s["missing_est"] == 0
+    assert s["period_ms"] == pytest.approx(20.0)
+    assert s["jitter_ms"] == pytest.approx(0.0, abs=1e-3)
+    assert s["rate_hz"] == pytest.approx(50.0)
+
+
+def test_frame_timing_uneven_batches_and_a_gap():
+    timing = FrameTiming()
+    t = 0
+    for k in range(60):
+        n = (1, 3, 2)[k % 3]                       # 1, 3, 2 frames per read, 20 ms each
+        t += n * 20_000_000
+        if k == 40:
+            t += 60_000_000                        # three frames lost before this read
+        for _ in range(n):
+            timing.add(t)
+    s = timing.summary()
+    assert s["frames"] == 120
+    assert s["period_ms"] == pytest.approx(20.0)
+    assert s["gaps"] == 1 and s["missing_est"] == 3
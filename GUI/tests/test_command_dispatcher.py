@@ -0,0 +1,160 @@
+# tests/test_command_dispatcher.py
+import types
+
+import pytest
+import serial
+
+from PyQt5.QtCore import QCoreApplication
+
+import workers.command_dispatcher as cd
+from workers.command_dispatcher import ACK_RULES, SAFETY_COMMANDS, CommandDispatcher, ack_rule_for
+
+
+@pytest.fixture(scope="module", autouse=True)
+def qapp():
+    # QTimer needs an application object on the thread
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(cd, "time", types.SimpleNamespace(monotonic=c.monotonic))
+    return c
+
+
+@pytest.fixture
+def rig():
+    """Dispatcher writing into a list; returns (dispatcher, written commands, events)."""
+    written, events = [], []
+    d = CommandDispatcher(lambda b: written.append(b.decode().rstrip("\n")))
+    d.acked.connect(lambda cmd, line: events.append(("ack", cmd, line)))
+    d.failed.connect(lambda cmd, reason: events.append(("fail", cmd, reason)))
+    return d, written, events
+
+
+def test_every_rule_is_found_by_its_prefix():
+    for rule in ACK_RULES:
+        assert ack_rule_for(rule.prefix) is rule             # no rule shadowed by an earlier one
+    assert ack_rule_for("moveAoSSTubeAbs|5").prefix == "moveAoSSTubeAbs|"
+    assert ack_rule_for("moveAoSS|5").prefix == "moveAoSS|"
+    assert ack_rule_for("ON") is None and ack_rule_for("BeaconOFF") is None
+
+
+def test_reply_matching_completes_the_right_command(rig):
+    d, written, events = rig
+    got = []
+    d.send("trimAoA|1.5", on_ack=got.append)
+    d.send("setRamp|300", on_ack=got.append)
+    assert written == ["trimAoA|1.5", "setRamp|300"]      # pipelined
+    d.on_line("something else")
+    d.on_line("OK|rampMs=300\r")                          # case-insensitive, out of order
+    d.on_line("trimAoA set")
+    assert got == ["OK|rampMs=300\r", "trimAoA set"]
+    assert [e[1] for e in events] == ["setRamp|300", "trimAoA|1.5"]
+    assert not d.busy()
+
+
+def test_fail_reply_calls_on_fail(rig):
+    d, _, events = rig
+    fails = []
+    d.send("setAoSSLimits|-40|0", on_fail=fails.append)
+    d.on_line("setAoSSLimits|ERR|range")
+    assert fails == ["setAoSSLimits|ERR|range"] and events[0][0] == "fail"
+
+
+def test_fire_and_forget_is_done_once_written(rig):
+    d, written, _ = rig
+    got = []
+    d.send("ON", on_ack=got.append)
+    assert written == ["ON"] and got == [""] and not d.busy()
+
+
+def test_timeout_retries_then_fails(rig, clock):
+    d, written, _ = rig
+    fails = []
+    d.send("tare", on_fail=fails.append)                  # 15 s, one retry
+    clock.now += 14.9
+    d._check_timeouts()
+    assert written == ["tare"] and not fails
+    clock.now += 0.2
+    d._check_timeouts()
+    assert written == ["tare", "tare"] and not fails
+    clock.now += 15.1
+    d._check_timeouts()
+    assert fails == ["timeout"] and not d.busy()
+
+
+def test_exclusive_command_holds_the_queue(rig):
+    d, written, _ = rig
+    d.send("j|100|0")
+    d.send("tare")
+    assert written == ["j|100|0"]
+    d.on_line("Jog done")
+    assert written == ["j|100|0", "tare"]
+
+
+@pytest.mark.parametrize("cmd", sorted(SAFETY_COMMANDS))
+def test_safety_commands_jump_the_queue(rig, cmd):
+    d, written, _ = rig
+    d.send("home")
+    d.send("center")
+    d.send("tare")
+    assert written == ["home"]
+    d.send(cmd)
+    assert written == ["home", cmd]                       # ahead of center / tare
+    d.on_line("Homing done")
+    if cmd == "stop":
+        assert written == ["home", cmd]                   # acknowledged: center waits for it
+        d.on_line("OK|stopping")
+    assert written == ["home", cmd, "center"]
+
+
+def test_guard_refuses_exclusive_at_once():
+    written, fails = [], []
+    d = CommandDispatcher(lambda b: written.append(b.decode().rstrip("\n")),
+                          guard=lambda cmd: "not homed" if cmd.startswith("j|") else None)
+    d.send("j|10|0", on_fail=fails.append)
+    d.send("tare")
+    assert fails == ["not homed"] and written == ["tare"]
+
+
+def test_clear_while_waiting_for_ack(rig):
+    d, written, events = rig
+    fails, acks = [], []
+    d.send("home", on_ack=acks.append, on_fail=fails.append)
+    d.send("tare", on_fail=fails.append)
+    d.clear("emergency")
+    assert fails == ["emergency", "emergency"] and not d.busy()
+    d.on_line("Homing done")                              # late reply is ignored
+    assert acks == [] and not [e for e in events if e[0] == "ack"]
+    d.send("tare")
+    assert written == ["home", "tare"]
+
+
+def test_write_error_fails_the_command():
+    def broken(_):
+        raise serial.SerialException("port gone")
+    fails = []
+    d = CommandDispatcher(broken)
+    d.send("tare", on_fail=fails.append)
+    assert fails and fails[0].startswith("write error") and not d.busy()
+
+
+def test_send_sequence_waits_for_each_reply(rig):
+    d, written, _ = rig
+    done = []
+    d.send_sequence(["trimAoA|0", "", "AoAlim|20", "ON"], on_done=lambda: done.append(True))
+    assert written == ["trimAoA|0"]
+    d.on_line("trimAoA set")
+    assert written == ["trimAoA|0", "AoAlim|20"]
+    d.on_line("limAoA set")
+    assert written[-1] == "ON" and done == [True]
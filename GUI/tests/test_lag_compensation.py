@@ -0,0 +1,108 @@
+# tests/test_lag_compensation.py
+import numpy as np
+import pytest
+
+from data.frame_log import FRAME_LOG_HEADER
+from data.lag_compensation import LagCompensator, binned_profile, estimate_delay
+from utils.frame import Frame
+
+DT_S = 0.02
+SPEED = 400.0                       # steps/s, sweeping towards X = 0
+
+
+def _frame(t_s, x, airspeed=10.0, thr1=1.0):
+    return Frame(x, 0.0, thr1, 0.1, 3000.0, airspeed, 1.0, 2.0, 3.0, 4.0,
+                 t_ns=int(round(t_s * 1e9)))
+
+
+def test_off_returns_the_same_frame():
+    lag = LagCompensator()
+    f = _frame(1.0, 100.0)
+    assert not lag.enabled and lag.apply(f) is f
+    assert LagCompensator(0.1).apply(Frame(1, 2, 0, 0, 0, 0, 0, 0, 0, 0)).x == 1   # no stamp
+
+
+def test_delay_moves_frames_back_along_the_track():
+    lag = LagCompensator(delay_s=0.1)
+    out = [lag.apply(_frame(k * DT_S, 5000.0 - SPEED * k * DT_S)) for k in range(50)]
+    # once the history reaches back, x is exactly the position 0.1 s earlier
+    for k in range(10, 50):
+        assert out[k].x == pytest.approx(5000.0 - SPEED * (k * DT_S - 0.1))
+    # at the start the fitted velocity extrapolates backwards
+    assert out[3].x == pytest.approx(5000.0 - SPEED * (3 * DT_S - 0.1))
+    assert lag.velocity[0] == pytest.approx(-SPEED)
+
+
+def test_loads_pass_through_and_stamps_are_kept():
+    lag = LagCompensator(delay_s=0.05, tau_s=0.1)
+    lag.apply(_frame(0.0, 100.0))
+    f = _frame(DT_S, 99.0, airspeed=12.0, thr1=7.0)
+    out = lag.apply(f)
+    assert (out.thr1, out.trq1, out.rpm1) == (7.0, 0.1, 3000.0)
+    assert (out.t_ns, out.t_mcu_ns) == (f.t_ns, f.t_mcu_ns)
+
+
+def test_tau_undoes_a_first_order_lag():
+    tau = 0.2
+    lag = LagCompensator(tau_s=tau)
+    # sensor output y of a first-order lag on a ramp u = 2 t: y = 2 (t - tau (1 - e^(-t/tau)))
+    ts = np.arange(0, 3, 0.001)
+    y = 2 * (ts - tau * (1 - np.exp(-ts / tau)))
+    outs = [lag.apply(_frame(t, 0.0, airspeed=v)).airspeed for t, v in zip(ts, y)]
+    assert outs[-1] == pytest.approx(2 * ts[-1], abs=0.01)
+
+
+def test_frames_sharing_a_read_stamp_are_all_delayed():
+    # 100 steps/s, frames every 10 ms delivered two per read (one stamp per read)
+    lag = LagCompensator(delay_s=0.2)
+    out = []
+    for k in range(0, 100, 2):
+        t = (k + 1) * 0.01
+        out += [lag.apply(_frame(t, 100.0 - k)), lag.apply(_frame(t, 100.0 - k - 1))]
+    for a, b in zip(out[40::2], out[41::2]):
+        assert a.x == pytest.approx(b.x)           # same stamp, same delayed position
+    # last read at 0.99 s: 0.2 s earlier is the read at 0.79 s, whose first frame was at x = 22
+    assert [f.x for f in out[-2:]] == pytest.approx([22.0, 22.0])
+
+
+def test_stamp_going_backwards_is_passed_through():
+    lag = LagCompensator(delay_s=0.1)
+    lag.apply(_frame(1.0, 10.0))
+    late = _frame(0.9, 11.0)
+    assert lag.apply(late) is late
+
+
+def test_bad_constants():
+    with pytest.raises(ValueError):
+        LagCompensator(delay_s=-0.1)
+    with pytest.raises(ValueError):
+        LagCompensator(delay_s=5.0)
+    with pytest.raises(ValueError):
+        LagCompensator(tau_s=-1.0)
+
+
+def _frame_log(speed, delay_s, seconds):
+    """Synthetic frame log: airspeed profile a(x) seen delay_s late by the probe."""
+    dtype = [(n, "<i8") for n in FRAME_LOG_HEADER[:2]] + [(n, "<f8") for n in FRAME_LOG_HEADER[2:]]
+    t = np.arange(0, seconds, DT_S)
+    x = 4000.0 - speed * t
+    x_seen = 4000.0 - speed * np.maximum(t - delay_s, 0.0)
+    log = np.zeros(len(t), dtype=dtype)
+    log["t_ns"] = (t * 1e9).astype(np.int64)
+    log["x"] = x
+    log["airspeed"] = 5.0 + 5.0 * np.sin(x_seen / 400.0)
+    return log
+
+
+def test_estimate_delay_recovers_the_lag():
+    slow = _frame_log(100.0, 0.3, 30.0)
+    fast = _frame_log(400.0, 0.3, 8.0)
+    delays = np.arange(0.0, 0.61, 0.05)
+    best, errors = estimate_delay(slow, fast, 80.0, delays)
+    assert best == pytest.approx(0.3)
+    assert errors.shape == delays.shape and np.nanargmin(errors) == 6
+
+
+def test_binned_profile_means_per_cell():
+    prof = binned_profile(np.array([0.0, 5.0, 12.0]), np.zeros(3), np.array([1.0, 3.0, 10.0]), 10.0)
+    assert prof == {(0, 0): 2.0, (1, 0): 10.0}
@@ -0,0 +1,65 @@
+# tests/test_omega_estimator.py
+import numpy as np
+import pytest
+
+from data.omega_estimator import (
+    estimate_omega, group_medians, hist_mode, sweep_ids, trimmed_mean,
+)
+
+
+def test_hist_mode_peak_and_refinement():
+    v = [500.2, 500.7, 501.4, 600.0, 300.0]
+    assert hist_mode(v, 1.0) == pytest.approx((500.2 + 500.7 + 501.4) / 3)
+    assert hist_mode([]) == 0.0
+    with pytest.raises(ValueError):
+        hist_mode(v, 0.0)
+
+
+def test_hist_mode_survives_outliers():
+    # one wild sample used to size np.bincount over the whole range (MemoryError)
+    assert hist_mode([500.0] * 100 + [5e10]) == pytest.approx(500.0)
+    assert hist_mode([500.0] * 10 + [1e300, float("inf"), float("nan")]) == pytest.approx(500.0)
+
+
+def test_trimmed_mean():
+    assert trimmed_mean([1, 2, 3, 4, 100], 0.2) == pytest.approx(3.0)
+    with pytest.raises(ValueError):
+        trimmed_mean([1, 2], 0.5)
+
+
+def test_sweep_ids_from_rows_or_x_resets():
+    assert sweep_ids([0, 1, 2, 0, 1], sweep_rows=[3, 2]).tolist() == [0, 0, 0, 1, 1]
+    x = [0, 20, 40, 0, 20, 40, 60]
+    assert sweep_ids(x).tolist() == [0, 0, 0, 1, 1, 1, 1]
+    # row counts that do not add up fall back to the X resets
+    assert sweep_ids(x, sweep_rows=[2, 2]).tolist() == [0, 0, 0, 1, 1, 1, 1]
+
+
+def test_group_medians():
+    assert group_medians([5, 1, 3, 10, 20], [0, 0, 0, 1, 1]).tolist() == [3.0, 15.0]
+
+
+def test_estimate_skips_motor_off_frames_and_reports_drift():
+    x = np.tile(np.arange(0, 100, 10.0), 4)
+    omega = np.concatenate([np.full(10, w) for w in (500.0, 505.0, 510.0, 515.0)])
+    omega[0] = 0.0                              # motor-off frame
+    est = estimate_omega(omega, x, method="sweep_median")
+    assert est.n == 39
+    assert est.sweep_medians.tolist() == [500.0, 505.0, 510.0, 515.0]
+    assert est.value == pytest.approx(507.5)
+    assert est.drift == pytest.approx(5.0)
+    assert est.drift_pct == pytest.approx(15.0 / 507.5 * 100)
+    assert est.drifting
+
+
+def test_estimate_single_sweep_uses_segments():
+    est = estimate_omega(np.full(40, 300.0))
+    assert est.value == pytest.approx(300.0)
+    assert est.drift == 0.0 and not est.drifting
+    assert est.rpm == pytest.approx(300.0 * 60 / (2 * np.pi))
+
+
+def test_estimate_empty_and_unknown_method():
+    assert estimate_omega([0.0, 0.5]).value == 0.0
+    with pytest.raises(ValueError):
+        estimate_omega([1.0], method="mode")
@@ -0,0 +1,79 @@
+# tests/test_protocol.py
+import math
+
+import pytest
+
+from utils import protocol
+from utils.protocol import Malformed, Measurements, parse_line, register
+
+# one sample line per registered prefix -> expected message
+SAMPLES = {
+    "ready!": ("Ready!", protocol.Ready()),
+    "emergency!": ("Emergency!", protocol.Emergency()),
+    "emergency cleared": ("Emergency cleared", protocol.EmergencyCleared()),
+    "homing done": ("Homing done", protocol.HomingDone()),
+    "limit switch": ("Limit switch", protocol.LimitSwitch()),
+    "tare done": ("Tare done", protocol.TareDone()),
+    "centering done": ("Centering done", protocol.CenteringDone()),
+    "jog done": ("Jog done", protocol.JogDone()),
+    "over axis limit": ("Over axis limit", protocol.OverAxisLimit()),
+    "calval:": ("CalVal: 412.5", protocol.CalVal(412.5)),
+    "lc test:": ("LC test: 1 2 3 4 5 6 7 8 9 10", protocol.LcTest(*map(float, range(1, 11)))),
+    "readaoa|": ("readAoA|1786|92.35|0.12", protocol.ReadAoA("1786", "92.35")),
+    "readaoss|": ("readAoSS|12|1|45.0|44.5", protocol.ReadAoSS("12", "1", "45.0", "44.5")),
+    "measurements:": ("Measurements: 1 2 3 4 5 6 7 8 9 10 11 12 13 14",
+                      Measurements(*map(float, range(1, 15)))),
+}
+
+
+def test_samples_cover_every_registered_prefix():
+    assert sorted(SAMPLES) == protocol.registered_prefixes()
+
+
+@pytest.mark.parametrize("prefix", sorted(SAMPLES))
+def test_round_trip(prefix):
+    line, expected = SAMPLES[prefix]
+    msg = parse_line(line)
+    assert type(msg) is type(expected)
+    assert msg == expected
+    # prefixes are case-insensitive
+    assert parse_line(line.upper()) == expected
+
+
+def test_measurements_without_tick():
+    msg = parse_line("Measurements: 1 2 3 4 5 6 7 8 9 10 11 12 13")
+    assert type(msg) is Measurements
+    assert msg.rpm2 == 13.0 and math.isnan(msg.tick)
+
+
+@pytest.mark.parametrize("line", [
+    "Measurements: 1 2 3",
+    "Measurements: 1 2 3 4 5 6 7 8 9 10 11 12 x",
+    "CalVal: abc",
+    "LC test: 1 2",
+    "readAoA|1",
+])
+def test_malformed(line):
+    msg = parse_line(line)
+    assert isinstance(msg, Malformed)
+    assert msg.line == line and msg.reason
+
+
+def test_status_found_anywhere_in_noise():
+    assert parse_line("\x00\x13boot... Ready!") == protocol.Ready()
+    assert parse_line("x: tare done") == protocol.TareDone()
+
+
+def test_longest_prefix_wins():
+    assert type(parse_line("Emergency cleared")) is protocol.EmergencyCleared
+    assert type(parse_line("Emergency!")) is protocol.Emergency
+
+
+def test_unknown_lines():
+    assert parse_line("debug: 42") is None
+    assert parse_line("") is None
+
+
+def test_prefix_too_short():
+    with pytest.raises(ValueError):
+        register("abc", lambda line, payload: None)
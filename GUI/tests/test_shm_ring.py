@@ -0,0 +1,115 @@
+# tests/test_shm_ring.py
+import math
+
+import numpy as np
+import pytest
+
+from utils.frame import Frame
+from utils.protocol import Measurements
+from utils.shm_ring import FrameRing, iter_records, sample_stamps
+
+
+def _values(k):
+    return (float(k), 2.0, 3000.0, 4000.0, 0.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0, 12.0, 0.0, math.nan)
+
+
+@pytest.fixture
+def ring():
+    r = FrameRing(capacity=4)
+    yield r
+    r.close()
+
+
+def _xs(views):
+    return [msg.x for _, _, msg in iter_records(views)]
+
+
+def test_read_in_order_and_empty(ring):
+    reader = ring.reader()
+    assert reader.read() == ([], 0)
+    for k in range(3):
+        ring.push(_values(k), t_ns=100 + k, t_mcu_ns=0)
+    views, dropped = reader.read()
+    assert dropped == 0 and len(views) == 1
+    assert _xs(views) == [0.0, 1.0, 2.0]
+    assert views[0]["seq"].tolist() == [1, 2, 3]
+    assert reader.pending() == 0
+
+
+def test_read_across_the_wrap(ring):
+    reader = ring.reader()
+    for k in range(3):
+        ring.push(_values(k))
+    reader.read()
+    for k in range(3, 6):                   # slots 3, 0, 1
+        ring.push(_values(k))
+    views, dropped = reader.read()
+    assert dropped == 0 and len(views) == 2
+    assert _xs(views) == [3.0, 4.0, 5.0]
+
+
+def test_max_n_limits_the_batch(ring):
+    reader = ring.reader()
+    for k in range(4):
+        ring.push(_values(k))
+    assert _xs(reader.read(max_n=3)[0]) == [0.0, 1.0, 2.0]
+    assert _xs(reader.read()[0]) == [3.0]
+
+
+def test_overrun_drops_oldest(ring):
+    reader = ring.reader()
+    for k in range(10):
+        ring.push(_values(k))
+    views, dropped = reader.read()
+    assert dropped == 6 and reader.dropped == 6
+    assert _xs(views) == [6.0, 7.0, 8.0, 9.0]
+
+
+def test_reader_from_head_and_skip(ring):
+    ring.push(_values(0))
+    late = ring.reader()
+    assert late.pending() == 0
+    early = ring.reader(from_start=True)
+    ring.push(_values(1))
+    early.skip()
+    assert early.read() == ([], 0)
+    assert _xs(late.read()[0]) == [1.0]
+
+
+def test_second_mapping_sees_the_records(ring):
+    other = FrameRing(ring.name, create=False)
+    try:
+        reader = other.reader()
+        ring.push(_values(7), t_ns=5, t_mcu_ns=9)
+        (t_ns, t_mcu_ns, msg), = list(iter_records(reader.read()[0]))
+        assert (t_ns, t_mcu_ns) == (5, 9)
+        assert type(msg) is Measurements and msg.x == 7.0 and math.isnan(msg.tick)
+        frame = Frame.from_measurements(msg, t_ns, t_mcu_ns)
+        assert (frame.thr1, frame.trq1, frame.t_sample_ns) == (3.0, 4.0, 9)
+    finally:
+        other.close()
+
+
+def test_sample_stamps_prefer_mcu_time(ring):
+    reader = ring.reader()
+    ring.push(_values(0), t_ns=100, t_mcu_ns=0)
+    ring.push(_values(1), t_ns=200, t_mcu_ns=190)
+    views, _ = reader.read()
+    assert sample_stamps(views[0]).tolist() == [100, 190]
+
+
+def test_attach_rejects_foreign_block():
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(create=True, size=4096)
+    try:
+        shm.buf[:8] = np.uint64(1).tobytes()
+        with pytest.raises(ValueError):
+            FrameRing(shm.name, create=False)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_capacity_must_hold_two_records():
+    with pytest.raises(ValueError):
+        FrameRing(capacity=1)
@@ -0,0 +1,77 @@
+# tests/test_station_align.py
+import numpy as np
+import pytest
+
+from data.station_align import align_pair, apply_interp, interp_weights, merge_stations
+
+
+def _table(x, va, thrust=None):
+    x = np.asarray(x, dtype=np.float64)
+    return {"header": ["x_mm"], "rows": [[str(v)] for v in x], "x_mm": x,
+            "v_axial": np.asarray(va, dtype=np.float64),
+            "thrust": np.asarray(thrust if thrust is not None else np.ones(len(x)), dtype=np.float64),
+            "samples": np.ones(len(x)), "prop_inch": 16.0}
+
+
+def test_merge_with_missing_stations_on_both_sides():
+    a = [0, 3, 6, 9, 12, 15]
+    b = [0.2, 6.1, 8.8, 15, 18]                   # 3 and 12 missing in B, 18 missing in A
+    ia, ib = merge_stations(a, b, tol_mm=0.5)
+    assert ia.tolist() == [0, 2, 3, 5]
+    assert ib.tolist() == [0, 1, 2, 3]
+
+
+def test_merge_is_one_to_one_and_respects_tolerance():
+    ia, ib = merge_stations([0.0, 0.3, 5.0], [0.1, 5.6], tol_mm=0.5)
+    assert ia.tolist() == [0] and ib.tolist() == [0]
+    empty = merge_stations([], [1.0])
+    assert [e.tolist() for e in empty] == [[], []]
+
+
+def test_interp_weights_inside_and_values():
+    i, t, inside = interp_weights([0, 10, 20], [-1, 0, 5, 15, 20, 21])
+    assert inside.tolist() == [False, True, True, True, True, False]
+    y = np.array([0.0, 10.0, 40.0])
+    assert apply_interp(y, i, t)[1:5].tolist() == [0.0, 5.0, 25.0, 40.0]
+
+
+def test_interp_variance_of_midpoint():
+    i, t, _ = interp_weights([0, 10], [5])
+    assert apply_interp([4.0, 4.0], i, t, variance=True)[0] == pytest.approx(2.0)
+
+
+def test_auto_falls_back_to_interp_when_grids_differ():
+    zero = _table([0, 3, 6, 9, 12], [1, 2, 3, 4, 5])
+    p8 = _table([1.5, 4.5, 7.5, 10.5], [10, 20, 30, 40])
+    pair = align_pair(zero, p8, mode="auto")
+    assert pair.mode == "interp"
+    assert pair.x_mm.tolist() == [3, 6, 9]
+    assert pair.va8.tolist() == pytest.approx([15, 25, 35])
+    assert [r[0] for r in pair.rows0] == ["3.0", "6.0", "9.0"]
+
+
+def test_merge_keeps_variances_aligned():
+    zero = _table([0, 3, 6], [1, 2, 3], thrust=[5, 6, 7])
+    p8 = _table([3, 6, 9], [20, 30, 40])
+    var0 = {"v_axial": np.array([0.1, 0.2, 0.3]), "thrust": np.array([1.0, 2.0, 3.0])}
+    var8 = {"v_axial": np.array([0.4, 0.5, 0.6]), "thrust": np.zeros(3)}
+    pair = align_pair(zero, p8, var0, var8, mode="merge")
+    assert pair.x_mm.tolist() == [3, 6]
+    assert pair.va0.tolist() == [2, 3] and pair.va8.tolist() == [20, 30]
+    assert pair.va0_var.tolist() == [0.2, 0.3] and pair.va8_var.tolist() == [0.4, 0.5]
+    assert pair.thrust.tolist() == [6, 7] and pair.thrust_var.tolist() == [2.0, 3.0]
+
+
+def test_grid_covers_shared_span():
+    zero = _table([0, 10, 20], [0, 10, 20])
+    p8 = _table([5, 25], [0, 20])
+    pair = align_pair(zero, p8, mode="grid", step_mm=5.0)
+    assert pair.x_mm.tolist() == [5, 10, 15, 20]
+    assert pair.va0.tolist() == pytest.approx([5, 10, 15, 20])
+    assert pair.va8.tolist() == pytest.approx([0, 5, 10, 15])
+    assert pair.rows0 is None
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        align_pair(_table([0], [1]), _table([0], [1]), mode="nearest")
@@ -0,0 +1,95 @@
+# tests/test_thrust_integration.py
+import math
+
+import numpy as np
+import pytest
+
+from data.thrust_integration import center_of_thrust, moment_weights, section_loading
+
+RHO = 1.2
+R = 0.2
+X = np.array([0.02, 0.05, 0.08, 0.11, 0.14, 0.17])
+VA0 = np.array([3.0, 5.0, 7.0, 8.0, 6.0, 2.0])
+VA08 = np.array([3.5, 4.0, 7.5, 9.0, 6.5, 2.5])
+
+
+def _old_quad_moment(x, va0, va08, radius, rho):
+    """The integrand of the former tools/calc_center_of_thrust.py (quad over searchsorted)."""
+    quad = pytest.importorskip("scipy.integrate").quad
+    dva = np.maximum(va08 - va0, 0.0)
+
+    def integrand(r):
+        idx = np.searchsorted(x, r) - 1
+        if idx < 0 or idx >= len(x):
+            return 0.0
+        return math.pi * rho * va0[idx] * (va0[idx] + dva[idx]) * r * r
+
+    return quad(integrand, x[0], radius, limit=1500, points=x[1:])[0]
+
+
+def test_step_weights_integrate_piecewise_constant():
+    g = np.array([1.0, 2.0, 3.0])
+    x = np.array([0.0, 1.0, 2.0])
+    w = moment_weights(x, 3.0, "step")
+    expected = 1.0 * (1 - 0) / 3 + 2.0 * (8 - 1) / 3 + 3.0 * (27 - 8) / 3
+    assert w @ g == pytest.approx(expected)
+    assert moment_weights(x, 3.0, "step", hold_to_radius=False) @ g == pytest.approx(1 / 3 + 14 / 3)
+
+
+def test_linear_weights_exact_for_linear_loading():
+    x = np.array([0.0, 0.5, 1.0])
+    g = 2.0 + 3.0 * x
+    w = moment_weights(x, 1.0, "linear")
+    # integral_0^1 (2 + 3r) r^2 dr = 2/3 + 3/4
+    assert w @ g == pytest.approx(2 / 3 + 3 / 4)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        moment_weights(X, R, "simpson")
+
+
+def test_step_matches_old_quad_result():
+    ct = center_of_thrust(X, VA0, VA08, thrust=[10.0, 12.0], radius_m=R, rho=RHO)
+    M_old = _old_quad_moment(X, VA0, VA08, R, RHO)
+    assert float(ct.thrust_moment) == pytest.approx(M_old, rel=1e-6)
+    assert float(ct.r_ct) == pytest.approx(2 * M_old / 11.0, rel=1e-6)
+    assert float(ct.pct) == pytest.approx(float(ct.r_ct) / R * 100)
+
+
+def test_broadcast_over_pairs():
+    va0 = np.stack([VA0, VA0 * 1.1])
+    va08 = np.stack([VA08, VA08 * 1.1])
+    thrust = np.array([[10.0, 12.0], [11.0, 13.0]])
+    ct = center_of_thrust(X, va0, va08, thrust, R, RHO, method="linear")
+    assert ct.r_ct.shape == (2,)
+    single = center_of_thrust(X, va0[1], va08[1], thrust[1], R, RHO, method="linear")
+    assert ct.r_ct[1] == pytest.approx(float(single.r_ct))
+
+
+def test_variance_propagation_matches_finite_difference():
+    va0_var = np.full(len(X), 0.01)
+    va08_var = np.full(len(X), 0.04)
+    ct = center_of_thrust(X, VA0, VA08, [10.0], R, RHO, va0_var=va0_var, va08_var=va08_var)
+    w = moment_weights(X, R)
+    # first-order: dM/dva = w * dg/dva, numerically
+    eps = 1e-6
+    dM0 = np.array([(section_loading(VA0 + eps * np.eye(len(X))[i], VA08, RHO)[0] @ w - ct.thrust_moment) / eps
+                    for i in range(len(X))])
+    dM8 = np.array([(section_loading(VA0, VA08 + eps * np.eye(len(X))[i], RHO)[0] @ w - ct.thrust_moment) / eps
+                    for i in range(len(X))])
+    expected = np.sqrt(np.sum(dM0 ** 2 * va0_var) + np.sum(dM8 ** 2 * va08_var))
+    assert float(ct.thrust_moment_std) == pytest.approx(expected, rel=1e-4)
+
+
+def test_thrust_variance_enters_r_ct():
+    base = center_of_thrust(X, VA0, VA08, [10.0, 10.0], R, RHO)
+    noisy = center_of_thrust(X, VA0, VA08, [10.0, 10.0], R, RHO, thrust_var=[0.5, 0.5])
+    assert float(base.r_ct_std) == 0.0
+    assert float(noisy.thrust_std) == pytest.approx(math.sqrt(1.0 / 4))
+    assert float(noisy.r_ct_std) == pytest.approx(2 * float(base.thrust_moment) / 100 * 0.5)
+
+
+def test_zero_thrust_gives_zero_radius():
+    ct = center_of_thrust(X, VA0, VA08, [0.0], R, RHO)
+    assert float(ct.r_ct) == 0.0
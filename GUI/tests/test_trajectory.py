@@ -0,0 +1,90 @@
+# tests/test_trajectory.py
+import numpy as np
+import pytest
+
+from data.trajectory import (
+    TrajectoryLimits, compile_trajectory, parse_num_to_steps, parse_trajectory_text,
+    resample_path, validate_trajectory,
+)
+
+SPMM = 80.0
+
+
+def test_units_and_defaults():
+    assert parse_num_to_steps("123", SPMM) == 123                  # integer -> steps
+    assert parse_num_to_steps("1.5", SPMM) == 120                  # decimal -> mm
+    assert parse_num_to_steps("2,5", SPMM) == 200                  # decimal comma
+    assert parse_num_to_steps("40 mm", SPMM) == 3200
+    assert parse_num_to_steps("1200 steps", SPMM) == 1200
+    assert parse_num_to_steps("10", SPMM, default_unit="mm") == 800
+
+
+def test_separators_and_comments():
+    text = ("# header\n"
+            "100 0\n"
+            "200;10\n"
+            "300\t-5   # comment\n"
+            "1200,300\n"
+            "2,5 1,5\n")
+    steps = parse_trajectory_text(text, SPMM)
+    assert steps.tolist() == [[100, 0], [200, 10], [300, -5], [1200, 300], [200, 120]]
+    assert steps.dtype == np.int64
+
+
+def test_units_directive():
+    steps = parse_trajectory_text("units: mm\n10 0\n20 1\n", SPMM)
+    assert steps.tolist() == [[800, 0], [1600, 80]]
+
+
+@pytest.mark.parametrize("line", ["12abc 30", "4x 5", "8 mmm", "1 2 3", "7"])
+def test_garbage_is_rejected_with_line_number(line):
+    with pytest.raises(ValueError, match=r"^Rida 2: "):
+        parse_trajectory_text(f"100 0\n{line}\n", SPMM)
+
+
+def test_empty_file():
+    with pytest.raises(ValueError):
+        parse_trajectory_text("# nothing\n\n", SPMM)
+
+
+def test_resample_keeps_end_points():
+    steps = np.array([[0, 0], [100, 0], [100, 100]], dtype=np.int64)
+    out = resample_path(steps, 10)
+    assert out[0].tolist() == [0, 0] and out[-1].tolist() == [100, 100]
+    assert len(out) == 21
+    assert np.allclose(np.hypot(*np.diff(out, axis=0).T), 10, atol=1)
+    assert resample_path(steps, 0) is steps
+
+
+def test_validate_axis_limits_and_reach():
+    steps = np.array([[1000, 0], [-5, 0], [400, 50]], dtype=np.int64)
+    limits = TrajectoryLimits(x_min=0, x_max=2000, y_min=0, y_max=40, y_base=0,
+                              x_center=1000, radius=500, tip_margin=200)
+    problems = validate_trajectory(steps, limits)
+    assert any("X väljaspool" in p and "rida 2" in p for p in problems)
+    assert any("Y väljaspool" in p and "rida 3" in p for p in problems)
+    assert not any("radiaalne" in p for p in problems)          # reach 1005 >= 700
+
+    short = np.array([[1000, 0], [600, 0]], dtype=np.int64)
+    problems = validate_trajectory(short, limits)
+    assert problems == ["Trajektoori radiaalne ulatus tsentrist on 400 sammu, "
+                        "propelleri raadius + otsavaru on 700 sammu"]
+
+
+def test_validate_y_span_without_base():
+    steps = np.array([[0, -30], [0, 30]], dtype=np.int64)
+    limits = TrajectoryLimits(x_min=0, x_max=10, y_min=0, y_max=50)
+    assert len(validate_trajectory(steps, limits)) == 1
+
+
+def test_compile_uses_cache(tmp_path):
+    src = tmp_path / "traj.txt"
+    src.write_text("100 0\n200 10\n")
+    first = compile_trajectory(src, SPMM)
+    second = compile_trajectory(src, SPMM)
+    assert not first.from_cache and second.from_cache
+    assert second.steps.tolist() == first.steps.tolist()
+    src.write_text("100 0\n300 10\n")
+    third = compile_trajectory(src, SPMM)
+    assert not third.from_cache and third.xs == [100, 300]
+    assert len(list(tmp_path.glob(".traj.txt.*.npy"))) == 1
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the MCU line parser (utils/protocol.py).
+
+Classifies + parses a synthetic serial stream (mostly Measurements frames with
+some status / readAoA / lc test / debug lines, as during a sweep) with the
+prefix registry and with the old if-chain of MainWindow.handleData (substring
+checks in order, then startswith + split + float), and prints µs per line.
+
+    python tools/bench_protocol.py
+    python tools/bench_protocol.py -n 200000 --frames 0.5
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.protocol import parse_line  # noqa: E402
+
+_OTHER = [
+    "Ready!", "Emergency cleared", "homing done", "tare done", "jog done",
+    "CalVal: 412.7", "readAoA|1786|92.35|0.12", "readAoSS|1500|0|12.5|3.1",
+    "LC test: 1234.5 120.1 56.7 5.1 3012 0 0 0 0 0",
+    "x=1200 y=300 state=2", "OK",
+]
+_STATUS = ("ready!", "emergency!", "emergency cleared", "homing done", "limit switch",
+           "tare done", "centering done", "jog done", "over axis limit")
+
+
+def make_lines(n: int, frames: float, seed: int = 1):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        if rnd.random() < frames:
+            v = [rnd.uniform(-5000, 5000) for _ in range(13)]
+            out.append("Measurements: " + " ".join(f"{x:.2f}" for x in v))
+        else:
+            out.append(rnd.choice(_OTHER))
+    return out
+
+
+def legacy_parse(s: str):
+    """The pre-registry handleData chain, reduced to classification + parsing."""
+    slow = s.lower()
+    for word in _STATUS:
+        if word in slow:
+            return word
+    if slow.startswith("calval:"):
+        return float(s.split(":", 1)[1].strip())
+    if slow.startswith("lc test:"):
+        return [float(x) for x in slow.split()[2:]]
+    if slow.startswith("readaoa|"):
+        return s.split("|")
+    if slow.startswith("readaoss|"):
+        return s.split("|")
+    if slow.startswith("measurements:"):
+        return tuple(map(float, slow.split("measurements:", 1)[1].strip().split()))
+    return None
+
+
+def bench(fns, lines, repeat: int):
+    """Best-of-repeat µs/line per parser; the parsers take turns in each round."""
+    best = [float("inf")] * len(fns)
+    for _ in range(max(1, repeat)):
+        for k, fn in enumerate(fns):
+            t0 = time.perf_counter()
+            for s in lines:
+                fn(s)
+            best[k] = min(best[k], time.perf_counter() - t0)
+    return [b / len(lines) * 1e6 for b in best]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the MCU line parser.")
+    ap.add_argument("-n", "--lines", type=int, default=100000)
+    ap.add_argument("--frames", type=float, default=0.9, help="share of Measurements lines")
+    ap.add_argument("-r", "--repeat", type=int, default=7)
+    args = ap.parse_args(argv)
+
+    lines = make_lines(max(1, args.lines), args.frames)
+    new, old = bench((parse_line, legacy_parse), lines, args.repeat)
+    print(f"{len(lines)} lines, {args.frames:.0%} frames (best of {args.repeat})")
+    print(f"  registry  {new:6.2f} µs/line")
+    print(f"  if-chain  {old:6.2f} µs/line   ({old / new:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,31 +1,10 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QFileDialog
 from PyQt5.QtCore import QTimer
-import csv, math, numpy as np, os
-from scipy.integrate import quad
+import csv, math, os
 from pathlib import Path
-
-# ------------------------------------------------------------
-# Local helpers (mirrors data_processing’s file reader style)
-# ------------------------------------------------------------
-def _read_rows_space_delimited(path):
-    """
-    Yield token lists from a file that may be comma- or space-delimited.
-    Skips header or any row where the first token is non-numeric.
-    """
-    with open(path, newline='') as f:
-        for raw in f:
-            s = raw.strip()
-            if not s:
-                continue
-            tokens = [t.strip() for t in s.split(',')] if ',' in s else s.split()
-            if not tokens:
-                continue
-            try:
-                float(tokens[0])
-            except ValueError:
-                # allow summary lines to be captured elsewhere; skip here
-                continue
-            yield tokens
+from data.run_manifest import manifest_for
+from data.thrust_integration import center_of_thrust, section_loading
+from data.station_align import load_pair
 
 def _try_read_rho_from_summary(path):
     """
@@ -114,122 +93,57 @@ class Calculate_center_of_thrust(QWidget):
             return
 
         # 1) Air density rho
-        rho = _try_read_rho_from_summary(zero_log_file)
+        manifest = manifest_for(zero_log_file)
+        rho = (manifest or {}).get("settings", {}).get("rho")
+        if rho is None:
+            rho = _try_read_rho_from_summary(zero_log_file)
         if rho is None:
             # Newer data_processing no longer writes Air_density; use a sensible default.
             rho = 1.225  # kg/m^3 @ sea level
             print("Air density not found in summary; using default rho = 1.225 kg/m^3.")
 
-        # 2) Load numeric rows from both files (comma- or space-delimited)
-        rows_zero_raw = list(_read_rows_space_delimited(zero_log_file))
-        rows_point8_raw = list(_read_rows_space_delimited(point_eight_log_file))
-        min_len = min(len(rows_zero_raw), len(rows_point8_raw))
-        rows_zero_raw = rows_zero_raw[:min_len]
-        rows_point8_raw = rows_point8_raw[:min_len]
-
-        # 3) Compute per-row metrics and build output rows
-        data_rows = []
-        va_zero_list, delta_va_list, x_pos_list, thrust_list = [], [], [], []
-        radius_m = None
-
-        for rz, rp in zip(rows_zero_raw, rows_point8_raw):
-            try:
-                # Column map follows data_processing single-prop CSV (no omega column in output):contentReference[oaicite:4]{index=4}
-                # 0=prop_inch, 1=x_mm, 2=y_mm, 3=torque, 4=thrust, 5=omega (raw logs), 6=airspeed, 7=aoa, 8=aoss,
-                # 9=v_tan, 10=v_rad, 11=v_axial, then geometry/kinematics in mean CSV.
-                v_axial_zero = float(rz[11])
-                v_axial_p8   = float(rp[11])
-                x_pos_m      = float(rz[2]) / 1000.0  # index 2 is y_mm in raw logs; BUT in mean CSV header it's x_mm at index 3.
-                                                     # We rely on raw-log layout used by data_processing readers:contentReference[oaicite:5]{index=5}.
-                # If the inputs are mean CSVs (comma variant), indices still align for the first 12 fields.
-                prop_inch    = float(rz[0])
-                thrust_zero  = float(rz[4])
-                delta_va     = max(v_axial_p8 - v_axial_zero, 0.0)
-
-                # radius from prop diameter in inches
-                radius_m = (prop_inch * 25.4 / 1000.0) / 2.0
-
-                diff_mass_rate = math.pi * rho * v_axial_zero * x_pos_m
-                diff_thrust    = math.pi * rho * v_axial_zero * (v_axial_zero + delta_va) * x_pos_m
-
-                # Track arrays (sorted later for integration)
-                va_zero_list.append(v_axial_zero)
-                delta_va_list.append(delta_va)
-                x_pos_list.append(x_pos_m)
-                thrust_list.append(thrust_zero)
-
-                # Append two new columns to the original row
-                data_rows.append(rz + [f"{diff_mass_rate:.2f}", f"{diff_thrust:.2f}"])
-            except Exception:
-                # Skip malformed rows silently (consistent with data_processing’s forgiving IO):contentReference[oaicite:6]{index=6}
-                continue
-
-        if not data_rows or radius_m is None:
+        # 2) Pair the runs on radial station (sorted merge on X; 0.8R interpolated onto the
+        #    0R stations if the grids differ), with station variances from the raw series logs
+        pair = load_pair(zero_log_file, point_eight_log_file, mode="auto")
+        prop_inch = (manifest or {}).get("run", {}).get("prop_diameter_in") or pair.prop_inch
+        if not len(pair.x_mm) or not prop_inch:
             print("No valid rows to process; aborting.")
             return
+        print(f"Stations: 0R {pair.n_zero}, 0.8R {pair.n_point8}, paired {len(pair.x_mm)} ({pair.mode})")
+        radius_m = (float(prop_inch) * 25.4 / 1000.0) / 2.0
+        x_m = pair.x_mm / 1000.0
+        va0, va8 = pair.va0, pair.va8
 
-        # 4) Sort by radius position for stable integration
-        order = np.argsort(x_pos_list)
-        x_sorted = [x_pos_list[i] for i in order]
-        va_sorted = [va_zero_list[i] for i in order]
-        dva_sorted = [delta_va_list[i] for i in order]
-
-        def thrust_moment_integrand(x):
-            # piecewise-constant (left) sampling with searchsorted
-            idx = np.searchsorted(x_sorted, x) - 1
-            if idx < 0 or idx >= len(x_sorted):
-                return 0.0
-            va0 = va_sorted[idx]
-            dva = dva_sorted[idx]
-            thrust_contrib = math.pi * rho * va0 * (va0 + dva) * x
-            return thrust_contrib * x  # moment = force * radius
-
-        lower = x_sorted[0]
-        upper = radius_m
-        if lower >= upper:
-            lower = 0.0  # fallback
+        # 3) Closed-form integration over the stations (step model, last station held to R)
+        ct = center_of_thrust(x_m, va0, va8, pair.thrust, radius_m, rho,
+                              va0_var=pair.va0_var, va08_var=pair.va8_var, thrust_var=pair.thrust_var)
+        thrust_moment = float(ct.thrust_moment)
+        r_CT = float(ct.r_ct)
+        center_of_thrust_pct = float(ct.pct)
 
-        thrust_moment, _ = quad(thrust_moment_integrand, lower, upper, limit=1500)
-        thrust_mean = sum(thrust_list) / max(len(thrust_list), 1)
-        r_CT = 2.0 * thrust_moment / thrust_mean if thrust_mean else 0.0
-        center_of_thrust_pct = (r_CT / radius_m) * 100.0 if radius_m else 0.0
+        g, _, _ = section_loading(va0, va8, rho)
+        diff_mass_rate = math.pi * rho * va0 * x_m
+        diff_thrust = g * x_m
+        data_rows = [row + [f"{m:.2f}", f"{t:.2f}"]
+                     for row, m, t in zip(pair.rows0, diff_mass_rate, diff_thrust)]
 
-        # 5) Write structured CSV (comma-separated) with a summary block appended (like data_processing):contentReference[oaicite:7]{index=7}
+        # 4) Write structured CSV (comma-separated) with a summary block appended (like data_processing)
         base, ext = os.path.splitext(zero_log_file)
         out_path = base + "_ct.csv"
 
-#         header = [
-#             "#_of_samples", "Prop_diam(inch)", "X_position(mm)", "Y_position(mm)",
-#             "Torque(Nm)", "Thrust(N)", "Airspeed(m/s)", "AoA(deg)", "AoSS(deg)",
-#             "V_tan(m/s)", "V_rad(m/s)", "V_axial(m/s)",
-#             "Chord_angle(deg)", "Chord_angle_eff(deg)", "Chord_length(mm)", "Chord_length_eff(mm)",
-#             "Helix_angle_eff(deg)", "Alpha_angle(deg)", "V_total(m/s)", "V_lift(m/s)", "V_drag(m/s)",
-#             "CL", "CD", "Re", "V_a+r(m/s)", "D/R_ratio",
-#             "Diff_mass_rate(kg/s)", "Diff_thrust(N/m)"
-#         ]
-        
-        # Combined header (NO omega1_rad_s)
-        header = [
-            "samples", "prop_inch", "dr_ratio", "x_mm", "y_mm",
-            "torque1_Nm", "thrust1_N",
-            "airspeed_mps", "aoa_deg", "aoss_deg",
-            "v_tan_mps", "v_rad_mps", "v_axial_mps",
-            "chord_angle_deg", "chord_angle_eff_deg",
-            "chord_length_mm", "chord_length_eff_mm",
-            "helix_angle_eff_deg", "alpha_angle_deg",
-            "v_total_mps", "v_lift_mps", "v_drag_mps",
-            "CL", "CD", "Re", "v_a+r_mps", "d/r_ratio",
-            "diff_mass_rate_kg/s", "diff_thrust_N/m"
-        ]
+        header = list(pair.header) + ["diff_mass_rate_kg/s", "diff_thrust_N/m"]
 
         with open(out_path, "w", newline="") as f:
-            w = csv.writer(f)  # comma-separated to match data_processing outputs:contentReference[oaicite:8]{index=8}
+            w = csv.writer(f)  # comma-separated to match data_processing outputs
             w.writerow(header)
             w.writerows(data_rows)
             w.writerow([])  # blank line before summary
             w.writerow(["Thrust_moment", f"{thrust_moment:.2f}", "Nm"])
+            w.writerow(["Thrust_moment_std", f"{float(ct.thrust_moment_std):.3f}", "Nm"])
             w.writerow(["Center_of_thrust_radius", f"{r_CT:.4f}", "m"])
+            w.writerow(["Center_of_thrust_radius_std", f"{float(ct.r_ct_std):.4f}", "m"])
             w.writerow(["Center_of_thrust", f"{center_of_thrust_pct:.2f}", "%"])
+            w.writerow(["Center_of_thrust_std", f"{float(ct.pct_std):.2f}", "%"])
             w.writerow(["Air_density", f"{rho:.3f}", "kg/m3"])  # helpful for traceability even if newer logs omit it
 
         print(f"Modified CSV written to '{out_path}'")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Calibrate the flow channel delay (rig setting flow_lag_s, data/lag_compensation.py)
+from the frame logs of two runs over the same trajectory at different speeds.
+
+    python tools/calibrate_lag.py slow/log_x_frames.csv fast/log_y_frames.csv
+    python tools/calibrate_lag.py slow.csv fast.csv --max 1.5 --step 0.005 --bin-mm 2
+
+The slower the first run, the better (its own lag barely shifts the profile).
+Prints the delay that best lines up the two binned airspeed profiles; put it
+into the rig profile as flow_lag_s.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+GUI_DIR = Path(__file__).resolve().parent.parent
+if str(GUI_DIR) not in sys.path:
+    sys.path.insert(0, str(GUI_DIR))
+
+from config import ratio_default, x_delta_default  # noqa: E402
+from data.frame_log import load_frame_log  # noqa: E402
+from data.lag_compensation import FLOW_FIELDS, MAX_DELAY_S, estimate_delay  # noqa: E402
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Estimate the pitot / probe delay from a slow and a fast sweep.")
+    ap.add_argument("slow", help="frame log (<log>_frames.csv) of the slow run")
+    ap.add_argument("fast", help="frame log of the fast run")
+    ap.add_argument("--max", type=float, default=1.0, help=f"largest delay tried, s (<= {MAX_DELAY_S})")
+    ap.add_argument("--step", type=float, default=0.01, help="delay step, s")
+    ap.add_argument("--bin-mm", type=float, default=float(x_delta_default), help="profile bin, mm")
+    ap.add_argument("--steps-per-mm", type=float, default=float(ratio_default))
+    ap.add_argument("--field", default="airspeed", choices=FLOW_FIELDS)
+    args = ap.parse_args(argv)
+
+    slow, fast = load_frame_log(args.slow), load_frame_log(args.fast)
+    for name, log in ((args.slow, slow), (args.fast, fast)):
+        if log is None:
+            print(f"{name}: no frames")
+            return 1
+
+    delays = np.arange(0.0, min(args.max, MAX_DELAY_S) + args.step / 2, args.step)
+    best, errors = estimate_delay(slow, fast, args.bin_mm * args.steps_per_mm, delays, args.field)
+    for d, e in zip(delays, errors):
+        mark = "  <-" if d == best else ""
+        print(f"  {d:6.3f} s  {e:10.5f}{mark}")
+    print(f"flow_lag_s = {best:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Overlay and difference several processed runs on normalized radius r/R
+(data/run_compare.py): V_tan / V_rad / V_axial, CL / CD and alpha
+(tandem runs: per prop).
+
+    python tools/compare_runs.py ~/Desktop/logid/01-02-2025-10:00:00 ~/Desktop/logid/02-02-2025-11:30:00
+    python tools/compare_runs.py --diameter 16 --dr 0.8 --rpm-min 4000      # runs from the catalog
+    python tools/compare_runs.py a_mean.csv b_mean.csv --baseline 1 --step 0.02 --out /tmp/cmp
+
+Writes comparison.csv (values, differences and ratios against the baseline
+run) and comparison.png into --out (default ~/Desktop/vordlused/<date-time>).
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+GUI_DIR = Path(__file__).resolve().parent.parent
+if str(GUI_DIR) not in sys.path:
+    sys.path.insert(0, str(GUI_DIR))
+
+from data.run_compare import export_comparison  # noqa: E402
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compare processed propeller runs on r/R.")
+    ap.add_argument("runs", nargs="*", help="run folders or _mean.csv files (first = baseline)")
+    ap.add_argument("--diameter", type=float, help="select runs from the catalog: prop diameter (in)")
+    ap.add_argument("--dr", type=float, help="select runs from the catalog: D/R")
+    ap.add_argument("--rpm-min", type=float)
+    ap.add_argument("--rpm-max", type=float)
+    ap.add_argument("--baseline", type=int, default=0, help="index of the reference run")
+    ap.add_argument("--step", type=float, default=0.01, help="r/R grid spacing")
+    ap.add_argument("--out", default=None, help="output folder")
+    ap.add_argument("--no-cache", action="store_true", help="re-parse the mean files")
+    args = ap.parse_args(argv)
+
+    paths = list(args.runs)
+    if any(v is not None for v in (args.diameter, args.dr, args.rpm_min, args.rpm_max)):
+        from data.run_catalog import RunCatalog
+        with RunCatalog() as catalog:
+            catalog.update()
+            rows = catalog.query(diameter=args.diameter, dr=args.dr,
+                                 rpm_min=args.rpm_min, rpm_max=args.rpm_max)
+        paths += [r["run_dir"] for r in rows if r["mean_file"]]
+    if not paths:
+        ap.error("no runs given or matched")
+
+    t0 = time.perf_counter()
+    try:
+        cmp, csv_path, png_path = export_comparison(paths, args.out, step=args.step,
+                                                    baseline=args.baseline, use_cache=not args.no_cache)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 2
+    print(f"{len(cmp.runs)} runs, {len(cmp.r_R)} r/R points, {time.perf_counter() - t0:.2f} s")
+    print(csv_path)
+    print(png_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Center of thrust for every 0R / 0.8R pair in the log archive.
+
+Pairs come from the run catalog (data/run_catalog.py): single-prop runs at
+D/R 0 and 0.8 with the same prop diameter (and the same prop config file
+when both manifests have one), matched nearest-in-time, each run used once.
+Stations are aligned with data/station_align.py, so runs with missing or
+shifted stations need no manual editing.
+
+    python tools/pair_center_of_thrust.py                       # all pairs -> stdout CSV
+    python tools/pair_center_of_thrust.py --diameter 16 --max-gap-h 4 --out ct_pairs.csv
+    python tools/pair_center_of_thrust.py --mode grid --step-mm 3
+"""
+import argparse
+import csv
+import datetime
+import sys
+from pathlib import Path
+
+GUI_DIR = Path(__file__).resolve().parent.parent
+if str(GUI_DIR) not in sys.path:
+    sys.path.insert(0, str(GUI_DIR))
+
+from data.run_catalog import RunCatalog  # noqa: E402
+from data.station_align import MODES, load_pair  # noqa: E402
+from data.thrust_integration import center_of_thrust  # noqa: E402
+
+RHO_DEFAULT = 1.225
+DIAMETER_TOL_IN = 0.05
+
+COLUMNS = ("zero_run", "point8_run", "prop_diameter_in", "gap_h", "mode", "stations",
+           "thrust_moment_Nm", "thrust_moment_std_Nm", "r_ct_m", "r_ct_std_m", "ct_pct", "ct_pct_std")
+
+
+def _ts(iso):
+    try:
+        return datetime.datetime.fromisoformat(iso).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def pair_runs(zeros, point8s, max_gap_h=None):
+    """Greedy nearest-in-time pairing; returns [(zero_row, point8_row, gap_h)]."""
+    candidates = []
+    for z in zeros:
+        for p in point8s:
+            if abs((z["prop_diameter_in"] or 0) - (p["prop_diameter_in"] or 0)) > DIAMETER_TOL_IN:
+                continue
+            if z["prop_file"] and p["prop_file"] and Path(z["prop_file"]).name != Path(p["prop_file"]).name:
+                continue
+            tz, tp = _ts(z["started_at"]), _ts(p["started_at"])
+            gap = abs(tz - tp) / 3600.0 if tz is not None and tp is not None else float("inf")
+            if max_gap_h is not None and gap > max_gap_h:
+                continue
+            candidates.append((gap, z["run_dir"], p["run_dir"], z, p))
+    candidates.sort(key=lambda c: c[:3])
+    used_z, used_p, pairs = set(), set(), []
+    for gap, zd, pd, z, p in candidates:
+        if zd in used_z or pd in used_p:
+            continue
+        used_z.add(zd); used_p.add(pd)
+        pairs.append((z, p, gap))
+    return pairs
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Center of thrust for all 0R/0.8R pairs in the archive.")
+    ap.add_argument("--root", default=None, help="log archive (default ~/Desktop/logid)")
+    ap.add_argument("--diameter", type=float, help="only this prop diameter (in)")
+    ap.add_argument("--max-gap-h", type=float, default=24.0, help="max time between paired runs (h)")
+    ap.add_argument("--mode", choices=MODES, default="auto", help="station alignment")
+    ap.add_argument("--step-mm", type=float, default=3.0, help="grid step for --mode grid")
+    ap.add_argument("--out", default=None, help="CSV file (default stdout)")
+    args = ap.parse_args(argv)
+
+    with RunCatalog(args.root) as catalog:
+        catalog.update()
+        zeros = [r for r in catalog.query(diameter=args.diameter, dr=0.0, tandem=False) if r["mean_file"]]
+        point8s = [r for r in catalog.query(diameter=args.diameter, dr=0.8, tandem=False) if r["mean_file"]]
+    pairs = pair_runs(zeros, point8s, args.max_gap_h)
+    print(f"{len(zeros)} runs at 0R, {len(point8s)} at 0.8R, {len(pairs)} pairs", file=sys.stderr)
+
+    out = open(args.out, "w", newline="") if args.out else sys.stdout
+    try:
+        w = csv.writer(out)
+        w.writerow(COLUMNS)
+        for z, p, gap in pairs:
+            zero_file = Path(z["run_dir"]) / z["mean_file"]
+            p8_file = Path(p["run_dir"]) / p["mean_file"]
+            try:
+                pair = load_pair(zero_file, p8_file, mode=args.mode, step_mm=args.step_mm)
+            except (OSError, ValueError) as e:
+                print(f"skip {z['name']} / {p['name']}: {e}", file=sys.stderr)
+                continue
+            diameter = z["prop_diameter_in"] or pair.prop_inch
+            if not len(pair.x_mm) or not diameter:
+                print(f"skip {z['name']} / {p['name']}: no common stations", file=sys.stderr)
+                continue
+            radius_m = float(diameter) * 25.4 / 2000.0
+            ct = center_of_thrust(pair.x_mm / 1000.0, pair.va0, pair.va8, pair.thrust, radius_m,
+                                  z["rho"] or RHO_DEFAULT, va0_var=pair.va0_var,
+                                  va08_var=pair.va8_var, thrust_var=pair.thrust_var)
+            w.writerow([z["name"], p["name"], f"{diameter:g}", f"{gap:.2f}", pair.mode, len(pair.x_mm),
+                        f"{float(ct.thrust_moment):.4f}", f"{float(ct.thrust_moment_std):.4f}",
+                        f"{float(ct.r_ct):.4f}", f"{float(ct.r_ct_std):.4f}",
+                        f"{float(ct.pct):.2f}", f"{float(ct.pct_std):.2f}"])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
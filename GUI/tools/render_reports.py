@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Re-draw the summary png of every processed run in the archive, in parallel
+(plot/report_renderer.py).
+
+    python tools/render_reports.py                    # runs whose png is missing or older than the mean file
+    python tools/render_reports.py --all -j 8         # everything, 8 processes
+    python tools/render_reports.py path/to/run_dir path/to/log_mean.csv
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+GUI_DIR = Path(__file__).resolve().parent.parent
+if str(GUI_DIR) not in sys.path:
+    sys.path.insert(0, str(GUI_DIR))
+
+from plot.report_renderer import default_png, render_batch  # noqa: E402
+
+DEFAULT_ROOT = Path.home() / "Desktop" / "logid"
+
+
+def collect(paths, root: Path):
+    means = []
+    for p in (paths or [root]):
+        p = Path(p)
+        if p.is_file():
+            means.append(p)
+        elif (p / "manifest.json").exists() or list(p.glob("*_mean.csv")):
+            means += sorted(p.glob("*_mean.csv"))
+        else:
+            means += sorted(p.glob("*/*_mean.csv"))
+    return means
+
+
+def stale(mean: Path) -> bool:
+    png = Path(default_png(mean))
+    return not png.exists() or png.stat().st_mtime < mean.stat().st_mtime
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render run summary plots headless, in parallel.")
+    ap.add_argument("paths", nargs="*", help="run folders, _mean.csv files or an archive root")
+    ap.add_argument("--root", default=str(DEFAULT_ROOT))
+    ap.add_argument("--all", action="store_true", help="re-render even if the png is up to date")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = ap.parse_args(argv)
+
+    means = collect(args.paths, Path(args.root))
+    if not args.all:
+        means = [m for m in means if stale(m)]
+    if not means:
+        print("nothing to render")
+        return 0
+
+    t0 = time.perf_counter()
+
+    def progress(n, total, mean):
+        print(f"[{n}/{total}] {mean}")
+
+    done, errors = render_batch([(str(m), None) for m in means], workers=args.jobs, progress=progress)
+    print(f"{len(done)} rendered, {len(errors)} failed in {time.perf_counter() - t0:.1f} s")
+    for mean, err in errors:
+        print(f"  {mean}: {err}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Command line front end for the run catalog (data/run_catalog.py).
+
+    python tools/run_catalog.py update                       # incremental scan of ~/Desktop/logid
+    python tools/run_catalog.py update --rebuild
+    python tools/run_catalog.py query --diameter 16 --dr 0.8 --rpm-min 4000
+    python tools/run_catalog.py query --tandem --since 2025-01-01 --csv > runs.csv
+
+query updates the catalog first (skip with --no-update).
+"""
+import argparse
+import csv
+import sys
+from pathlib import Path
+
+GUI_DIR = Path(__file__).resolve().parent.parent
+if str(GUI_DIR) not in sys.path:
+    sys.path.insert(0, str(GUI_DIR))
+
+from data.run_catalog import RunCatalog  # noqa: E402
+
+SHOW = ("name", "status", "prop_diameter_in", "dr_ratio", "tandem", "rpm",
+        "power", "efficiency", "induced_speed", "ct", "cp")
+
+
+def _fmt(v) -> str:
+    if v is None:
+        return "-"
+    if isinstance(v, float):
+        return f"{v:.7f}" if abs(v) < 0.01 and v != 0 else f"{v:.2f}"
+    return str(v)
+
+
+def print_table(rows, out=sys.stdout):
+    cells = [list(SHOW)] + [[_fmt(r[c]) for c in SHOW] for r in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(SHOW))]
+    for row in cells:
+        out.write("  ".join(c.ljust(w) for c, w in zip(row, widths)).rstrip() + "\n")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Search the measurement log archive.")
+    ap.add_argument("--root", default=None, help="log archive (default ~/Desktop/logid)")
+    ap.add_argument("--db", default=None, help="catalog file (default <root>/catalog.sqlite)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    up = sub.add_parser("update", help="index new / changed run folders")
+    up.add_argument("--rebuild", action="store_true", help="re-read every folder")
+
+    q = sub.add_parser("query", help="list runs matching the filters")
+    q.add_argument("--diameter", type=float, help="prop diameter in inches")
+    q.add_argument("--dr", type=float, help="measuring distance D/R")
+    q.add_argument("--rpm-min", type=float)
+    q.add_argument("--rpm-max", type=float)
+    t = q.add_mutually_exclusive_group()
+    t.add_argument("--tandem", dest="tandem", action="store_true", default=None)
+    t.add_argument("--single", dest="tandem", action="store_false")
+    q.add_argument("--status", help="completed / aborted / running")
+    q.add_argument("--profile", help="rig profile name")
+    q.add_argument("--since", help="ISO date, e.g. 2025-03-01")
+    q.add_argument("--order-by", default="started_at")
+    q.add_argument("--limit", type=int)
+    q.add_argument("--csv", action="store_true", help="write all columns as CSV")
+    q.add_argument("--no-update", action="store_true", help="do not rescan the archive first")
+    args = ap.parse_args(argv)
+
+    with RunCatalog(args.root, args.db) as catalog:
+        if args.cmd == "update" or not args.no_update:
+            stats = catalog.update(rebuild=getattr(args, "rebuild", False))
+            print("catalog: {added} added, {changed} changed, {removed} removed, {total} runs".format(**stats),
+                  file=sys.stderr)
+        if args.cmd == "update":
+            return 0
+
+        try:
+            rows = catalog.query(diameter=args.diameter, dr=args.dr,
+                                 rpm_min=args.rpm_min, rpm_max=args.rpm_max,
+                                 tandem=args.tandem, status=args.status, profile=args.profile,
+                                 since=args.since, order_by=args.order_by, limit=args.limit)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+        if args.csv:
+            w = csv.writer(sys.stdout)
+            cols = [c for c in rows[0] if c != "metrics_json"] if rows else []
+            w.writerow(cols)
+            for r in rows:
+                w.writerow([r[c] for c in cols])
+        else:
+            print_table(rows)
+            print(f"{len(rows)} runs", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
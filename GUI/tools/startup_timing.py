@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Cold-start timing harness for app.py.
+
+Starts the GUI N times in a subprocess with PROPSTAND_STARTUP_PROBE set; app.py
+prints the time until the main window is shown and which heavy modules got
+imported, then exits. Optionally adds the top -X importtime contributors.
+
+    python tools/startup_timing.py -n 5
+    python tools/startup_timing.py -n 5 --budget-ms 1500 --importtime
+    QT_QPA_PLATFORM=offscreen python tools/startup_timing.py   # headless / CI
+
+Exit code 1 if the median exceeds --budget-ms or a heavy module (SciPy, pyplot,
+trajectory/center-of-thrust tools, data processing, load cell
+calibration windows) is imported before the window appears.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+GUI_DIR = Path(__file__).resolve().parent.parent
+APP = GUI_DIR / "app.py"
+
+
+def run_once(importtime: bool = False, timeout_s: float = 60.0):
+    env = dict(os.environ, PROPSTAND_STARTUP_PROBE="1")
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + [str(APP)]
+    proc = subprocess.run(cmd, cwd=str(GUI_DIR), env=env, capture_output=True,
+                          text=True, timeout=timeout_s)
+    m = re.search(r"startup_ms=([\d.]+)", proc.stdout)
+    if not m:
+        raise RuntimeError(f"app.py did not report startup time (rc={proc.returncode}):\n{proc.stderr[-2000:]}")
+    h = re.search(r"heavy_modules=(.*)", proc.stdout)
+    heavy = [x for x in (h.group(1).strip().split(",") if h else []) if x]
+    return float(m.group(1)), heavy, proc.stderr
+
+
+def top_imports(stderr: str, n: int = 15):
+    """Parse -X importtime output into the n largest cumulative top-level imports."""
+    rows = []
+    for line in stderr.splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", line)
+        if m and len(m.group(3)) <= 3:          # top-level and direct children only
+            rows.append((int(m.group(2)) / 1000.0, m.group(4)))
+    rows.sort(reverse=True)
+    return rows[:n]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Measure GUI cold-start time.")
+    ap.add_argument("-n", "--runs", type=int, default=5)
+    ap.add_argument("--budget-ms", type=float, default=None, help="fail if the median is above this")
+    ap.add_argument("--importtime", action="store_true", help="also list the slowest imports")
+    args = ap.parse_args(argv)
+
+    times, heavy_seen = [], set()
+    for i in range(max(1, args.runs)):
+        ms, heavy, _ = run_once()
+        times.append(ms)
+        heavy_seen.update(heavy)
+        print(f"run {i + 1}: {ms:.1f} ms")
+
+    med = statistics.median(times)
+    print(f"median {med:.1f} ms  min {min(times):.1f}  max {max(times):.1f}  (n={len(times)})")
+
+    if args.importtime:
+        _, _, stderr = run_once(importtime=True)
+        print("slowest imports (cumulative ms):")
+        for ms, mod in top_imports(stderr):
+            print(f"  {ms:8.1f}  {mod}")
+
+    ok = True
+    if heavy_seen:
+        print("FAIL: imported before the window was shown:", ", ".join(sorted(heavy_seen)))
+        ok = False
+    if args.budget_ms is not None and med > args.budget_ms:
+        print(f"FAIL: median {med:.1f} ms > budget {args.budget_ms:.1f} ms")
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+# ui/display_model.py
+from typing import Dict, Optional, Set
+
+from PyQt5.QtCore import QObject, QTimer
+
+REFRESH_HZ = 15.0
+
+
+class DisplayModel(QObject):
+    """
+    Latest text of the live labels (RPM, thrust, torque, weights), pushed to the
+    widgets at most REFRESH_HZ times a second instead of on every serial line.
+
+    set() only records the value; the first change arms a single-shot refresh
+    timer and flush() then calls setText on the labels whose text differs from
+    what they show. Repeating the same value (the idle '0' resets) costs a dict
+    lookup and no timer wakeup.
+    """
+
+    def __init__(self, refresh_hz: float = REFRESH_HZ, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        if not refresh_hz > 0:
+            raise ValueError(f"Värskendussagedus peab olema positiivne: {refresh_hz!r}")
+        self._labels: Dict[str, object] = {}
+        self._latest: Dict[str, str] = {}
+        self._shown: Dict[str, Optional[str]] = {}
+        self._dirty: Set[str] = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(max(1, int(round(1000.0 / refresh_hz))))
+        self._timer.timeout.connect(self.flush)
+
+    def bind(self, key: str, label):
+        """label: anything with setText (QLabel)."""
+        self._labels[key] = label
+        self._shown[key] = None
+        if key in self._latest:
+            self._mark(key)
+
+    def set(self, key: str, text: str):
+        if self._latest.get(key) == text:
+            return
+        self._latest[key] = text
+        self._mark(key)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._latest.get(key)
+
+    def flush(self):
+        dirty, self._dirty = self._dirty, set()
+        for key in dirty:
+            label = self._labels.get(key)
+            text = self._latest[key]
+            if label is not None and self._shown.get(key) != text:
+                label.setText(text)
+                self._shown[key] = text
+
+    def _mark(self, key: str):
+        self._dirty.add(key)
+        if not self._timer.isActive():
+            self._timer.start()
@@ -1,86 +1,116 @@
 import time, os, csv, math, statistics, datetime
 import serial
 from pathlib import Path
-from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal, pyqtSlot, QMetaObject
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal, pyqtSlot, QMetaObject, Q_ARG
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QLabel, QGridLayout, QToolBar, QAction, QComboBox,
-    QPushButton, QDoubleSpinBox, QSpinBox, QProgressBar, QFileDialog, QCheckBox
+    QPushButton, QDoubleSpinBox, QSpinBox, QProgressBar, QFileDialog, QCheckBox, QMessageBox
 )
 
 from plot.canvas import Canvas
 from data.shared_data import SharedData
-from data import data_processing as _process_data
-from utils.ports import list_serial_ports
+from utils.port_watcher import PortWatcher
+from utils import protocol
+from utils.protocol import Measurements, parse_line
+from utils.frame import Frame, normalize_rpm
+from utils.clock_sync import ClockSync
+from utils.shm_ring import sample_stamps
 from workers.serial_reader import SerialReader
+from workers.async_serial import AsyncSerialTransport, has_selectable_fd
+from workers.acquisition_process import AcquisitionTransport
 from workers.measuring_worker import MeasuringWorker
+from workers.run_context import RunContext
+from workers.command_dispatcher import CommandDispatcher
+from workers.motor_sequence import MotorSequence, MOTOR_TEST_START, MOTOR_TEST_STOP
+from workers.connection_manager import ConnectionManager
+from workers.measuring_worker import last_logged_x_mm
 from widgets.set_parameters import SetParameters
 from widgets.set_xy_axes import SetXYAxes
-from widgets.map_trajectory import MapTrajectory
+from data.profile_store import ProfileStore, mcu_config_commands
+from data.run_manifest import RunManifest
+from plot.report_renderer import ReportRenderer
 from widgets.aoa_aoss import AoA_AoSS
+from ui.display_model import DisplayModel
 from widgets.rpm_controller_1 import RPM_controller_1
 from widgets.rpm_controller_2 import RPM_controller_2
-from widgets.lc_calibration_1 import LC_calibration_1
-from widgets.lc_calibration_2 import LC_calibration_2
-from tools.calc_center_of_thrust import Calculate_center_of_thrust
 
 from config import (
-    max_number_of_samples_default
+    max_number_of_samples_default,
+    mcu_tick_hz,
+    serial_transport
 )
 import app_globals
 
-RPM_SCALE = 5000.0 / 5050.0
-RPM_ZERO_DEADBAND = 80.0
-
-def _normalize_rpm(val: float) -> float:
-    """
-    Normalize incoming RPM:
-    - handle centi-RPM if upstream sends e.g. 120700 for 1207.00
-    - apply empirical scale correction from Dewesoft comparison
-    - never return negative / tiny nonzero RPM
-    """
-    try:
-        v = float(val)
-    except Exception:
-        return val
-
-    # If it's suspiciously huge, assume centi-RPM.
-    if 20_000 < v < 1_000_000:
-        v = v / 100.0
-
-    # Treat low values as stopped.
-    if abs(v) < RPM_ZERO_DEADBAND:
-        return 0.0
-
-    # Scalable correction: stand reads slightly high.
-    v = v * RPM_SCALE
-
-    return max(0.0, v)
+# <key>_label widgets driven through MainWindow.display (ui/display_model.py)
+LIVE_LABELS = (
+    "first_rpm", "second_rpm", "first_thr", "second_thr", "first_trq", "second_trq",
+    "first_thr_weight", "second_thr_weight", "first_trq_weight", "second_trq_weight",
+)
 
 class MainWindow(QMainWindow):
     calFactorUpdated = pyqtSignal(float)
     tareDone = pyqtSignal()
     initReady = pyqtSignal()
-    measurementsFrame = pyqtSignal(int, int, object)
+    measurementsFrame = pyqtSignal(int, int, object)   # x_steps, y_steps, utils.frame.Frame
     
     def __init__(self, parent=None, **kwargs):
         super().__init__(parent, **kwargs)
         self.shared_data = SharedData()
+        self.profiles = ProfileStore()
+        try:
+            self.profiles.load()
+            if self.profiles.active:
+                self.profiles.apply_rig(self.profiles.active, self.shared_data)
+                print(f"[profiles] loaded rig profile '{self.profiles.active}'")
+        except (OSError, ValueError) as e:
+            print("[profiles] could not load profiles:", e)
         self.setupUI()
         app_globals.window = self
         self.controller = None
         self.serialReader = None
+        self.serialTransport = None
         self.measuringWorker = None
         self.serialReaderThread = QThread()
         self.measuringThread = QThread()
-        self.lc_calibration_1 = LC_calibration_1(self.shared_data)
-        self.lc_calibration_2 = LC_calibration_2(self.shared_data)
-        self.calFactorUpdated.connect(self.lc_calibration_1.on_cal_factor)
-        self.calFactorUpdated.connect(self.lc_calibration_2.on_cal_factor)
-        self.tareDone.connect(self.lc_calibration_1.on_tare_done, Qt.QueuedConnection)
-        self.tareDone.connect(self.lc_calibration_2.on_tare_done, Qt.QueuedConnection)
+        self.dispatcher = CommandDispatcher(self._write_raw, guard=self._command_refused, parent=self)
+        # arrival stamp of the line being handled; MCU tick -> host clock (utils/clock_sync.py)
+        self._line_t_ns = 0
+        self.clock_sync = ClockSync(mcu_tick_hz)
+        # MCU message type -> handler (see utils/protocol.py)
+        self._line_handlers = {
+            protocol.Malformed: self._on_malformed,
+            protocol.Ready: self._on_ready,
+            protocol.Emergency: self._on_emergency,
+            protocol.EmergencyCleared: self._on_emergency_cleared,
+            protocol.HomingDone: self._on_homing_done,
+            protocol.LimitSwitch: self._on_limit_switch,
+            protocol.TareDone: self._on_tare_done,
+            protocol.CenteringDone: self._on_centering_done,
+            protocol.JogDone: self._on_jog_done,
+            protocol.OverAxisLimit: self._on_over_axis_limit,
+            protocol.CalVal: self._on_calval,
+            protocol.LcTest: self._on_lc_test,
+            protocol.ReadAoA: self._on_read_aoa,
+            protocol.ReadAoSS: self._on_read_aoss,
+            protocol.Measurements: self._on_measurements,
+        }
+        # motor test ON/Beacon/startMotor/stop/OFF choreography, timed without blocking the GUI
+        self.motor_sequence = MotorSequence(self.sendData, parent=self)
+        self.motor_sequence.failed.connect(lambda reason: print("motor test sequence failed:", reason))
+        self.connection = ConnectionManager(parent=self)
+        self.connection.reconnected.connect(self.on_reconnected)
+        self._resume_sweep = None
+        self._redo_bins = None      # sweep interrupted by 'stop': redo it from this bin
+        self.manifest = None
+        self.lc_calib_1_window = None   # load cell calibration windows, built on first use
+        self.lc_calib_2_window = None
         self.rpm_setup_1 = RPM_controller_1(self.shared_data)
         self.rpm_setup_2 = RPM_controller_2(self.shared_data)
-        self.calculate_CT = Calculate_center_of_thrust()
+        self.calculate_CT = None   # center-of-thrust tool window, built on first use (SciPy)
+        self.catalog = None        # run catalog (SQLite), opened on first use
+        self.report_renderer = ReportRenderer(parent=self)
+        self.report_renderer.rendered.connect(lambda png: print(f"Summary plot saved as {png}"))
+        self.report_renderer.failed.connect(lambda mean, err: print(f"Summary plot failed ({mean}): {err}"))
         self.today_dt = None
         self.path = None
         self.csvfile = None
@@ -104,6 +134,10 @@ class MainWindow(QMainWindow):
         self.second_thr_weight_label = QLabel()
         self.first_trq_weight_label = QLabel()
         self.second_trq_weight_label = QLabel()
+        # live labels are refreshed at a fixed rate, not per serial line
+        self.display = DisplayModel(parent=self)
+        for key in LIVE_LABELS:
+            self.display.bind(key, getattr(self, f"{key}_label"))
         self.motor_test = False
         self.homing_done = False
         self.tare_done = False
@@ -129,6 +163,7 @@ class MainWindow(QMainWindow):
         self.first_rpm_current = 0
         self.second_rpm_current = 0
         self.airspeed = 0
+        self.last_frame = None          # latest utils.frame.Frame from the MCU
         self.aoa_sensor = 0
         self.aoa_abs = 0
         self.aoss_sensor = 0
@@ -197,6 +232,14 @@ class MainWindow(QMainWindow):
         self.center_of_thrust_action.triggered.connect(self.calculate_CT_show)
         self.toolbar.addAction(self.center_of_thrust_action)
 
+        self.profiles_action = QAction("Stendi profiilid", self)
+        self.profiles_action.triggered.connect(self.rig_profiles)
+        self.toolbar.addAction(self.profiles_action)
+
+        self.archive_action = QAction("Mõõtmiste arhiiv", self)
+        self.archive_action.triggered.connect(self.run_archive)
+        self.toolbar.addAction(self.archive_action)
+
         # Disable initially (as in your original)
         self.aoa_aoss_action.setEnabled(False)
         self.calibrate_first_loadcells_action.setEnabled(False)
@@ -221,7 +264,6 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.label20, 0, 0, 1, 1)
         
         self.comboBox = QComboBox(self)
-        self.update_ports()
         layout.addWidget(self.comboBox, 1, 0, 1, 1)
         
         self.connect = QPushButton("Ühenda", self)
@@ -505,8 +547,7 @@ class MainWindow(QMainWindow):
         self.second_trq_weight_label.setStyleSheet("border: 1px solid black;")
         layout.addWidget(self.second_trq_weight_label, 33, 3)
         
-        self.update_ports()
-        self.initTimer()
+        self.initPortWatcher()
         self.reset_button()
         self.last_first_throttle_value = 0
         self.last_second_throttle_value = 0
@@ -528,14 +569,27 @@ class MainWindow(QMainWindow):
         self.timer.setInterval(interval)  # Set the new interval
         self.timer.start()  # Start the timer with the new interval
         
-    def sendData(self, data):
+    def sendData(self, data, on_ack=None, on_fail=None):
+        """Queue a command; CommandDispatcher frames, paces and tracks MCU replies."""
         if self.controller:
-            try:
-                encoded_data = data.encode('utf-8')
-                self.controller.write(encoded_data)
-                print(data)
-            except serial.SerialException as e:
-                print(f"Error sending data: {e}")
+            self.connection.remember(data)
+            self.dispatcher.send(data, on_ack=on_ack, on_fail=on_fail)
+        elif on_fail is not None:
+            on_fail("not connected")
+
+    def _command_refused(self, cmd: str):
+        """Why the MCU would silently ignore an exclusive command now (None: go ahead)."""
+        if self.e_stop:
+            return "emergency stop active"
+        if cmd.startswith(('j|', 'center')) and not self.homing_done:
+            return "axes not homed"
+        return None
+
+    def _write_raw(self, payload: bytes):
+        if self.serialTransport is not None and self.serialTransport.running:
+            self.serialTransport.write(payload)
+        else:
+            self.controller.write(payload)
                 
     def homingDone(self):
         self.homing_done = True
@@ -549,337 +603,324 @@ class MainWindow(QMainWindow):
         self.homing.setText("Telgede referents ✓")
         self.meas_data_running = False
     
-    @pyqtSlot(str)    
-    def handleData(self, data):
+    @pyqtSlot(str)
+    @pyqtSlot(str, object)
+    def handleData(self, data, t_ns=None):
+        # t_ns: time.monotonic_ns() when the reader got the bytes (line_stamped)
+        self._line_t_ns = t_ns or time.monotonic_ns()
+        idle = True
         for raw in (data or "").splitlines():
             s = raw.strip()
             if not s:
                 continue
-            slow = s.lower()
-            print(slow)
-            if 'ready!' in slow:
-                self.params.setStyleSheet("background-color: green; color: white;")
-                self.params.setText("Säti andurid ✓")  # or whatever label you like
-                self.xy_axes.setEnabled(True)
-                self.initReady.emit()
-            if 'emergency!' in slow:
-                self.e_stop = True
-                self.meas_data_running = False
-                self.update_emergency()
-                return
-            if 'emergency cleared' in slow:
-                self.e_stop = False
-                self.meas_data_running = False
-                self.update_emergency()
-                return
-            if 'homing done' in slow:
-                self.homingDone()
-                return
-            if 'limit switch' in slow:
-                self.homing_done = True
-                self.measure.setEnabled(False)
-                self.centering.setEnabled(False)
-                self.testMotorButton.setEnabled(True)
-                self.test_progress.setValue(0)
-                self.homing.setStyleSheet("background-color: orange; color: None;")
-                return
-            if 'tare done' in slow:
-                self.meas_data_running = False
-                self.tareDone.emit()
-                self.tare_done = True
-                return
-            if 'centering done' in slow:
+            print(s.lower())
+            msg = parse_line(s)
+            if msg is not None:
+                handler = self._line_handlers.get(type(msg))
+                # handlers return True when the line is answered (no idle label reset)
+                if handler is not None and handler(msg):
+                    idle = False
+            # after the handler: an ack callback sees the state the line set
+            # (e.g. homing_done before the jog queued behind 'home' is checked)
+            self.dispatcher.on_line(s)
+
+        if idle:
+            self._reset_idle_labels()
+
+    def _reset_idle_labels(self):
+        if (self.motor_test == False) and (not getattr(self, "_series_running", False)) and (not self.measuringThread.isRunning()):
+            # unchanged '0's are dropped by the display model; no widget is touched
+            for key in LIVE_LABELS:
+                self.display.set(key, '0')
+            #self.meas_data_running = False
+
+    # ---------- MCU messages (utils/protocol.py) ----------
+    def _on_malformed(self, msg):
+        print(f"Error parsing {msg.kind}: {msg.reason}: {msg.line}")
+        return True
+
+    def _on_ready(self, msg):
+        self.params.setStyleSheet("background-color: green; color: white;")
+        self.params.setText("Säti andurid ✓")  # or whatever label you like
+        self.xy_axes.setEnabled(True)
+        self.initReady.emit()
+
+    def _on_emergency(self, msg):
+        self.dispatcher.clear("emergency")
+        if self.manifest is not None and self.manifest.doc.get("status") == "running":
+            self.manifest.event("emergency", sweep=self.current_sweep)
+        self.e_stop = True
+        self.meas_data_running = False
+        self.update_emergency()
+        return True
+
+    def _on_emergency_cleared(self, msg):
+        self.e_stop = False
+        self.meas_data_running = False
+        self.update_emergency()
+        return True
+
+    def _on_homing_done(self, msg):
+        self.homingDone()
+        return True
+
+    def _on_limit_switch(self, msg):
+        self.homing_done = True
+        self.measure.setEnabled(False)
+        self.centering.setEnabled(False)
+        self.testMotorButton.setEnabled(True)
+        self.test_progress.setValue(0)
+        self.homing.setStyleSheet("background-color: orange; color: None;")
+        return True
+
+    def _on_tare_done(self, msg):
+        self.meas_data_running = False
+        self.tareDone.emit()
+        self.tare_done = True
+        return True
+
+    def _on_centering_done(self, msg):
+        self.centering.setStyleSheet("background-color: green; color: white;")
+        self.centering.setText("Pitot' tsentrisse ✓")
+        self.meas_data_running = False
+        self.Y_move.setEnabled(True)
+        if self._post_sweep_phase == "centering":
+            QTimer.singleShot(self._post_sweep_delay_ms, self._post_sweep_moveYBack)
+        return True
+
+    def _on_jog_done(self, msg):
+        self.jog_done = True
+        if getattr(self, "_centering_via_jog", False):
+            try:
+                # Mirror your existing 'centering done' visuals/text
                 self.centering.setStyleSheet("background-color: green; color: white;")
                 self.centering.setText("Pitot' tsentrisse ✓")
                 self.meas_data_running = False
                 self.Y_move.setEnabled(True)
-                if self._post_sweep_phase == "centering":
-                    QTimer.singleShot(self._post_sweep_delay_ms, self._post_sweep_moveYBack)
-                return
-            if 'jog done' in slow:
-                self.jog_done = True
-                if getattr(self, "_centering_via_jog", False):
-                    try:
-                        # Mirror your existing 'centering done' visuals/text
-                        self.centering.setStyleSheet("background-color: green; color: white;")
-                        self.centering.setText("Pitot' tsentrisse ✓")
-                        self.meas_data_running = False
-                        self.Y_move.setEnabled(True)
-                        self._centering_via_jog = False
-                    except Exception:
-                        pass
-                    #finally:
-                    #    self._centering_via_jog = False
-
-                # Continue post-sweep chain if applicable
-                if getattr(self, "_post_sweep_phase", "idle") == "centering":
-                    QTimer.singleShot(self._post_sweep_delay_ms, self._post_sweep_moveYBack)
-                    return
-                # Post-sweep chaining
-                if self._post_sweep_phase == "move_y0":
-                    # 3) center after delay
-                    QTimer.singleShot(self._post_sweep_delay_ms, self._post_sweep_center)
-                    return
-
-                if self._post_sweep_phase == "move_y_back":
-                    # We have completed Y -> series Y₀
-                    self._post_sweep_phase = "idle"
-                    if self.current_sweep < self.total_sweeps:
-                        # More sweeps to go -> start the next sweep after a small delay
-                        QTimer.singleShot(self._post_sweep_delay_ms, self.run_next_sweep)
-                    else:
-                        # FINAL: sweep count reached AND Y is back -> now go home
-                        QTimer.singleShot(self._post_sweep_delay_ms, self.come_back)
-                if getattr(self, "_going_home", False):
-                    self._going_home = False
-                    if getattr(self, "_postprocess_after_home", False):
-                        self._postprocess_after_home = False
-                        try:
-                            self.process_data()
-                        except Exception as e:
-                            print("post-processing error:", e)
-                # If we are returning home via jog, finish up now
-                if getattr(self, "_returning_home", False):
-                    self._returning_home = False
-                    # Beacon off AFTER movement completes
-                    QTimer.singleShot(1000, lambda: self.sendData('BeaconOFF'))
-                return
-            if 'over axis limit' in slow:
-                # Always stop motion first
-                self.sendData('stop')
+                self._centering_via_jog = False
+            except Exception:
+                pass
+            #finally:
+            #    self._centering_via_jog = False
+
+        # Continue post-sweep chain if applicable
+        if getattr(self, "_post_sweep_phase", "idle") == "centering":
+            QTimer.singleShot(self._post_sweep_delay_ms, self._post_sweep_moveYBack)
+            return True
+        # Post-sweep chaining
+        if self._post_sweep_phase == "move_y0":
+            # 3) center after delay
+            QTimer.singleShot(self._post_sweep_delay_ms, self._post_sweep_center)
+            return True
+
+        if self._post_sweep_phase == "move_y_back":
+            # We have completed Y -> series Y₀
+            self._post_sweep_phase = "idle"
+            if self._redo_bins is not None:
+                # the interrupted sweep again, from its last logged Δx bin
+                bins, self._redo_bins = self._redo_bins, None
+                QTimer.singleShot(self._post_sweep_delay_ms,
+                                  lambda: self.run_next_sweep(resume_bins=bins))
+            elif self.current_sweep < self.total_sweeps:
+                # More sweeps to go -> start the next sweep after a small delay
+                QTimer.singleShot(self._post_sweep_delay_ms, self.run_next_sweep)
+            else:
+                # FINAL: sweep count reached AND Y is back -> now go home
+                QTimer.singleShot(self._post_sweep_delay_ms, self.come_back)
+        if getattr(self, "_going_home", False):
+            self._going_home = False
+            if getattr(self, "_postprocess_after_home", False):
+                self._postprocess_after_home = False
+                try:
+                    self.process_data()
+                except Exception as e:
+                    print("post-processing error:", e)
+        # If we are returning home via jog, finish up now
+        if getattr(self, "_returning_home", False):
+            self._returning_home = False
+            # Beacon off AFTER movement completes
+            self.sendData('BeaconOFF')
+        return True
 
-                # Small helper: nudge Y target inward if we were aiming for the boundary
-                def _shrink_y_target():
-                    try:
-                        ratio = float(self.shared_data.ratio)
-                        # back off by 2 mm from max
-                        max_safe_y = int(self.Y_pos.maximum() * ratio) - int(2 * ratio)
-                        self._series_y0_steps = max(0, min(int(self._series_y0_steps), max_safe_y))
-                    except Exception:
-                        pass
-
-                phase = getattr(self, "_post_sweep_phase", "idle")
-
-                if phase in ("stopping", "move_y0"):
-                    # We were sending Y->0; just retry that step after delay
-                    QTimer.singleShot(self._post_sweep_delay_ms, self._post_sweep_moveY0)
-                    return
-
-                if phase == "centering":
-                    # We were centering; try center again after delay
-                    QTimer.singleShot(self._post_sweep_delay_ms, self._post_sweep_center)
-                    return
-
-                if phase == "move_y_back":
-                    # We were restoring Y; clamp & back off a bit, then retry
-                    _shrink_y_target()
-                    QTimer.singleShot(self._post_sweep_delay_ms, self._post_sweep_moveYBack)
-                    return
-
-                # If the message arrives outside post-sweep phases (e.g., during measuring),
-                # do a gentle recovery: center → Y back → continue, all with delays.
-                def _soft_recover():
-                    self._post_sweep_phase = "centering"
-                    self._post_sweep_center()
-                    QTimer.singleShot(self._post_sweep_delay_ms, self._post_sweep_moveYBack)
-                QTimer.singleShot(self._post_sweep_delay_ms, _soft_recover)
-                
-                self.sendData('stop')
+    def _on_over_axis_limit(self, msg):
+        # Always stop motion first
+        self.sendData('stop')
+        if self.measuringWorker is not None:
+            # ESCs are off now: the series worker spins up again before its next sweep,
+            # a running sweep is parked and redone after the recovery (sweepInterrupted)
+            QMetaObject.invokeMethod(self.measuringWorker, "motors_stopped", Qt.QueuedConnection)
 
-                if getattr(self, "_returning_home", False):
-                    def _retry_home():
-                        x_home, y_home = self._home_steps()  # already clamped to HW limits
-                        feed_xy, feed_y = self._safe_feeds()
-                        self.sendData(f'j|{x_home}|{y_home}|{feed_xy}|{feed_y}')
-                    # back off once; if it still fails, we just won't loop forever
-                    if not self._home_retry:
-                        self._home_retry = True
-                        QTimer.singleShot(self._post_sweep_delay_ms if hasattr(self, "_post_sweep_delay_ms") else 1500,
-                                          _retry_home)
-                    else:
-                        print("Home jog failed twice; staying stopped for safety.")
-                        self._returning_home = False
-                return
-            if slow.startswith('calval:'):
-                try:
-                    val = float(data.split(":", 1)[1].strip())
-                except ValueError:
-                    return
-                self.cal_value = val
-                self.calFactorUpdated.emit(val)  # <- broadcast to any open calibration windows
-                return
-            elif slow.startswith('lc test:'):
-                parts = slow.split()[2:]  # after "LC" and "test:"
-                if len(parts) != 10:
-                    print("Error parsing numeric data:", parts)
-                else:
-                    try:
-                        vals = [float(x) for x in parts]
-                        (thr1_corr, thr1_raw_g, trq1_corr, trq1_raw_g, rpm1,
-                         thr2_corr, thr2_raw_g, trq2_corr, trq2_raw_g, rpm2) = vals
-                        
-                        rpm1 = _normalize_rpm(rpm1)
-                        rpm2 = _normalize_rpm(rpm2)
-
-                        w = app_globals.window
-                        # prop #1
-                        w.first_thrust_test_value     = thr1_corr
-                        w.first_thr_weight_test_value = thr1_raw_g
-                        w.first_torque_test_value     = trq1_corr
-                        w.first_trq_weight_test_value = trq1_raw_g
-                        w.first_rpm                   = rpm1
-
-                        # prop #2
-                        w.second_thrust_test_value     = thr2_corr
-                        w.second_thr_weight_test_value = thr2_raw_g
-                        w.second_torque_test_value     = trq2_corr
-                        w.second_trq_weight_test_value = trq2_raw_g
-                        w.second_rpm                   = rpm2
-                        
-                        first_thr_arm = self.shared_data.first_thr_arm_length
-                        second_thr_arm = self.shared_data.second_thr_arm_length
-                        
-                        # Convert ONLY for display (mN→N, N·mm→N·m)
-                        self.update_first_thr_label(f"{thr1_corr/1000.0:.2f}")
-                        self.update_first_thr_weight_label(f"{thr1_raw_g:.1f}")
-                        self.update_first_trq_label(f"{trq1_corr/1000.0:.3f}")
-                        self.update_first_trq_weight_label(f"{trq1_raw_g:.1f}")
-                        self.update_first_rpm_label(f"{rpm1:.0f}")
-
-                        self.update_second_thr_label(f"{thr2_corr/1000.0:.2f}")
-                        self.update_second_thr_weight_label(f"{thr2_raw_g:.1f}")
-                        self.update_second_trq_label(f"{trq2_corr/1000.0:.3f}")
-                        self.update_second_trq_weight_label(f"{trq2_raw_g:.1f}")
-                        self.update_second_rpm_label(f"{rpm2:.0f}")
-                    except Exception as e:
-                        print("Error parsing numeric data:", parts, e)
-                    return
-            if slow.startswith("readaoa|"):
-                # Expected: readAoA|1786|92.35|0.12
-                parts = s.split("|")  # use original 's' to preserve numeric formatting
-                if len(parts) >= 4:
-                    aoa_mid = parts[2]  # "92.35" (the middle value you want)
-
-                    # If the AoA/AoSS window exists, update its label
-                    if hasattr(self, "aoa_aoss_window") and self.aoa_aoss_window is not None:
-                        try:
-                            self.aoa_aoss_window.set_read_aoa_value(aoa_mid)
-                        except Exception:
-                            pass
-                return
-            if slow.startswith("readaoss|"):
-                # Expected: readAoSS|<pos>|<turn>|<servoDeg>|<tubeDeg>
-                parts = s.split("|")
-                if len(parts) >= 5:
-                    pos_raw  = parts[1]
-                    turn_raw = parts[2]
-                    servo_deg = parts[3]
-                    tube_deg  = parts[4]
-
-                    if hasattr(self, "aoa_aoss_window") and self.aoa_aoss_window is not None:
-                        try:
-                            self.aoa_aoss_window.set_read_aoss_value(
-                                tube_deg=tube_deg,
-                                servo_deg=servo_deg,
-                                turn=turn_raw,
-                                pos=pos_raw
-                            )
-                        except Exception:
-                            pass
-                return
-            elif slow.startswith('measurements:'):
-                # MCU sends: mN, Nmm; we convert to N, Nm.
-                # Expected order (13 floats):
-                # X Y firstThrust_mN firstTorque_Nmm firstRPM airspeed aoa_raw aoa_abs aoss_raw aoss_abs secondThrust_mN secondTorque_Nmm secondRPM
-                payload = slow.split('measurements:', 1)[1].strip()
-                parts = payload.split()
-                if len(parts) != 13:
-                    print("Measurements expected 13 fields, got", len(parts), parts)
-                    return
+        # Small helper: nudge Y target inward if we were aiming for the boundary
+        def _shrink_y_target():
+            try:
+                ratio = float(self.shared_data.ratio)
+                # back off by 2 mm from max
+                max_safe_y = int(self.Y_pos.maximum() * ratio) - int(2 * ratio)
+                self._series_y0_steps = max(0, min(int(self._series_y0_steps), max_safe_y))
+            except Exception:
+                pass
 
-                try:
-                    (x_f, y_f,
-                     first_thrust_mN, first_torque_Nmm, first_rpm,
-                     airspeed, aoa_raw, aoa_abs, aoss_raw, aoss_abs,
-                     second_thrust_mN, second_torque_Nmm, second_rpm) = map(float, parts)
-                except ValueError:
-                    print("Error parsing Measurements numeric data:", parts)
-                    return
-                
-                first_rpm  = _normalize_rpm(first_rpm)
-                second_rpm = _normalize_rpm(second_rpm)
-
-                # Positions are integers in steps
-                x_steps = int(round(x_f))
-                y_steps = int(round(y_f))
-
-                # Convert units + apply arm ratio:
-                first_thrust_N  = (first_thrust_mN  / 1000.0)       # mN -> N, then divide by ratio
-                first_torque_Nm = (first_torque_Nmm / 1000.0)                 # Nmm -> Nm
-
-                second_thrust_N  = (second_thrust_mN  / 1000.0)
-                second_torque_Nm = (second_torque_Nmm / 1000.0)
-
-                # Update window fields (now in SI)
-                self.x_pos = x_steps
-                self.y_pos = y_steps
-
-                self.first_thrust_value  = first_thrust_N
-                self.first_torque_value  = first_torque_Nm
-                self.first_rpm           = first_rpm
-
-                self.airspeed       = airspeed
-                self.aoa_raw_value  = aoa_raw
-                self.aoa_abs_value  = aoa_abs
-                self.aoss_raw_value = aoss_raw
-                self.aoss_abs_value = aoss_abs
-
-                self.second_thrust_value = second_thrust_N
-                self.second_torque_value = second_torque_Nm
-                self.second_rpm          = second_rpm
-
-                self.meas_data_running = True
-
-                # Emit a clean, 13-field SI frame for workers/plots:
-                vals = [
-                    float(x_steps), float(y_steps),
-                    first_thrust_N, first_torque_Nm, first_rpm,
-                    airspeed, aoa_raw, aoa_abs, aoss_raw, aoss_abs,
-                    second_thrust_N, second_torque_Nm, second_rpm
-                ]
-                # Make sure you've declared in MainWindow: measurementsFrame = pyqtSignal(int, int, object)
-                self.measurementsFrame.emit(x_steps, y_steps, vals)
+        phase = getattr(self, "_post_sweep_phase", "idle")
+
+        if phase in ("stopping", "move_y0"):
+            # We were sending Y->0; just retry that step after delay
+            QTimer.singleShot(self._post_sweep_delay_ms, self._post_sweep_moveY0)
+            return True
+
+        if phase == "centering":
+            # We were centering; try center again after delay
+            QTimer.singleShot(self._post_sweep_delay_ms, self._post_sweep_center)
+            return True
+
+        if phase == "move_y_back":
+            # We were restoring Y; clamp & back off a bit, then retry
+            _shrink_y_target()
+            QTimer.singleShot(self._post_sweep_delay_ms, self._post_sweep_moveYBack)
+            return True
+
+        # If the message arrives outside post-sweep phases (e.g., during measuring),
+        # do a gentle recovery: center → Y back → continue, all with delays.
+        def _soft_recover():
+            self._post_sweep_phase = "centering"
+            self._post_sweep_center()
+            QTimer.singleShot(self._post_sweep_delay_ms, self._post_sweep_moveYBack)
+        QTimer.singleShot(self._post_sweep_delay_ms, _soft_recover)
+
+        self.sendData('stop')
+
+        if getattr(self, "_returning_home", False):
+            def _retry_home():
+                x_home, y_home = self._home_steps()  # already clamped to HW limits
+                feed_xy, feed_y = self._safe_feeds()
+                self.sendData(f'j|{x_home}|{y_home}|{feed_xy}|{feed_y}')
+            # back off once; if it still fails, we just won't loop forever
+            if not self._home_retry:
+                self._home_retry = True
+                QTimer.singleShot(self._post_sweep_delay_ms if hasattr(self, "_post_sweep_delay_ms") else 1500,
+                                  _retry_home)
+            else:
+                print("Home jog failed twice; staying stopped for safety.")
+                self._returning_home = False
+        return True
+
+    def _on_calval(self, msg):
+        self.cal_value = msg.value
+        self.calFactorUpdated.emit(msg.value)  # <- broadcast to any open calibration windows
+        return True
+
+    def _on_lc_test(self, msg):
+        rpm1 = normalize_rpm(msg.rpm1)
+        rpm2 = normalize_rpm(msg.rpm2)
+
+        w = app_globals.window
+        # prop #1
+        w.first_thrust_test_value     = msg.thr1
+        w.first_thr_weight_test_value = msg.thr1_g
+        w.first_torque_test_value     = msg.trq1
+        w.first_trq_weight_test_value = msg.trq1_g
+        w.first_rpm                   = rpm1
+
+        # prop #2
+        w.second_thrust_test_value     = msg.thr2
+        w.second_thr_weight_test_value = msg.thr2_g
+        w.second_torque_test_value     = msg.trq2
+        w.second_trq_weight_test_value = msg.trq2_g
+        w.second_rpm                   = rpm2
+
+        # Convert ONLY for display (mN→N, N·mm→N·m)
+        self.update_first_thr_label(f"{msg.thr1/1000.0:.2f}")
+        self.update_first_thr_weight_label(f"{msg.thr1_g:.1f}")
+        self.update_first_trq_label(f"{msg.trq1/1000.0:.3f}")
+        self.update_first_trq_weight_label(f"{msg.trq1_g:.1f}")
+        self.update_first_rpm_label(f"{rpm1:.0f}")
+
+        self.update_second_thr_label(f"{msg.thr2/1000.0:.2f}")
+        self.update_second_thr_weight_label(f"{msg.thr2_g:.1f}")
+        self.update_second_trq_label(f"{msg.trq2/1000.0:.3f}")
+        self.update_second_trq_weight_label(f"{msg.trq2_g:.1f}")
+        self.update_second_rpm_label(f"{rpm2:.0f}")
+        return True
+
+    def _on_read_aoa(self, msg):
+        # Expected: readAoA|1786|92.35|0.12 -> show the middle value as sent
+        if getattr(self, "aoa_aoss_window", None) is not None:
+            try:
+                self.aoa_aoss_window.set_read_aoa_value(msg.deg)
+            except Exception:
+                pass
+        return True
+
+    def _on_read_aoss(self, msg):
+        # Expected: readAoSS|<pos>|<turn>|<servoDeg>|<tubeDeg>
+        if getattr(self, "aoa_aoss_window", None) is not None:
+            try:
+                self.aoa_aoss_window.set_read_aoss_value(
+                    tube_deg=msg.tube_deg,
+                    servo_deg=msg.servo_deg,
+                    turn=msg.turn,
+                    pos=msg.pos
+                )
+            except Exception:
+                pass
+        return True
+
+    @pyqtSlot(list)
+    def on_ring_frames(self, views):
+        """
+        AcquisitionTransport: new records in the shared-memory ring (utils/shm_ring.py).
+        The measuring worker reads the ring through its own reader, so nothing is
+        converted or forwarded per frame here: the newest record drives the live
+        state and the manifest counts the batch.
+        """
+        last = views[-1][-1]
+        self._line_t_ns = int(last["t_ns"])
+        self._take_frame(Frame.from_measurements(Measurements._make(last.tolist()[3:]),
+                                                 int(last["t_ns"]), int(last["t_mcu_ns"])))
+        if self.manifest is not None and getattr(self, "_series_running", False):
+            for view in views:
+                self.manifest.count_frames(self.current_sweep, sample_stamps(view).tolist())
+        self._reset_idle_labels()
+
+    def _on_measurements(self, msg):
+        # MCU sends steps, mN, N·mm; the frame is in SI (N, N·m) with normalized RPM.
+        # It is built once here and handed to the worker as is, stamped with the
+        # line's arrival time and (if the firmware sends a tick) the aligned MCU time.
+        t_ns = self._line_t_ns
+        t_mcu_ns = self.clock_sync.add(msg.tick, t_ns) if msg.tick == msg.tick else 0
+        frame = Frame.from_measurements(msg, t_ns, t_mcu_ns)
+        self._take_frame(frame)
+        self.measurementsFrame.emit(int(frame.x), int(frame.y), frame)
+        if self.manifest is not None and getattr(self, "_series_running", False):
+            self.manifest.count_frame(self.current_sweep, frame.t_sample_ns)
+
+    def _take_frame(self, frame):
+        # Positions are integers in steps
+        self.x_pos = int(frame.x)
+        self.y_pos = int(frame.y)
+        self.first_rpm = frame.rpm1
+        self.second_rpm = frame.rpm2
+        self.last_frame = frame
+        self.meas_data_running = True
 
-        if (self.motor_test == False) and (not getattr(self, "_series_running", False)) and (not self.measuringThread.isRunning()):
-            self.update_first_rpm_label('0')
-            self.update_second_rpm_label('0')
-            self.update_first_thr_label('0')
-            self.update_second_thr_label('0')
-            self.update_first_trq_label('0')
-            self.update_second_trq_label('0')
-            self.update_first_thr_weight_label('0')
-            self.update_second_thr_weight_label('0')
-            self.update_first_trq_weight_label('0')
-            self.update_second_trq_weight_label('0')
-            #self.meas_data_running = False
-        
     def toggle_motor(self):
         if self.testMotorButton.isChecked():
             self.testMotorButton.setText("Seiska mootor")
-            self.sendData('ON')
-            time.sleep(2)
-            self.sendData('BeaconON')
-            time.sleep(2)
-            self.test_motor()
+            self.motor_sequence.run(MOTOR_TEST_START, on_done=self.test_motor,
+                                    on_fail=self._motor_test_start_failed)
         else:
             self.testMotorButton.setText("Testi mootorit")
-            self.stop_motor()
-            time.sleep(2)
-            self.sendData('OFF')
-            time.sleep(2)
-            self.sendData('BeaconOFF')
-            time.sleep(2)
-            self.sendData('OFF')
+            # stop_motor's timers first; the sequence sends 'stop' and waits for its ack
+            self.timer_first_motor.stop()
+            self.timer_second_motor.stop()
+            self.motor_test = False
+            self.motor_sequence.run(MOTOR_TEST_STOP, best_effort=True)
+
+    def _motor_test_start_failed(self, reason):
+        # back to "not testing"; relays / beacon may already be on, so switch them off
+        self.testMotorButton.setChecked(False)
+        self.testMotorButton.setText("Testi mootorit")
+        self.motor_test = False
+        self.motor_sequence.run(MOTOR_TEST_STOP, best_effort=True)
 
     def test_motor(self):
         self.update_throttle_test()
@@ -919,6 +960,15 @@ class MainWindow(QMainWindow):
             self.last_second_throttle_value = current_second_throttle
             
     def initSerialReader(self):
+        if self.controller and serial_transport == "process" and getattr(self.controller, "port", None):
+            self.initAcquisitionProcess()
+            return
+        if self.controller and serial_transport == "asyncio" and has_selectable_fd(self.controller):
+            self.initAsyncTransport()
+            return
+        self.initThreadedReader()
+
+    def initThreadedReader(self):
         if self.controller and not self.serialReaderThread.isRunning():
             if self.serialReader:
                 self.serialReaderThread.quit()
@@ -926,69 +976,166 @@ class MainWindow(QMainWindow):
 
             self.serialReader = SerialReader(self.controller)
             self.serialReader.moveToThread(self.serialReaderThread)
-            self.serialReader.serial_readout.connect(self.handleData)
+            self.serialReader.line_stamped.connect(self.handleData)
+            self.serialReader.connection_lost.connect(self.on_link_lost)
+            try:
+                self.serialReaderThread.started.disconnect()
+            except Exception:
+                pass
             self.serialReaderThread.started.connect(self.serialReader.run)
             self.serialReaderThread.start()
 
+    def initAsyncTransport(self):
+        if self.serialTransport is not None:
+            self.serialTransport.stop()
+        # ConnectionManager does the reconnecting (by USB identity), not the transport
+        self.serialTransport = AsyncSerialTransport(self.controller, reconnect=False)
+        self.serialTransport.line_stamped.connect(self.handleData)
+        self.serialTransport.connection_lost.connect(self.on_link_lost)
+        self.serialTransport.unavailable.connect(self.on_async_transport_unavailable)
+        self.serialTransport.start()
+
+    def on_async_transport_unavailable(self, port):
+        print(f"asyncio transport unavailable on {port}, using SerialReader")
+        if self.serialTransport is not None:
+            self.serialTransport.stop()
+            self.serialTransport = None
+        self.initThreadedReader()
+
+    def initAcquisitionProcess(self):
+        if self.serialTransport is not None:
+            self.serialTransport.stop()
+        port = self.controller.port
+        baudrate = getattr(self.controller, "baudrate", 115200)
+        # the acquisition process opens the port itself (exclusive): let go of ours
+        try:
+            self.controller.close()
+        except Exception:
+            pass
+        self.serialTransport = AcquisitionTransport(port, baudrate, tick_hz=mcu_tick_hz, parent=self)
+        self.serialTransport.line_stamped.connect(self.handleData)
+        self.serialTransport.frames.connect(self.on_ring_frames)
+        self.serialTransport.connection_lost.connect(self.on_link_lost)
+        self.serialTransport.start()
+
+    def _stop_serial_reader(self):
+        if self.serialTransport is not None:
+            self.serialTransport.stop()
+            self.serialTransport = None
+        if self.serialReader is not None:
+            self.serialReader.stop()
+        if self.serialReaderThread.isRunning():
+            self.serialReaderThread.quit()
+            self.serialReaderThread.wait()
+
+    @pyqtSlot(str)
+    def on_link_lost(self, reason):
+        """USB link dropped: park the running sweep and let ConnectionManager reconnect."""
+        if self.connection.is_reconnecting():
+            return
+        print("Serial link lost:", reason)
+        self.dispatcher.clear("disconnected")
+        self.clock_sync.reset()
+        if self.manifest is not None and self.manifest.doc.get("status") == "running":
+            self.manifest.event("disconnect", reason=str(reason), sweep=self.current_sweep)
+        try:
+            self.controller.close()
+        except Exception:
+            pass
+
+        self._resume_sweep = None
+        if getattr(self, "_series_running", False) and (self.current_sweep > 0 or self._redo_bins is not None):
+            worker = self.measuringWorker
+            if worker is not None and getattr(worker, "_running", False):
+                # resume this sweep from the last Δx bin already in the CSV
+                self._resume_sweep = (self.current_sweep, self._logged_bins())
+            elif self._redo_bins is not None:
+                # an interrupted sweep was waiting for its redo
+                self._resume_sweep = (self.current_sweep + 1, self._redo_bins)
+                self._redo_bins = None
+            else:
+                # between sweeps: carry on with the next one
+                self._resume_sweep = (self.current_sweep, None)
+            if worker is not None:
+                # the MCU resets on reopen (motors off): the series worker spins up again
+                if self.measuringThread.isRunning():
+                    QMetaObject.invokeMethod(worker, "suspend", Qt.BlockingQueuedConnection)
+                    self.measuringThread.quit()
+                    self.measuringThread.wait()
+                else:
+                    worker.suspend()
+            self._post_sweep_phase = "idle"
+            print(f"[resume] will resume at sweep {self._resume_sweep[0]}, bin {self._resume_sweep[1]}")
+
+        self.connect.setStyleSheet("background-color: orange; color: black;")
+        self.connect.setText("Ühendan uuesti…")
+        self.connection.link_lost(reason)
+
+    @pyqtSlot(object)
+    def on_reconnected(self, controller):
+        self._stop_serial_reader()
+        self.controller = controller
+        self.initSerialReader()
+        self.connect.setStyleSheet("background-color: green; color: white;")
+        self.connect.setText("Ühendatud ✓")
+        # MCU was reset by the reopen: restore init| and axis limits, then resume
+        self.dispatcher.send_sequence(
+            self.connection.replay_commands(),
+            on_done=self._resume_after_reconnect,
+            on_fail=lambda reason: print("[resume] config replay failed:", reason))
+
+    def _resume_after_reconnect(self):
+        info, self._resume_sweep = self._resume_sweep, None
+        if info is None or not getattr(self, "_series_running", False):
+            return
+        sweep, bins = info
+
+        def _to_series_start(_line=""):
+            # back to (center, series Y₀) like between sweeps, then continue
+            x_cmd, y_cmd = self._clamp_xy_steps(self._center_steps(), int(self._series_y0_steps))
+            feed_xy, feed_y = self._safe_feeds()
+            self.sendData(f'j|{x_cmd}|{y_cmd}|{feed_xy}|{feed_y}', on_ack=_start)
+
+        def _start(_line=""):
+            if bins is None:
+                self.run_next_sweep()
+            else:
+                self.current_sweep = sweep - 1
+                self.run_next_sweep(resume_bins=bins)
+
+        self.homing_done = False
+        self.sendData('home', on_ack=_to_series_start,
+                      on_fail=lambda reason: print("[resume] homing failed:", reason))
+
     def update_first_rpm_label(self, rpm):
-        if self.motor_test == True:
-            self.first_rpm_label.setText(rpm)
-        else:
-            self.first_rpm_label.setText('0')
+        self.display.set("first_rpm", rpm if self.motor_test == True else '0')
             
     def update_second_rpm_label(self, rpm):
-        if self.motor_test == True:
-            self.second_rpm_label.setText(rpm)
-        else:
-            self.second_rpm_label.setText('0')
+        self.display.set("second_rpm", rpm if self.motor_test == True else '0')
             
     def update_first_thr_label(self, thr):
-        if self.motor_test == True:
-            self.first_thr_label.setText(thr)
-        else:
-            self.first_thr_label.setText('0')
+        self.display.set("first_thr", thr if self.motor_test == True else '0')
             
     def update_second_thr_label(self, thr):
-        if self.motor_test == True:
-            self.second_thr_label.setText(thr)
-        else:
-            self.second_thr_label.setText('0')
+        self.display.set("second_thr", thr if self.motor_test == True else '0')
             
     def update_first_trq_label(self, trq):
-        if self.motor_test == True:
-            self.first_trq_label.setText(trq)
-        else:
-            self.first_trq_label.setText('0')
+        self.display.set("first_trq", trq if self.motor_test == True else '0')
             
     def update_second_trq_label(self, trq):
-        if self.motor_test == True:
-            self.second_trq_label.setText(trq)
-        else:
-            self.second_trq_label.setText('0')
+        self.display.set("second_trq", trq if self.motor_test == True else '0')
             
     def update_first_thr_weight_label(self, thr_weight):
-        if self.motor_test == True:
-            self.first_thr_weight_label.setText(thr_weight)
-        else:
-            self.first_thr_weight_label.setText('0')
+        self.display.set("first_thr_weight", thr_weight if self.motor_test == True else '0')
             
     def update_second_thr_weight_label(self, thr_weight):
-        if self.motor_test == True:
-            self.second_thr_weight_label.setText(thr_weight)
-        else:
-            self.second_thr_weight_label.setText('0')
+        self.display.set("second_thr_weight", thr_weight if self.motor_test == True else '0')
             
     def update_first_trq_weight_label(self, trq_weight):
-        if self.motor_test == True:
-            self.first_trq_weight_label.setText(trq_weight)
-        else:
-            self.first_trq_weight_label.setText('0')
+        self.display.set("first_trq_weight", trq_weight if self.motor_test == True else '0')
             
     def update_second_trq_weight_label(self, trq_weight):
-        if self.motor_test == True:
-            self.second_trq_weight_label.setText(trq_weight)
-        else:
-            self.second_trq_weight_label.setText('0')
+        self.display.set("second_trq_weight", trq_weight if self.motor_test == True else '0')
         
     def save_plot(self):
         fileName, _ = QFileDialog.getSaveFileName(self, "Save Plot", "",
@@ -1054,20 +1201,32 @@ class MainWindow(QMainWindow):
         except Exception as e:
             print(f"Error updating plot: {e}")
         
-    def initTimer(self):
-        self.timer_ports = QTimer()
-        self.timer_ports.setInterval(500)
-        self.timer_ports.timeout.connect(self.update_ports)
-        self.timer_ports.start()
-        
-    def update_ports(self):
-        current_ports = list_serial_ports()
+    def closeEvent(self, event):
+        self.report_renderer.shutdown()
+        self.port_watcher.stop()
+        if self.serialTransport is not None:
+            self.serialTransport.stop()         # acquisition process / asyncio loop
+        super().closeEvent(event)
+
+    def initPortWatcher(self):
+        # combo box follows hotplug events instead of polling comports()
+        self.port_watcher = PortWatcher(parent=self)
+        self.port_watcher.portsChanged.connect(self.update_ports)
+        self.port_watcher.portAdded.connect(
+            lambda dev, stand: print(f"[ports] {dev} connected" + (" (stand)" if stand else "")))
+        self.port_watcher.portRemoved.connect(lambda dev: print(f"[ports] {dev} removed"))
+        self.port_watcher.start()
+
+    def update_ports(self, current_ports):
         current_selection = self.comboBox.currentText()
         self.comboBox.clear()
         if current_ports:
             self.comboBox.addItems(current_ports)
+            stand = self.port_watcher.stand_ports()
             if current_selection in current_ports:
                 self.comboBox.setCurrentText(current_selection)
+            elif stand:
+                self.comboBox.setCurrentText(stand[0])
         else:
             self.comboBox.addItem("Ei leia ACM/USB porte")
             self.reset_button()
@@ -1078,12 +1237,13 @@ class MainWindow(QMainWindow):
             try:
                 self.controller = serial.Serial(selected_port, 115200, timeout=0.1, exclusive=True)
                 self.initSerialReader()
-                self.lc_calibration_1.initialize(self.shared_data)
-                self.lc_calibration_2.initialize(self.shared_data)
+                self.connection.attach(selected_port)
                 self.connect.setStyleSheet("background-color: green; color: white;")
                 self.connect.setText("Ühendatud ✓")
                 self.params.setEnabled(True)
                 self.sendData('BeaconOFF')
+                if self.profiles.active:
+                    self.push_profile_to_mcu()
                 
             except serial.SerialException as e:
                 print(f"Could not open serial port {selected_port}: {e}")
@@ -1125,15 +1285,16 @@ class MainWindow(QMainWindow):
     def update_emergency(self):
         if self.e_stop:
             # Hard stop + tear down any motor-test activity
+            self.motor_sequence.cancel()
             try:
                 self.stop_motor()  # stops timers + sends 'stop'
             except Exception:
                 self.sendData('stop')
 
-            # Ensure ESCs and beacon are OFF so MCU stops LC test spam
-            QTimer.singleShot(0,   lambda: self.sendData('OFF'))
-            QTimer.singleShot(200, lambda: self.sendData('BeaconOFF'))
-            QTimer.singleShot(400, lambda: self.sendData('OFF'))
+            # Ensure ESCs and beacon are OFF so MCU stops LC test spam (queued in order)
+            self.sendData('OFF')
+            self.sendData('BeaconOFF')
+            self.sendData('OFF')
 
             self.motor_test = False
             self.testMotorButton.setChecked(False)
@@ -1166,6 +1327,7 @@ class MainWindow(QMainWindow):
         
     def map_(self):
         if not hasattr(self, 'Trajektoor'):
+            from widgets.map_trajectory import MapTrajectory
             self.map_window = MapTrajectory(self.shared_data)
             self.map_window.sendData.connect(self.sendData)
             try:
@@ -1175,22 +1337,26 @@ class MainWindow(QMainWindow):
         self.map_window.show()
                 
     def calibrate_first_loadcells(self):
-        if not hasattr(self, '1. posti andurite kalibreerimine'):
-            self.lc_calib_1_window = LC_calibration_1(self.shared_data)
-            self.lc_calib_1_window.sendData.connect(self.sendData)
-            self.calFactorUpdated.connect(self.lc_calib_1_window.on_cal_factor)  # <- fix
+        if self.lc_calib_1_window is None:
+            from widgets.lc_calibration_1 import LC_calibration_1
+            self.lc_calib_1_window = self._wire_lc_calibration(LC_calibration_1(self.shared_data))
         self.lc_calib_1_window.show()
         if self.cal_value:
             self.lc_calib_1_window.on_cal_factor(self.cal_value)
         
     def calibrate_second_loadcells(self):
-        if not hasattr(self, '2. posti andurite kalibreerimine'):
-            self.lc_calib_2_window = LC_calibration_2(self.shared_data)
-            self.lc_calib_2_window.sendData.connect(self.sendData)
-            self.calFactorUpdated.connect(self.lc_calib_2_window.on_cal_factor)
+        if self.lc_calib_2_window is None:
+            from widgets.lc_calibration_2 import LC_calibration_2
+            self.lc_calib_2_window = self._wire_lc_calibration(LC_calibration_2(self.shared_data))
         self.lc_calib_2_window.show()
         if self.cal_value:
             self.lc_calib_2_window.on_cal_factor(self.cal_value)
+
+    def _wire_lc_calibration(self, window):
+        window.sendData.connect(self.sendData)
+        self.calFactorUpdated.connect(window.on_cal_factor)
+        self.tareDone.connect(window.on_tare_done, Qt.QueuedConnection)
+        return window
     
     def set_xy_axes(self):
         if not hasattr(self, 'XY telgede konfigureerimine'):
@@ -1199,6 +1365,71 @@ class MainWindow(QMainWindow):
             self.axes_conf_window.centerStepsChanged.connect(self.on_center_steps_changed)
         self.axes_conf_window.show()
     
+    def rig_profiles(self):
+        from widgets.rig_profiles import RigProfiles
+        self.profiles_window = RigProfiles(self.shared_data, self.profiles)
+        self.profiles_window.show()
+
+    def _run_catalog(self):
+        if self.catalog is None:
+            from data.run_catalog import RunCatalog
+            self.catalog = RunCatalog()
+        return self.catalog
+
+    def run_archive(self):
+        from widgets.run_archive import RunArchive
+        self.archive_window = RunArchive(self._run_catalog())
+        self.archive_window.show()
+
+    def push_profile_to_mcu(self):
+        """Send init|, l|, AoA/AoSS and ramp config from shared_data as one acknowledged sequence."""
+        if getattr(self, "param_window", None) is not None:
+            self.param_window.refresh_from_shared()
+        if not self.controller:
+            return
+        self.params.setStyleSheet("background-color: orange; color: black;")
+        self.params.setText("Oota...")
+        self.dispatcher.send_sequence(
+            mcu_config_commands(self.shared_data),
+            on_done=self._on_profile_pushed,
+            on_fail=lambda reason: QMessageBox.warning(
+                self, "Profiili saatmine ebaõnnestus", f"Stend ei kinnitanud seadeid:\n{reason}"))
+
+    def _on_profile_pushed(self):
+        sd = self.shared_data
+        # same UI state SetParameters + SetXYAxes leave behind after a manual setup
+        self.tandem_setup = int(sd.no_of_props) == 2
+        self.second_throttle.setEnabled(self.tandem_setup)
+        self.label7.setEnabled(self.tandem_setup)
+        self.on_center_steps_changed(int(sd.x_center * sd.ratio))
+        self.file.setEnabled(not self.tandem_setup)
+        self.homing.setEnabled(self.tandem_setup or getattr(self, "fileSelected", False))
+        self.xy_axes.setEnabled(True)
+        self.xy_axes.setStyleSheet("background-color: green; color: white;")
+        self.xy_axes.setText("Säti teljed ✓")
+        for action in (self.aoa_aoss_action, self.calibrate_first_loadcells_action,
+                       self.rpm_first_controller_action, self.map_action,
+                       self.clear_plot_action, self.save_plot_action):
+            action.setEnabled(True)
+        self.calibrate_second_loadcells_action.setEnabled(self.tandem_setup)
+        self.rpm_second_controller_action.setEnabled(self.tandem_setup)
+        print(f"[profiles] '{self.profiles.active}' pushed to MCU")
+
+    def apply_prop_preset(self, preset: dict):
+        self.prop.setValue(float(preset["diameter_in"]))
+        self.shared_data.rotation_dir = int(preset["rotation_dir"])
+        self.shared_data.safety_over_prop = float(preset["safety_over_prop"])
+        self.shared_data.x_delta = float(preset["x_delta"])
+        self.first_throttle.setValue(preset["first_throttle"])
+        self.second_throttle.setValue(preset["second_throttle"])
+        prop_file = preset.get("prop_file") or ""
+        if prop_file and Path(prop_file).exists():
+            self.fname = (prop_file, "CSV Files (*.csv)")
+            self.fileSelected = True
+            self.homing.setEnabled(True)
+            self.file.setStyleSheet("background-color: green; color: white;")
+            self.file.setText("Vali propelleri konfiguratsiooni fail ✓")
+
     def aoa_aoss_params(self):
         if not hasattr(self, 'AoA ja AoSS teljed'):
             self.aoa_aoss_window = AoA_AoSS(self.shared_data)
@@ -1222,6 +1453,7 @@ class MainWindow(QMainWindow):
     
     def calculate_CT(self):
         if not hasattr(self, 'Tõmbekeskme arvutus'):
+            from tools.calc_center_of_thrust import Calculate_center_of_thrust
             self.CT_setup_window = Calculate_center_of_thrust()
         self.CT_setup_window.show()
         
@@ -1265,8 +1497,11 @@ class MainWindow(QMainWindow):
     
     def come_back(self):
         # Abort any series chaining asap
+        if self.manifest is not None and self.manifest.doc.get("status") == "running":
+            self.manifest.finish("aborted")
         self._user_abort = True
         self._series_running = False
+        self._redo_bins = None
         self._post_sweep_phase = "idle"
 
         # Mark return-home path
@@ -1280,9 +1515,8 @@ class MainWindow(QMainWindow):
         except Exception as e:
             print("cancel invoke error:", e)
 
-        # 2) Stop motion and tear down thread
+        # 2) Stop motion and tear down thread; the home jog goes out once 'stop' is acknowledged
         self.meas_data_running = False
-        self.sendData('stop')
         try:
             if self.measuringThread.isRunning():
                 self.measuringThread.quit()
@@ -1318,8 +1552,8 @@ class MainWindow(QMainWindow):
             print("[come_back] HOME jog:", cmd)
             self.sendData(cmd)
 
-        gap = getattr(self, "_command_gap_ms", 1800)  # give the MCU time to settle post-'stop'
-        QTimer.singleShot(gap, _do_home_jog)
+        self.sendData('stop', on_ack=lambda _line: _do_home_jog(),
+                      on_fail=lambda _reason: _do_home_jog())
 
 
 #     def come_back(self):
@@ -1426,6 +1660,8 @@ class MainWindow(QMainWindow):
         """
         if not row or len(row) < 12:
             return
+        if self.manifest is not None:
+            self.manifest.count_row(self.current_sweep)
         try:
             X      = float(row[1])
             Trq1   = float(row[3])
@@ -1479,6 +1715,7 @@ class MainWindow(QMainWindow):
         self._series_y0_steps = int(round(self.Y_pos.value() * ratio))
 
         self._series_running = True
+        self._redo_bins = None
         self.measuring_stopped = False
         self.testMotorButton.setEnabled(False)
 
@@ -1508,10 +1745,53 @@ class MainWindow(QMainWindow):
         else:
             self._series_y0_steps = base_y_steps
 
+        self.manifest = RunManifest.start(out_dir, self.series_csv_path, self.shared_data,
+                                          self._manifest_run_info())
+
         # kick off first sweep
         self.run_next_sweep()
-        
-    def run_next_sweep(self):
+
+    def _manifest_run_info(self) -> dict:
+        custom = bool(getattr(self, 'custom_trajectory', False) and getattr(self, 'list_of_x_targets', None))
+        fname = getattr(self, "fname", None)
+        return {
+            "prop_diameter_in": float(self.prop.value()),
+            "dr_ratio": float(self.dr_ratio.value()),
+            "tandem": bool(self.tandem_setup),
+            "sweeps": int(self.total_sweeps),
+            "throttle1_pct": float(self.first_throttle.value()),
+            "throttle2_pct": float(self.second_throttle.value()) if self.tandem_setup else None,
+            "pwm1": int(1000 + (self.first_throttle.value() * 10)),
+            "pwm2": int(1000 + (self.second_throttle.value() * 10)) if self.tandem_setup else 1000,
+            "measure_speed": int(self.measure_speed.value()),
+            "y0_steps": int(self._series_y0_steps),
+            "x_center_steps": int(self._center_steps()),
+            "prop_file": fname[0] if fname and fname[0] else None,
+            "profile": self.profiles.active,
+            "trajectory": {
+                "custom": custom,
+                "x_abs_steps": [int(x) for x in self.list_of_x_targets] if custom else None,
+                "dy_rel_steps": [int(y) for y in getattr(self, 'list_of_y_targets', [])] if custom else None,
+            },
+        }
+        
+    def _run_context(self, x_center_steps: int) -> RunContext:
+        """Snapshot of the widgets / SharedData the measuring worker needs for one sweep."""
+        sd = self.shared_data
+        return RunContext.for_feed(
+            int(self.measure_speed.value()),
+            prop_diam_in=float(self.prop.value()),
+            rotation_dir=int(sd.rotation_dir or 1),
+            mount_sign=int(sd.mount_sign or 1),
+            steps_per_mm=float(sd.ratio),
+            x_center_steps=int(x_center_steps),
+            x_delta_mm=float(sd.x_delta),
+            tandem=bool(self.tandem_setup),
+            flow_lag_s=float(sd.flow_lag_s),
+            flow_tau_s=float(sd.flow_tau_s),
+        )
+
+    def run_next_sweep(self, resume_bins: int = 0):
         if self.current_sweep >= self.total_sweeps:
             return
 
@@ -1557,13 +1837,36 @@ class MainWindow(QMainWindow):
             x_cmd, y_cmd = self._clamp_xy_steps(x_goal_steps, y0_steps)
             points = [(x_cmd, y_cmd)]
 
-        # --- Worker for this sweep (append to SAME CSV) ---
-        from PyQt5.QtCore import Qt
-        from workers.measuring_worker import MeasuringWorker
+        if resume_bins > 0 and points:
+            # Resuming after a reconnect: start at the last logged Δx bin edge and
+            # drop the waypoints already behind it (the sweep runs from center toward X=0)
+            bin_steps = max(1, int(round(float(self.shared_data.x_delta) * ratio)))
+            x_resume = x_center_steps - resume_bins * bin_steps
+            ahead = [(x, y) for x, y in points if x < x_resume] or points[-1:]
+            points = [self._clamp_xy_steps(x_resume, ahead[0][1])] + ahead
+            print(f"[resume] sweep {self.current_sweep} from bin {resume_bins} (x={x_resume} steps)")
+
+        if self.manifest is not None:
+            self.manifest.sweep_started(self.current_sweep, resume_bins)
+        ctx = self._run_context(x_center_steps)
+
+        # --- Series worker still spun up: next trajectory on the same CSV / thread ---
+        worker = self.measuringWorker
+        if worker is not None and getattr(worker, "_series_open", False) and self.measuringThread.isRunning():
+            QMetaObject.invokeMethod(worker, "next_sweep", Qt.QueuedConnection,
+                                     Q_ARG(object, points), Q_ARG(int, int(resume_bins)),
+                                     Q_ARG(object, ctx))
+            return
 
+        # --- New series worker (first sweep, or after a reconnect / error closed the old one) ---
         first_pwm  = int(1000 + (self.first_throttle.value() * 10))
         second_pwm = int(1000 + (self.second_throttle.value() * 10)) if self.tandem_setup else 1000
 
+        # the previous worker lives in measuringThread: stop the thread before it is dropped
+        if self.measuringThread.isRunning():
+            self.measuringThread.quit()
+            self.measuringThread.wait()
+
         self.measuringWorker = MeasuringWorker(
             points=points,
             csv_path=self.series_csv_path,   # single file for all sweeps
@@ -1572,9 +1875,12 @@ class MainWindow(QMainWindow):
             tandem_setup=self.tandem_setup,
             motor_pwm1=first_pwm,
             motor_pwm2=second_pwm,
-            steps_per_mm=float(self.shared_data.ratio),
-            parent=self
+            resume_bins=resume_bins,
+            persistent=True,
+            context=ctx,
+            ring_name=self._ring_name(),
         )
+        # no parent: a parented QObject cannot be moved to another thread
         self.measuringWorker.moveToThread(self.measuringThread)
 
         # wire signals
@@ -1582,6 +1888,9 @@ class MainWindow(QMainWindow):
         self.measurementsFrame.connect(self.measuringWorker.on_measurements, type=Qt.QueuedConnection)
         self.tareDone.connect(self.measuringWorker.on_tare_done, type=Qt.QueuedConnection)
         self.measuringWorker.finished.connect(self.on_measuring_finished, Qt.QueuedConnection)
+        self.measuringWorker.sweepFinished.connect(self.on_measuring_finished, Qt.QueuedConnection)
+        self.measuringWorker.retareStarted.connect(self.on_worker_retare, Qt.QueuedConnection)
+        self.measuringWorker.sweepInterrupted.connect(self.on_worker_sweep_interrupted, Qt.QueuedConnection)
         self.measuringWorker.progress.connect(self.on_worker_progress, Qt.QueuedConnection)        
         try:
             self.measuringWorker.liveData.connect(self.on_live_data, type=Qt.QueuedConnection)
@@ -1590,11 +1899,8 @@ class MainWindow(QMainWindow):
 
         # If tare already done earlier (e.g. calibration), allow immediate proceed
         if getattr(self, "tare_done", False):
-            QTimer.singleShot(0, self.measuringWorker.on_tare_done)
+            QMetaObject.invokeMethod(self.measuringWorker, "on_tare_done", Qt.QueuedConnection)
 
-        if self.measuringThread.isRunning():
-            self.measuringThread.quit()
-            self.measuringThread.wait()
         try:
             self.measuringThread.started.disconnect()
         except Exception:
@@ -1602,8 +1908,22 @@ class MainWindow(QMainWindow):
         self.measuringThread.started.connect(self.measuringWorker.start, Qt.QueuedConnection)
         self.measuringThread.start()
         
+    def _clock_summary(self):
+        """MCU clock fit of this connection (the acquisition process runs its own), None without ticks."""
+        if isinstance(self.serialTransport, AcquisitionTransport):
+            return self.serialTransport.clock
+        return self.clock_sync.summary() if self.clock_sync.samples else None
+
+    def _ring_name(self):
+        """Shared-memory ring of the acquisition process, None on the serial reader paths."""
+        if isinstance(self.serialTransport, AcquisitionTransport):
+            return self.serialTransport.ring_name
+        return None
+
     @pyqtSlot(str)
     def on_measuring_finished(self, csv_path):
+        if self.manifest is not None:
+            self.manifest.sweep_finished(self.current_sweep, clock=self._clock_summary())
         # progress across sweeps
         try:
             self.test_progress.setValue(self.current_sweep)
@@ -1612,6 +1932,10 @@ class MainWindow(QMainWindow):
 
         # FINAL SWEEP? go home
         if self.current_sweep >= self.total_sweeps:
+            if self.measuringWorker is not None:
+                QMetaObject.invokeMethod(self.measuringWorker, "close_series", Qt.QueuedConnection)
+            if self.manifest is not None:
+                self.manifest.finish("completed")
             self._post_sweep_phase = "idle"
             self._postprocess_after_home = True
             self._going_home = True
@@ -1623,16 +1947,52 @@ class MainWindow(QMainWindow):
             return
 
         # --- INTERMEDIATE SWEEP chain ---
+        # persistent series worker: motors keep spinning, only the probe is repositioned
         self._post_sweep_phase = "stopping"
-        self.sendData('stop')
+        if not getattr(self.measuringWorker, "_series_open", False):
+            self.sendData('stop')
         QTimer.singleShot(self._post_sweep_delay_ms, self._post_sweep_moveY0)
 
     @pyqtSlot(int, int)
     def on_worker_progress(self, idx: int, total: int):
         return
 
+    @pyqtSlot(float)
+    def on_worker_retare(self, drift_pct: float):
+        if self.manifest is not None:
+            self.manifest.event("retare", sweep=self.current_sweep, drift_pct=round(drift_pct, 2))
+
+    @pyqtSlot()
+    def on_worker_sweep_interrupted(self):
+        """ESCs stopped under a running sweep (over axis limit): redo it after the recovery moves."""
+        self._redo_bins = self._logged_bins()
+        self.current_sweep -= 1
+        print(f"[resume] sweep {self.current_sweep + 1} interrupted, redo from bin {self._redo_bins}")
+        if self.manifest is not None:
+            self.manifest.event("interrupted", sweep=self.current_sweep + 1, bin=self._redo_bins)
+
+    def _logged_bins(self) -> int:
+        """Δx bins of the current sweep already in the series CSV."""
+        x_mm = last_logged_x_mm(self.series_csv_path)
+        dx_mm = float(self.shared_data.x_delta) or 1.0
+        return int(math.floor(x_mm / dx_mm + 1e-6)) if x_mm else 0
+
     def process_data(self):
-        return _process_data.process_data(self)
+        self.summary_metrics = {}
+        from data import data_processing as _process_data
+        out_path = _process_data.process_data(self)
+        if out_path:
+            # results belong to the run the processed log came from, not necessarily the last series
+            manifest = self.manifest
+            if manifest is None or manifest.run_dir.resolve() != Path(out_path).resolve().parent:
+                manifest = RunManifest.for_file(out_path)
+            if manifest is not None:
+                manifest.set_results(out_path, self.summary_metrics)
+        try:
+            self._run_catalog().index_run(self.path)
+        except Exception as e:
+            print("catalog index error:", e)
+        return out_path
     
     def _post_sweep_center(self):
         if not getattr(self, "_series_running", False):
@@ -1787,4 +2147,7 @@ class MainWindow(QMainWindow):
             self.trajectory_mode_label.setStyleSheet("color: gray;")
 
     def calculate_CT_show(self):
+        if self.calculate_CT is None:
+            from tools.calc_center_of_thrust import Calculate_center_of_thrust
+            self.calculate_CT = Calculate_center_of_thrust()
         self.calculate_CT.show()
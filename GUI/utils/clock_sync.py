@@ -0,0 +1,210 @@
+# utils/clock_sync.py
+"""
+Frame timing: host arrival stamps, MCU tick alignment and rate / gap statistics.
+
+Every serial line is stamped with time.monotonic_ns() when its bytes are read
+(SerialReader, AsyncSerialTransport, the acquisition process), so a frame
+carries t_ns = host arrival time. That stamp includes USB / OS buffering
+latency and jitter of a few ms.
+
+If the firmware appends a tick counter to the 'Measurements:' line (optional
+14th field, e.g. millis()), ClockSync maps it onto the host clock:
+
+  host_ns ≈ offset + rate * mcu_ticks
+
+rate is a running least-squares fit over every frame since the last reset
+(its deviation from 1 is the MCU crystal drift, drift_ppm; the span grows
+with the connection, so a few-ppm drift is resolved after a minute or so
+despite the ms jitter), offset is the lower envelope of host_ns - rate *
+mcu_ticks over the last `window` frames, i.e. the frames that arrived with the
+least latency. The aligned stamp (t_mcu_ns) is then the sample time on the host clock
+without the USB jitter. A tick counter that runs backwards (MCU reset) or jumps
+by more than half its range restarts the fit.
+
+FrameTiming accumulates per-sweep statistics of either stamp: frame rate,
+period jitter, gaps (a period longer than GAP_FACTOR × the running mean) and
+the number of frames estimated missing in those gaps. Lines completed by the
+same read share its stamp; FrameTiming counts them as one batch.
+"""
+import copy
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+TICK_WRAP = 2 ** 32            # uint32 millis()/micros() counter
+WINDOW = 500                   # frames in the offset envelope (~10 s at 50 Hz)
+REFIT_EVERY = 25
+MIN_SPAN_S = 20.0              # fit span before the slope is used (rate 1 until then:
+                               # a 100 ppm crystal is off by 2 ms over that span)
+GAP_FACTOR = 1.8               # dt > GAP_FACTOR × mean period counts as a gap
+GAP_WARMUP = 5                 # frames before gaps are judged
+
+
+class ClockSync:
+    """Maps an MCU tick counter onto time.monotonic_ns()."""
+
+    def __init__(self, tick_hz: float = 1000.0, window: int = WINDOW, wrap: int = TICK_WRAP):
+        if not tick_hz > 0:
+            raise ValueError(f"MCU taktisagedus peab olema positiivne: {tick_hz!r}")
+        if window < 2:
+            raise ValueError(f"Triivi sobitusaken peab olema vähemalt 2: {window!r}")
+        self.tick_hz = float(tick_hz)
+        self.window = int(window)
+        self.wrap = int(wrap)
+        self.resets = 0
+        self.reset()
+
+    def reset(self):
+        """Forget the fit (reconnect, MCU reboot)."""
+        self._last_tick: Optional[int] = None
+        self._ticks = 0                     # unwrapped ticks since the first sample
+        self._host0 = 0
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=self.window)   # (mcu s, host s)
+        self._mx = self._my = 0.0           # running means / co-moments of the rate fit
+        self._cxx = self._cxy = 0.0
+        self._rate = 1.0
+        self._fitted = False
+        self._offset_s = math.inf
+        self._since_fit = 0
+        self.samples = 0
+
+    @property
+    def drift_ppm(self) -> Optional[float]:
+        """MCU clock vs host clock (positive: MCU ticks slow); None until fitted."""
+        if not self._fitted:
+            return None
+        return (self._rate - 1.0) * 1e6
+
+    def add(self, tick: float, host_ns: int) -> int:
+        """Feed one frame's tick and arrival stamp; returns the aligned host time (ns)."""
+        tick = int(tick) % self.wrap
+        if self._last_tick is None:
+            self._host0 = int(host_ns)
+        else:
+            step = (tick - self._last_tick) % self.wrap
+            if step > self.wrap // 2:
+                # counter went backwards (or leapt half its range): the MCU restarted
+                self.resets += 1
+                self.reset()
+                self._host0 = int(host_ns)
+            else:
+                self._ticks += step
+        self._last_tick = tick
+        self.samples += 1
+
+        mcu_s = self._ticks / self.tick_hz
+        host_s = (int(host_ns) - self._host0) * 1e-9
+        self._samples.append((mcu_s, host_s))
+        n = self.samples
+        dx = mcu_s - self._mx
+        self._mx += dx / n
+        self._my += (host_s - self._my) / n
+        self._cxx += dx * (mcu_s - self._mx)
+        self._cxy += dx * (host_s - self._my)
+        self._since_fit += 1
+        if self._since_fit >= REFIT_EVERY or n == 1:
+            self._fit()
+        else:
+            self._offset_s = min(self._offset_s, host_s - self._rate * mcu_s)
+        return self._host0 + int(round((self._offset_s + self._rate * mcu_s) * 1e9))
+
+    def _fit(self):
+        self._since_fit = 0
+        if self._samples[-1][0] >= MIN_SPAN_S and self._cxx > 0:
+            self._rate = self._cxy / self._cxx
+            self._fitted = True
+        self._offset_s = min(h - self._rate * m for m, h in self._samples)
+
+    def summary(self) -> Dict[str, Any]:
+        drift = self.drift_ppm
+        return {
+            "tick_hz": self.tick_hz,
+            "frames": self.samples,
+            "drift_ppm": None if drift is None else round(drift, 1),
+            "resets": self.resets,
+        }
+
+
+class FrameTiming:
+    """
+    Running rate / jitter / gap statistics of a stream of stamps (ns).
+
+    The readers stamp once per read(), so every line completed by one read
+    carries the same t_ns. Frames with equal stamps are taken as one batch:
+    the interval from the previous stamp to the batch is split evenly over
+    its frames, so a batch neither shows up as zero-length periods nor as a
+    gap. A batch is judged once the next stamp arrives (summary() includes the
+    open one).
+    """
+
+    __slots__ = ("frames", "_t0", "_first", "_prev", "_last", "_batch", "_n_dt", "_sum_dt",
+                 "_sum_dt2", "max_dt", "gaps", "missing")
+
+    def __init__(self):
+        self.frames = 0
+        self._t0 = 0
+        self._first = 0             # frames of the first batch (no interval before them)
+        self._prev = 0              # stamp of the batch before the open one
+        self._last = 0              # stamp of the open batch
+        self._batch = 0             # frames in the open batch
+        self._n_dt = 0              # periods in the mean (gaps excluded)
+        self._sum_dt = 0.0
+        self._sum_dt2 = 0.0
+        self.max_dt = 0
+        self.gaps = 0
+        self.missing = 0            # frames estimated lost in the gaps
+
+    def add(self, t_ns: int):
+        if not t_ns:
+            return
+        self.frames += 1
+        if not self._batch:
+            self._t0 = self._last = t_ns
+            self._batch = self._first = 1
+        elif t_ns == self._last:
+            self._batch += 1
+            if self._last == self._t0:
+                self._first += 1
+        else:
+            self._close()
+            self._prev, self._last, self._batch = self._last, t_ns, 1
+
+    def _close(self):
+        """Book the open batch: its interval over its frames."""
+        if self._last == self._t0:
+            return                  # first batch: nothing before it
+        n = self._batch
+        dt = self._last - self._prev
+        period = dt / n
+        if period > self.max_dt:
+            self.max_dt = period
+        mean = self._sum_dt / self._n_dt if self._n_dt else 0.0
+        if self._n_dt >= GAP_WARMUP and period > GAP_FACTOR * mean:
+            self.gaps += 1
+            self.missing += max(0, int(round(dt / mean)) - n)
+        else:
+            self._n_dt += n
+            self._sum_dt += dt
+            self._sum_dt2 += period * period * n
+
+    @property
+    def duration_s(self) -> float:
+        return (self._last - self._t0) * 1e-9 if self.frames > 1 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        if self.frames < 2:
+            return {"frames": self.frames}
+        done = copy.copy(self)
+        done._close()
+        dur = done.duration_s
+        mean = done._sum_dt / done._n_dt if done._n_dt else 0.0
+        var = done._sum_dt2 / done._n_dt - mean * mean if done._n_dt else 0.0
+        return {
+            "frames": done.frames,
+            "rate_hz": round((done.frames - done._first) / dur, 2) if dur > 0 else None,
+            "period_ms": round(mean * 1e-6, 3),
+            "jitter_ms": round(math.sqrt(max(0.0, var)) * 1e-6, 3),
+            "max_gap_ms": round(done.max_dt * 1e-6, 1),
+            "gaps": done.gaps,
+            "missing_est": done.missing,
+        }
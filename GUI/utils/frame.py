@@ -0,0 +1,166 @@
+# utils/frame.py
+"""
+Measurement frame passed from MainWindow.handleData to the measuring worker.
+
+Frame is one decoded 'Measurements:' line in SI units, built once per line and
+handed on as is (measurementsFrame -> MeasuringWorker.on_measurements -> bin ->
+CSV row). Fields are read by name; nothing downstream copies it into a list.
+
+Besides the measured fields a frame carries its timing (utils/clock_sync.py):
+t_ns is time.monotonic_ns() when the line was read from the port, t_mcu_ns the
+MCU tick of the frame aligned to that clock (0 when the firmware sends no tick).
+
+Frame.from_measurements() does the unit conversion from the MCU line (steps,
+mN, N·mm, raw RPM); it is shared by MainWindow (serial reader paths) and the
+measuring worker reading the acquisition ring (utils/shm_ring.py).
+
+FrameSum keeps the running sums of a Δx bin instead of the frames themselves,
+so a bin costs the same memory whether it holds 5 or 500 frames.
+"""
+from operator import attrgetter
+from typing import Iterable, Optional
+
+FRAME_FIELDS = (
+    "x", "y",                       # steps
+    "thr1", "trq1", "rpm1",         # N, N·m, rpm
+    "airspeed",                     # m/s
+    "aoa_raw", "aoa_abs",           # deg
+    "aoss_raw", "aoss_abs",         # deg
+    "thr2", "trq2", "rpm2",         # second prop (0 on a single-prop stand)
+)
+
+values = attrgetter(*FRAME_FIELDS)      # frame -> 13-tuple in FRAME_FIELDS order
+
+RPM_SCALE = 5000.0 / 5050.0
+RPM_ZERO_DEADBAND = 80.0
+
+
+def normalize_rpm(val: float) -> float:
+    """
+    Normalize incoming RPM:
+    - handle centi-RPM if upstream sends e.g. 120700 for 1207.00
+    - apply empirical scale correction from Dewesoft comparison
+    - never return negative / tiny nonzero RPM
+    """
+    try:
+        v = float(val)
+    except Exception:
+        return val
+
+    # If it's suspiciously huge, assume centi-RPM.
+    if 20_000 < v < 1_000_000:
+        v = v / 100.0
+
+    # Treat low values as stopped.
+    if abs(v) < RPM_ZERO_DEADBAND:
+        return 0.0
+
+    # Scalable correction: stand reads slightly high.
+    v = v * RPM_SCALE
+
+    return max(0.0, v)
+
+
+TIME_FIELDS = ("t_ns", "t_mcu_ns")       # host arrival, aligned MCU sample time (ns)
+
+
+class Frame:
+    __slots__ = FRAME_FIELDS + TIME_FIELDS
+
+    def __init__(self, x: float, y: float, thr1: float, trq1: float, rpm1: float,
+                 airspeed: float, aoa_raw: float, aoa_abs: float,
+                 aoss_raw: float, aoss_abs: float,
+                 thr2: float = 0.0, trq2: float = 0.0, rpm2: float = 0.0,
+                 t_ns: int = 0, t_mcu_ns: int = 0):
+        self.x = x
+        self.y = y
+        self.thr1 = thr1
+        self.trq1 = trq1
+        self.rpm1 = rpm1
+        self.airspeed = airspeed
+        self.aoa_raw = aoa_raw
+        self.aoa_abs = aoa_abs
+        self.aoss_raw = aoss_raw
+        self.aoss_abs = aoss_abs
+        self.thr2 = thr2
+        self.trq2 = trq2
+        self.rpm2 = rpm2
+        self.t_ns = t_ns
+        self.t_mcu_ns = t_mcu_ns
+
+    @property
+    def t_sample_ns(self) -> int:
+        """Best sample time: the aligned MCU stamp if there is one, else the arrival stamp."""
+        return self.t_mcu_ns or self.t_ns
+
+    @classmethod
+    def from_measurements(cls, msg, t_ns: int = 0, t_mcu_ns: int = 0) -> "Frame":
+        """
+        Frame from a parsed 'Measurements:' line (utils.protocol.Measurements):
+        steps, mN, N·mm -> steps, N, N·m, RPM normalized.
+        """
+        return cls(
+            float(round(msg.x)), float(round(msg.y)),
+            msg.thr1_mN / 1000.0, msg.trq1_Nmm / 1000.0, normalize_rpm(msg.rpm1),
+            msg.airspeed, msg.aoa_raw, msg.aoa_abs, msg.aoss_raw, msg.aoss_abs,
+            msg.thr2_mN / 1000.0, msg.trq2_Nmm / 1000.0, normalize_rpm(msg.rpm2),
+            t_ns, t_mcu_ns,
+        )
+
+    @classmethod
+    def from_values(cls, vals: Iterable[float]) -> "Frame":
+        """Frame from 10 or 13 numbers in FRAME_FIELDS order (legacy list frames)."""
+        v = [float(a) for a in vals][:len(FRAME_FIELDS)]
+        if len(v) < 10:
+            raise ValueError(f"Mõõteraamis on {len(v)} välja, oodati 10 või 13")
+        return cls(*v)
+
+    def __repr__(self):
+        return "Frame(" + ", ".join(f"{n}={getattr(self, n)!r}" for n in FRAME_FIELDS + TIME_FIELDS) + ")"
+
+
+class FrameSum:
+    """Running per-field sums of the frames of one bin."""
+    __slots__ = ("n", "x", "y", "thr1", "trq1", "rpm1", "airspeed", "aoa_raw", "aoa_abs",
+                 "aoss_raw", "aoss_abs", "thr2", "trq2", "rpm2")
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.n = 0
+        self.x = self.y = 0.0
+        self.thr1 = self.trq1 = self.rpm1 = 0.0
+        self.airspeed = 0.0
+        self.aoa_raw = self.aoa_abs = self.aoss_raw = self.aoss_abs = 0.0
+        self.thr2 = self.trq2 = self.rpm2 = 0.0
+
+    def __len__(self):
+        return self.n
+
+    def add(self, f: Frame):
+        self.n += 1
+        self.x += f.x
+        self.y += f.y
+        self.thr1 += f.thr1
+        self.trq1 += f.trq1
+        self.rpm1 += f.rpm1
+        self.airspeed += f.airspeed
+        self.aoa_raw += f.aoa_raw
+        self.aoa_abs += f.aoa_abs
+        self.aoss_raw += f.aoss_raw
+        self.aoss_abs += f.aoss_abs
+        self.thr2 += f.thr2
+        self.trq2 += f.trq2
+        self.rpm2 += f.rpm2
+
+    def mean(self, x: Optional[float] = None, y: Optional[float] = None) -> Optional[Frame]:
+        """Field-wise mean (None if empty); x / y replace the averaged position."""
+        n = self.n
+        if not n:
+            return None
+        return Frame(self.x / n if x is None else x, self.y / n if y is None else y,
+                     self.thr1 / n, self.trq1 / n, self.rpm1 / n,
+                     self.airspeed / n, self.aoa_raw / n, self.aoa_abs / n,
+                     self.aoss_raw / n, self.aoss_abs / n,
+                     self.thr2 / n, self.trq2 / n, self.rpm2 / n)
@@ -0,0 +1,52 @@
+# utils/npy_cache.py
+"""
+Content-keyed .npy cache next to a source file.
+
+A parsed array is stored beside its source as ".<name>.<key>.npy", where the
+key is a hash of the file bytes plus everything else the parse depends on
+(format version, units, columns). Editing the file or changing a parameter
+gives a new key; the stale entry is removed when the new one is written.
+Used by the trajectory compiler (data/trajectory.py) and the run comparison
+(data/run_compare.py).
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+
+def cache_key(data: bytes, params: str) -> str:
+    h = hashlib.sha1(data)
+    h.update(params.encode())
+    return h.hexdigest()[:12]
+
+
+def cache_path(path: Path, key: str) -> Path:
+    return path.with_name(f".{path.name}.{key}.npy")
+
+
+def read_cache(cache: Path, what: str, mmap: bool = False) -> Optional[np.ndarray]:
+    """The cached array, None if missing or unreadable (a broken entry is reported, not raised)."""
+    if not cache.exists():
+        return None
+    try:
+        return np.load(cache, mmap_mode="r" if mmap else None, allow_pickle=False)
+    except Exception as e:
+        print(f"{what} cache unreadable ({cache.name}): {e}")
+        return None
+
+
+def write_cache(path: Path, cache: Path, arr: np.ndarray, what: str):
+    """Atomic write (temp file + replace); older entries of the same source are removed."""
+    try:
+        for old in path.parent.glob(f".{path.name}.*.npy"):
+            if old != cache:
+                old.unlink()
+        tmp = cache.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, arr, allow_pickle=False)
+        os.replace(tmp, cache)
+    except OSError as e:
+        print(f"{what} cache not written: {e}")
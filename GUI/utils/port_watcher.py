@@ -0,0 +1,79 @@
+# utils/port_watcher.py
+from typing import Dict, List, Optional
+
+from PyQt5.QtCore import QDir, QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+from utils.ports import is_stand, list_port_infos
+
+DEV_DIR = "/dev"
+SETTLE_MS = 300          # coalesce the burst of /dev events of one plug / unplug
+FALLBACK_POLL_MS = 2000  # no /dev to watch (Windows)
+
+
+class PortWatcher(QObject):
+    """
+    Serial port hotplug events for the connect combo box.
+
+    Watches /dev with QFileSystemWatcher (inotify on Linux, no thread or timer of
+    our own while idle); a tty node appearing or vanishing triggers one debounced
+    comports() scan that is diffed against the previous one. Ports whose USB
+    VID/PID belong to the stand (config.stand_usb_ids) are flagged and listed
+    first. Where there is no /dev, a slow poll does the same scan.
+    """
+
+    portAdded = pyqtSignal(str, bool)     # device, is the stand
+    portRemoved = pyqtSignal(str)         # device
+    portsChanged = pyqtSignal(list)       # devices, stand ports first
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._ports: Dict[str, bool] = {}         # device -> is the stand
+        self._settle = QTimer(self)
+        self._settle.setSingleShot(True)
+        self._settle.setInterval(SETTLE_MS)
+        self._settle.timeout.connect(self.rescan)
+        self._fs: Optional[QFileSystemWatcher] = None
+        self._poll: Optional[QTimer] = None
+
+    def start(self):
+        """Initial scan (emits portsChanged) and start watching."""
+        if QDir(DEV_DIR).exists():
+            self._fs = QFileSystemWatcher([DEV_DIR], self)
+            self._fs.directoryChanged.connect(lambda _path: self._settle.start())
+        else:
+            self._poll = QTimer(self)
+            self._poll.setInterval(FALLBACK_POLL_MS)
+            self._poll.timeout.connect(self.rescan)
+            self._poll.start()
+        self.rescan(force=True)
+
+    def stop(self):
+        self._settle.stop()
+        if self._fs is not None:
+            self._fs.deleteLater()
+            self._fs = None
+        if self._poll is not None:
+            self._poll.stop()
+            self._poll = None
+
+    def ports(self) -> List[str]:
+        return sorted(self._ports, key=lambda d: (not self._ports[d], d))
+
+    def stand_ports(self) -> List[str]:
+        return [d for d in self.ports() if self._ports[d]]
+
+    def rescan(self, force: bool = False):
+        try:
+            found = {p.device: is_stand(p) for p in list_port_infos()}
+        except Exception as e:
+            print(f"[ports] scan failed: {e}")
+            return
+        added = [d for d in found if d not in self._ports]
+        removed = [d for d in self._ports if d not in found]
+        self._ports = found
+        for d in removed:
+            self.portRemoved.emit(d)
+        for d in added:
+            self.portAdded.emit(d, found[d])
+        if added or removed or force:
+            self.portsChanged.emit(self.ports())
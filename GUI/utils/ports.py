@@ -1,5 +1,19 @@
 import serial.tools.list_ports
 
+from config import stand_usb_ids
+
+
+def list_port_infos():
+    """ListPortInfo of the ACM/USB ports (one comports() scan)."""
+    return [p for p in serial.tools.list_ports.comports() if 'ACM' in p.device or 'USB' in p.device]
+
+
 def list_serial_ports():
-    ports = serial.tools.list_ports.comports()
-    return [p.device for p in ports if 'ACM' in p.device or 'USB' in p.device]
+    return [p.device for p in list_port_infos()]
+
+
+def is_stand(info, usb_ids=stand_usb_ids):
+    """True if the port's USB VID/PID is one of the stand controller's."""
+    if info.vid is None:
+        return False
+    return any(info.vid == vid and (pid is None or info.pid == pid) for vid, pid in usb_ids)
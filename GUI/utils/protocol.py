@@ -0,0 +1,242 @@
+# utils/protocol.py
+"""
+Typed messages of the stand controller (PropStandController.ino) and a
+table-driven line parser.
+
+Every message type is registered under its line prefix. The registry is keyed by
+the first KEY_LEN characters of the prefix ("measur", "lc tes", "readao", ...), so
+classifying a line is one dict lookup + a prefix compare against the (at most
+two) prefixes sharing that key, instead of walking an if-chain with a
+substring search per branch. A Measurements frame, the bulk of the traffic,
+costs the same as any other line.
+
+Status lines ("Ready!", "Emergency!", ...) are also registered with
+anywhere=True: a line that matched no prefix (e.g. boot noise in front of
+"Ready!") is searched for them as a fallback, as the old handler did with `in`.
+
+New message types are added by registration alone:
+
+    @message("foo:")
+    class Foo(NamedTuple):
+        value: float
+
+        @classmethod
+        def parse(cls, line, payload):   # payload = line after the prefix
+            return cls(float(payload))
+
+parse_line() returns the message object, Malformed if the parser raised
+ValueError, or None for lines that are not messages (debug prints, echoes).
+"""
+import math
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+Parser = Callable[[str, str], object]
+
+KEY_LEN = 6          # registry key: first characters of the line, lowercased
+_BY_KEY: Dict[str, List[Tuple[str, int, Parser]]] = {}
+_ANYWHERE: Dict[str, Parser] = {}
+_ANYWHERE_RE: Optional[Pattern] = None     # one alternation over _ANYWHERE
+
+
+class Malformed(NamedTuple):
+    kind: str           # message type name
+    line: str
+    reason: str
+
+
+def register(prefix: str, parser: Parser, anywhere: bool = False):
+    """Register parser(line, payload) for lines starting with prefix (case-insensitive)."""
+    prefix = prefix.lower()
+    if len(prefix) < KEY_LEN:
+        raise ValueError(f"Protokolli prefiks peab olema vähemalt {KEY_LEN} märki pikk: {prefix!r}")
+    entries = _BY_KEY.setdefault(prefix[:KEY_LEN], [])
+    entries[:] = [e for e in entries if e[0] != prefix]
+    entries.append((prefix, len(prefix), parser))
+    entries.sort(key=lambda e: -e[1])               # longest prefix wins
+    if anywhere:
+        global _ANYWHERE_RE
+        _ANYWHERE[prefix] = parser
+        alts = sorted(_ANYWHERE, key=len, reverse=True)
+        _ANYWHERE_RE = re.compile("|".join(map(re.escape, alts)))
+
+
+def message(prefix: str, anywhere: bool = False):
+    """Class decorator: register cls.parse, or one shared cls() for field-less status lines."""
+    def deco(cls):
+        parse = getattr(cls, "parse", None)
+        if parse is None:
+            parse = lambda line, payload, _msg=cls(): _msg
+        register(prefix, parse, anywhere)
+        return cls
+    return deco
+
+
+def _malformed(parser: Parser, prefix: str, line: str, e: Exception) -> Malformed:
+    kind = getattr(getattr(parser, "__self__", None), "__name__", prefix)
+    return Malformed(kind, line, str(e))
+
+
+def parse_line(line: str):
+    """Message object for one (stripped) MCU line, Malformed, or None."""
+    entries = _BY_KEY.get(line[:KEY_LEN].lower())
+    if entries is not None:
+        for prefix, n, parser in entries:
+            if line[:n].lower() == prefix:
+                try:
+                    return parser(line, line[n:].strip())
+                except (ValueError, IndexError) as e:
+                    return _malformed(parser, prefix, line, e)
+    if _ANYWHERE_RE is not None:
+        m = _ANYWHERE_RE.search(line.lower())
+        if m:
+            return _ANYWHERE[m.group()](line, line[m.end():].strip())
+    return None
+
+
+def registered_prefixes() -> List[str]:
+    return sorted(p for entries in _BY_KEY.values() for p, _, _ in entries)
+
+
+def _floats(payload: str, n: int) -> Tuple[float, ...]:
+    parts = payload.split()
+    if len(parts) != n:
+        raise ValueError(f"expected {n} fields, got {len(parts)}")
+    return tuple(map(float, parts))
+
+
+# ==================================
+# Status lines
+# ==================================
+@message("ready!", anywhere=True)
+class Ready(NamedTuple):
+    pass
+
+
+@message("emergency!", anywhere=True)
+class Emergency(NamedTuple):
+    pass
+
+
+@message("emergency cleared", anywhere=True)
+class EmergencyCleared(NamedTuple):
+    pass
+
+
+@message("homing done", anywhere=True)
+class HomingDone(NamedTuple):
+    pass
+
+
+@message("limit switch", anywhere=True)
+class LimitSwitch(NamedTuple):
+    pass
+
+
+@message("tare done", anywhere=True)
+class TareDone(NamedTuple):
+    pass
+
+
+@message("centering done", anywhere=True)
+class CenteringDone(NamedTuple):
+    pass
+
+
+@message("jog done", anywhere=True)
+class JogDone(NamedTuple):
+    pass
+
+
+@message("over axis limit", anywhere=True)
+class OverAxisLimit(NamedTuple):
+    pass
+
+
+# ==================================
+# Data lines
+# ==================================
+@message("calval:")
+class CalVal(NamedTuple):
+    value: float
+
+    @classmethod
+    def parse(cls, line, payload):
+        return cls(float(payload))
+
+
+@message("lc test:")
+class LcTest(NamedTuple):
+    # mN / g / N·mm / g / rpm per prop, as sent (rpm not normalized)
+    thr1: float
+    thr1_g: float
+    trq1: float
+    trq1_g: float
+    rpm1: float
+    thr2: float
+    thr2_g: float
+    trq2: float
+    trq2_g: float
+    rpm2: float
+
+    @classmethod
+    def parse(cls, line, payload):
+        return cls._make(_floats(payload, 10))
+
+
+@message("readaoa|")
+class ReadAoA(NamedTuple):
+    # readAoA|<raw>|<deg>|<x>; kept as text, shown as sent
+    raw: str
+    deg: str
+
+    @classmethod
+    def parse(cls, line, payload):
+        parts = line.split("|")
+        if len(parts) < 4:
+            raise ValueError(f"expected 4 fields, got {len(parts)}")
+        return cls(parts[1], parts[2])
+
+
+@message("readaoss|")
+class ReadAoSS(NamedTuple):
+    # readAoSS|<pos>|<turn>|<servoDeg>|<tubeDeg>
+    pos: str
+    turn: str
+    servo_deg: str
+    tube_deg: str
+
+    @classmethod
+    def parse(cls, line, payload):
+        parts = line.split("|")
+        if len(parts) < 5:
+            raise ValueError(f"expected 5 fields, got {len(parts)}")
+        return cls(parts[1], parts[2], parts[3], parts[4])
+
+
+@message("measurements:")
+class Measurements(NamedTuple):
+    # raw MCU units: steps, mN, N·mm, rpm, m/s, deg
+    x: float
+    y: float
+    thr1_mN: float
+    trq1_Nmm: float
+    rpm1: float
+    airspeed: float
+    aoa_raw: float
+    aoa_abs: float
+    aoss_raw: float
+    aoss_abs: float
+    thr2_mN: float
+    trq2_Nmm: float
+    rpm2: float
+    tick: float = math.nan          # optional MCU tick counter (utils/clock_sync.py)
+
+    @classmethod
+    def parse(cls, line, payload):
+        parts = payload.split()
+        if len(parts) == 13:
+            return cls._make(map(float, parts + ["nan"]))
+        if len(parts) != 14:
+            raise ValueError(f"expected 13 or 14 fields, got {len(parts)}")
+        return cls._make(map(float, parts))
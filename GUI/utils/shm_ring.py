@@ -0,0 +1,153 @@
+# utils/shm_ring.py
+"""
+Ring buffer of decoded measurement frames in multiprocessing.shared_memory.
+
+One writer (the acquisition process) appends fixed-size records; any number of
+readers, in any process, attach by name and keep their own cursor. Records are
+a NumPy structured array laid directly over the shared block, so read() hands
+out views into it - nothing is copied or pickled between the processes.
+
+Layout: a header of HEADER_WORDS uint64 (magic, capacity, head) followed by
+capacity records of RECORD_DTYPE. head counts records ever written; record k
+lives in slot k % capacity and its 'seq' field is k + 1 once complete. The
+writer fills the slot first and publishes head last, so a reader never sees a
+half-written record below head.
+
+A reader that falls more than capacity records behind loses the oldest ones;
+read() reports how many were dropped. A view stays valid until the writer
+comes round again (capacity records later), so consume or copy it before then.
+
+Each record carries the host arrival stamp t_ns and the MCU tick aligned to
+the host clock, t_mcu_ns (0 without a tick; the writer runs the ClockSync).
+"""
+from multiprocessing import shared_memory
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from utils.protocol import Measurements
+
+MAGIC = 0x46524D52494E4732         # "FRMRING2" (record layout version)
+HEADER_WORDS = 8
+DEFAULT_CAPACITY = 8192            # ~2.5 min of frames at 50 Hz
+
+RECORD_DTYPE = np.dtype(
+    [("seq", "<u8"), ("t_ns", "<i8"), ("t_mcu_ns", "<i8")]
+    + [(name, "<f8") for name in Measurements._fields]
+)
+_H_MAGIC, _H_CAPACITY, _H_HEAD = 0, 1, 2
+
+
+def block_size(capacity: int) -> int:
+    return HEADER_WORDS * 8 + capacity * RECORD_DTYPE.itemsize
+
+
+class FrameRing:
+    """Writer / owner side; create=False attaches to an existing ring by name."""
+
+    def __init__(self, name: Optional[str] = None, capacity: int = DEFAULT_CAPACITY,
+                 create: bool = True):
+        if create:
+            if capacity < 2:
+                raise ValueError(f"Ringpuhvri maht peab olema vähemalt 2: {capacity!r}")
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=block_size(capacity))
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._owner = create
+        self._header = np.ndarray((HEADER_WORDS,), dtype="<u8", buffer=self._shm.buf)
+        if create:
+            self._header[:] = 0
+            self._header[_H_CAPACITY] = capacity
+            self._header[_H_MAGIC] = MAGIC
+        elif int(self._header[_H_MAGIC]) != MAGIC:
+            self._shm.close()
+            raise ValueError(f"Jagatud mälu {name!r} ei ole mõõteraamide ringpuhver")
+        self.capacity = int(self._header[_H_CAPACITY])
+        self.records = np.ndarray((self.capacity,), dtype=RECORD_DTYPE,
+                                  buffer=self._shm.buf, offset=HEADER_WORDS * 8)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def head(self) -> int:
+        return int(self._header[_H_HEAD])
+
+    def push(self, values, t_ns: int = 0, t_mcu_ns: int = 0):
+        """Append one frame (numbers in Measurements field order, tick NaN if the MCU sends none)."""
+        k = int(self._header[_H_HEAD])
+        i = k % self.capacity
+        self.records[i] = (0, t_ns, t_mcu_ns, *values)
+        self.records["seq"][i] = k + 1
+        self._header[_H_HEAD] = k + 1
+
+    def reader(self, from_start: bool = False) -> "RingReader":
+        return RingReader(self, 0 if from_start else self.head)
+
+    def close(self):
+        # drop the views before closing the mapping
+        self.records = None
+        self._header = None
+        try:
+            self._shm.close()
+        except BufferError:
+            pass            # a consumer still holds a view; the mapping goes with the process
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class RingReader:
+    """One consumer's cursor into a FrameRing."""
+
+    def __init__(self, ring: FrameRing, cursor: int = 0):
+        self.ring = ring
+        self.cursor = cursor
+        self.dropped = 0            # records lost to overruns so far
+
+    def pending(self) -> int:
+        return self.ring.head - self.cursor
+
+    def skip(self):
+        """Drop everything written so far (the consumer is idle)."""
+        self.cursor = self.ring.head
+
+    def read(self, max_n: Optional[int] = None) -> Tuple[List[np.ndarray], int]:
+        """
+        ([views], dropped): the new records as one or two (at the wrap) views in
+        write order, and how many records were overwritten before this read.
+        """
+        ring = self.ring
+        head = ring.head
+        cap = ring.capacity
+        dropped = 0
+        if head - self.cursor > cap:
+            dropped = head - self.cursor - cap
+            self.cursor = head - cap
+        end = head if max_n is None else min(head, self.cursor + max(0, int(max_n)))
+        if end <= self.cursor:
+            self.dropped += dropped
+            return [], dropped
+        a, b = self.cursor % cap, end % cap
+        if a < b or b == 0:
+            views = [ring.records[a:(b or cap)]]
+        else:
+            views = [ring.records[a:], ring.records[:b]]
+        self.cursor = end
+        self.dropped += dropped
+        return views, dropped
+
+
+def iter_records(views) -> Iterator[Tuple[int, int, Measurements]]:
+    """(t_ns, t_mcu_ns, Measurements) for every record of RingReader.read() views, in write order."""
+    for view in views:
+        for rec in view.tolist():
+            yield rec[1], rec[2], Measurements._make(rec[3:])
+
+
+def sample_stamps(view: np.ndarray) -> np.ndarray:
+    """Sample time of every record of a view (t_mcu_ns where set, else t_ns), like Frame.t_sample_ns."""
+    return np.where(view["t_mcu_ns"] != 0, view["t_mcu_ns"], view["t_ns"])
@@ -6,6 +6,10 @@ from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QDoubleSpinBox, QSpinB
 import serial
 from pathlib import Path
 import app_globals
+from data.trajectory import (
+    parse_num_to_steps, compile_trajectory, TrajectoryLimits,
+    generate_0r_trajectory, validate_trajectory, write_trajectory_file
+)
 
 list_of_x_targets: list[int] = []
 list_of_y_targets: list[int] = []   # relative steps
@@ -85,6 +89,16 @@ class MapTrajectory(QWidget):
         self.wp_file.clicked.connect(self.save_wp_file)
         layout2.addWidget(self.wp_file)
         
+        self.label_spacing = QLabel("Trajektoori punktide vahe laadimisel (mm, 0 = faili punktid)")
+        layout2.addWidget(self.label_spacing)
+
+        self.resample_spacing = QDoubleSpinBox()
+        self.resample_spacing.setMinimum(0.0)
+        self.resample_spacing.setMaximum(50.0)
+        self.resample_spacing.setSingleStep(0.5)
+        self.resample_spacing.setValue(0.0)
+        layout2.addWidget(self.resample_spacing)
+
         self.wp_load = QPushButton("Otsi olemasolev trajektoori fail")
         self.wp_load.clicked.connect(self.load_wp_file)
         layout2.addWidget(self.wp_load)
@@ -92,6 +106,33 @@ class MapTrajectory(QWidget):
         self.delete = QPushButton("Kustuta trajektoor mälust")
         self.delete.clicked.connect(self.delete_wp)
         layout2.addWidget(self.delete)
+
+        self.space2 = QLabel(" " )
+        layout2.addWidget(self.space2)
+
+        self.label_hub_offset = QLabel("0R: Pitot' kaugus rummu (laba telje) tasapinnast algasendis (mm)")
+        layout2.addWidget(self.label_hub_offset)
+
+        self.hub_offset = QDoubleSpinBox()
+        self.hub_offset.setMinimum(0.0)
+        self.hub_offset.setMaximum(100.0)
+        self.hub_offset.setSingleStep(0.5)
+        self.hub_offset.setValue(30.0)
+        layout2.addWidget(self.hub_offset)
+
+        self.label_clearance = QLabel("0R: vaba vahe tagaserva ja Pitot' vahel (mm)")
+        layout2.addWidget(self.label_clearance)
+
+        self.clearance = QDoubleSpinBox()
+        self.clearance.setMinimum(1.0)
+        self.clearance.setMaximum(30.0)
+        self.clearance.setSingleStep(0.5)
+        self.clearance.setValue(6.0)
+        layout2.addWidget(self.clearance)
+
+        self.generate = QPushButton("Genereeri 0R trajektoor propelleri failist")
+        self.generate.clicked.connect(self.generate_0r_wp)
+        layout2.addWidget(self.generate)
         
         self.x_target = int(round((self.shared_data.x_center - self.X_pos_map.value()) * self.shared_data.ratio, 0))
         self.current_Y = int(round(self.Y_pos_map.value() * self.shared_data.ratio, 0))
@@ -205,18 +246,26 @@ class MapTrajectory(QWidget):
         If unit missing: decimal -> mm, integer -> steps.
         Examples: '123', '123.5', '2,2', '40 mm', '1200 steps'
         """
-        import re as _re
-        t = token.strip()
-        t_norm = t.replace(',', '.')
-        m = _re.fullmatch(r'([+-]?\d+(?:\.\d+)?)(?:\s*(mm|steps?))?$', t_norm, flags=_re.I)
-        if not m:
-            raise ValueError(f"Vigane number: “{token}”")
-        val = float(m.group(1))
-        unit = (m.group(2) or '').lower()
+        return parse_num_to_steps(token, self._steps_per_mm())
+
+    def _trajectory_limits(self) -> TrajectoryLimits:
+        """
+        Axis limits + prop tip margin (steps) for validating a trajectory. The
+        centre is the sweep centre the probe actually uses (X centre minus the
+        probe offset), the same one generate_0r_wp builds around.
+        """
+        w = app_globals.window
+        x_min, x_max, y_min, y_max = w._axis_limits_steps(x_margin_mm=0.0, y_margin_mm=0.5)
         spmm = self._steps_per_mm()
-        if unit.startswith('mm') or ('.' in t_norm):
-            return int(round(val * spmm))
-        return int(round(val))
+        radius_mm = (w.prop.value() * 25.4) / 2.0
+        clearance_mm = radius_mm * float(getattr(self.shared_data, "safety_over_prop", 0) or 0) / 100.0
+        return TrajectoryLimits(
+            x_min=x_min, x_max=x_max, y_min=y_min, y_max=y_max,
+            y_base=int(round(w.Y_pos.value() * spmm)),
+            x_center=w._center_steps() + w._offset_towards_zero_steps(),
+            radius=int(round(radius_mm * spmm)),
+            tip_margin=int(round(clearance_mm * spmm)),
+        )
 
     def load_wp_file(self):
         default_dir = self._get_default_wp_dir()
@@ -224,31 +273,96 @@ class MapTrajectory(QWidget):
             self,
             "Laadi trajektoori fail",
             default_dir,
-            "csv(*.csv)"
+            "csv(*.csv);;Kõik failid (*)"
         )
         if not path:
             QMessageBox.information(self, "Tühistatud", "Faili ei laetud.")
             return
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                r = csv.reader(f, delimiter=' ')
-                list_of_x_targets.clear()
-                list_of_y_targets.clear()
-                for row in r:
-                    list_of_x_targets.append(int(row[0]))
-                    list_of_y_targets.append(int(row[1]))
-            # After reading the CSV successfully:
-            QMessageBox.information(self, "Laetud", f"Fail: {path}\nPunkte: {len(list_of_x_targets)}")
-
-            # NEW — mirror lists into MainWindow:
-            app_globals.window.list_of_x_targets = list(list_of_x_targets)
-            app_globals.window.list_of_y_targets = list(list_of_y_targets)
-            app_globals.window.custom_trajectory = len(list_of_x_targets) > 0
-
-            self._set_wp_status("saved")
-            self.modeChanged.emit(app_globals.window.custom_trajectory)
+            spacing_mm = float(self.resample_spacing.value())
+            compiled = compile_trajectory(
+                path,
+                steps_per_mm=self._steps_per_mm(),
+                spacing_steps=spacing_mm * self._steps_per_mm() if spacing_mm > 0 else None,
+                limits=self._trajectory_limits(),
+            )
         except Exception as e:
             QMessageBox.critical(self, "Viga laadimisel", str(e))
+            return
+
+        if compiled.problems:
+            ret = QMessageBox.warning(
+                self, "Trajektoori kontroll",
+                "\n".join(compiled.problems) + "\n\nKas laadida trajektoor siiski?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if ret != QMessageBox.Yes:
+                return
+
+        list_of_x_targets[:] = compiled.xs
+        list_of_y_targets[:] = compiled.ys
+        list_of_y_abs.clear()
+        QMessageBox.information(self, "Laetud", f"Fail: {path}\nPunkte: {len(list_of_x_targets)}")
+
+        # Mirror lists into MainWindow:
+        app_globals.window.list_of_x_targets = list(list_of_x_targets)
+        app_globals.window.list_of_y_targets = list(list_of_y_targets)
+        app_globals.window.custom_trajectory = len(list_of_x_targets) > 0
+
+        self._set_wp_status("saved")
+        self.modeChanged.emit(app_globals.window.custom_trajectory)
+
+    def generate_0r_wp(self):
+        """Build a 0R trajectory from the selected prop configuration file, save it and load it."""
+        w = app_globals.window
+        prop_cfg = (getattr(w, "fname", None) or ("",))[0]
+        if not prop_cfg:
+            prop_folder = Path.home() / "Desktop" / "propellerid"
+            prop_cfg, _ = QFileDialog.getOpenFileName(
+                self, "Otsi propelleri konfiguratsiooni fail", str(prop_folder), "CSV Files (*.csv)")
+            if not prop_cfg:
+                return
+        spmm = self._steps_per_mm()
+        limits = self._trajectory_limits()
+        try:
+            steps = generate_0r_trajectory(
+                prop_cfg,
+                x_center_steps=limits.x_center,
+                steps_per_mm=spmm,
+                hub_offset_mm=float(self.hub_offset.value()),
+                clearance_mm=float(self.clearance.value()),
+                radius_mm=(w.prop.value() * 25.4) / 2.0,
+                r_end_mm=(limits.radius + limits.tip_margin) / spmm + float(self.clearance.value()),
+            )
+        except Exception as e:
+            QMessageBox.critical(self, "Viga genereerimisel", str(e))
+            return
+
+        problems = validate_trajectory(steps, limits)
+        if problems:
+            QMessageBox.critical(self, "Trajektoori kontroll", "\n".join(problems))
+            return
+
+        path = Path(self._get_default_wp_dir()) / f"{Path(prop_cfg).stem}_0R.csv"
+        try:
+            write_trajectory_file(path, steps, header_lines=(
+                f"0R trajectory from {Path(prop_cfg).name}",
+                f"hub_offset_mm={self.hub_offset.value():.1f} clearance_mm={self.clearance.value():.1f} "
+                f"steps_per_mm={spmm:.4f}",
+                "units: steps",
+            ))
+        except Exception as e:
+            QMessageBox.critical(self, "Viga salvestamisel", str(e))
+            return
+
+        list_of_x_targets[:] = steps[:, 0].tolist()
+        list_of_y_targets[:] = steps[:, 1].tolist()
+        list_of_y_abs.clear()
+        w.list_of_x_targets = list(list_of_x_targets)
+        w.list_of_y_targets = list(list_of_y_targets)
+        w.custom_trajectory = True
+        QMessageBox.information(self, "Genereeritud", f"Fail: {path}\nPunkte: {len(list_of_x_targets)}")
+        self._set_wp_status("saved")
+        self.modeChanged.emit(True)
 
     def _get_default_wp_dir(self):
         """Return the Desktop/trajektoorid folder, create if missing."""
@@ -0,0 +1,126 @@
+from pathlib import Path
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QLineEdit, QPushButton, QMessageBox
+)
+import app_globals
+from data.profile_store import ProfileStore
+
+
+class RigProfiles(QWidget):
+    """Save / load named rig profiles and per-prop presets; loading pushes the config to the MCU."""
+
+    def __init__(self, shared_data, store: ProfileStore):
+        super().__init__()
+        self.shared_data = shared_data
+        self.store = store
+        layout = QVBoxLayout(); self.setLayout(layout)
+        self.setWindowTitle("Stendi profiilid")
+
+        layout.addWidget(QLabel("Stendi profiil"))
+        self.profile_combo = QComboBox()
+        self.profile_combo.currentTextChanged.connect(self.refresh_props)
+        layout.addWidget(self.profile_combo)
+
+        self.load_button = QPushButton("Laadi profiil ja saada stendile", self)
+        self.load_button.clicked.connect(self.load_profile)
+        layout.addWidget(self.load_button)
+
+        row = QHBoxLayout()
+        self.profile_name = QLineEdit()
+        self.profile_name.setPlaceholderText("Uue profiili nimi")
+        row.addWidget(self.profile_name)
+        self.save_button = QPushButton("Salvesta praegused seaded", self)
+        self.save_button.clicked.connect(self.save_profile)
+        row.addWidget(self.save_button)
+        layout.addLayout(row)
+
+        layout.addWidget(QLabel("Propelleri eelseadistus"))
+        self.prop_combo = QComboBox()
+        layout.addWidget(self.prop_combo)
+
+        self.apply_prop_button = QPushButton("Rakenda eelseadistus", self)
+        self.apply_prop_button.clicked.connect(self.apply_prop)
+        layout.addWidget(self.apply_prop_button)
+
+        row2 = QHBoxLayout()
+        self.prop_name = QLineEdit()
+        self.prop_name.setPlaceholderText("Propelleri nimi")
+        row2.addWidget(self.prop_name)
+        self.save_prop_button = QPushButton("Salvesta eelseadistus", self)
+        self.save_prop_button.clicked.connect(self.save_prop)
+        row2.addWidget(self.save_prop_button)
+        layout.addLayout(row2)
+
+        self.refresh()
+
+    def refresh(self):
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        self.profile_combo.addItems(self.store.names())
+        if self.store.active:
+            self.profile_combo.setCurrentText(self.store.active)
+        self.profile_combo.blockSignals(False)
+        self.refresh_props(self.profile_combo.currentText())
+
+    def refresh_props(self, name: str):
+        self.prop_combo.clear()
+        if name:
+            self.prop_combo.addItems(self.store.prop_names(name))
+
+    def _save_store(self) -> bool:
+        try:
+            self.store.save()
+            return True
+        except OSError as e:
+            QMessageBox.warning(self, "Salvestamine ebaõnnestus", f"Profiilifaili ei saanud kirjutada:\n{e}")
+            return False
+
+    def load_profile(self):
+        name = self.profile_combo.currentText()
+        if not name:
+            return
+        self.store.apply_rig(name, self.shared_data)
+        self._save_store()
+        app_globals.window.push_profile_to_mcu()
+        self.close()
+
+    def save_profile(self):
+        name = self.profile_name.text().strip() or self.profile_combo.currentText()
+        if not name:
+            QMessageBox.warning(self, "Nimi puudub", "Sisesta profiili nimi.")
+            return
+        self.store.put_rig(name, self.shared_data)
+        self.store.active = name
+        if self._save_store():
+            self.profile_name.clear()
+            self.refresh()
+
+    def apply_prop(self):
+        name = self.profile_combo.currentText()
+        prop = self.prop_combo.currentText()
+        if not name or not prop:
+            return
+        app_globals.window.apply_prop_preset(self.store.prop(name, prop))
+        self.close()
+
+    def save_prop(self):
+        name = self.profile_combo.currentText()
+        prop = self.prop_name.text().strip() or self.prop_combo.currentText()
+        if not name or not prop:
+            QMessageBox.warning(self, "Nimi puudub", "Vali profiil ja sisesta propelleri nimi.")
+            return
+        w = app_globals.window
+        fname = getattr(w, "fname", None)
+        self.store.put_prop(name, prop, {
+            "diameter_in": float(w.prop.value()),
+            "rotation_dir": int(self.shared_data.rotation_dir),
+            "safety_over_prop": float(self.shared_data.safety_over_prop),
+            "x_delta": float(self.shared_data.x_delta),
+            "first_throttle": int(w.first_throttle.value()),
+            "second_throttle": int(w.second_throttle.value()),
+            "prop_file": str(Path(fname[0])) if fname and fname[0] else "",
+        })
+        if self._save_store():
+            self.prop_name.clear()
+            self.refresh_props(name)
+            self.prop_combo.setCurrentText(prop)
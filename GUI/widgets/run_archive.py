@@ -0,0 +1,110 @@
+from PyQt5.QtCore import Qt, QUrl
+from PyQt5.QtGui import QDesktopServices
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QDoubleSpinBox, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QMessageBox
+)
+from data.run_catalog import RunCatalog
+
+COLUMNS = (
+    ("name", "Mõõtmine"), ("status", "Olek"), ("prop_diameter_in", "Propeller (in)"),
+    ("dr_ratio", "D/R"), ("rpm", "RPM"), ("power", "Võimsus (W)"),
+    ("efficiency", "Kasutegur (%)"), ("induced_speed", "Ind. kiirus (m/s)"),
+    ("ct", "Ct"), ("cp", "Cp"),
+)
+
+
+class RunArchive(QWidget):
+    """Search the log archive by prop, D/R and RPM; double-click opens the run folder,
+    "Võrdle valitud" overlays the selected runs on r/R (top row = baseline)."""
+
+    def __init__(self, catalog: RunCatalog):
+        super().__init__()
+        self.catalog = catalog
+        layout = QVBoxLayout(); self.setLayout(layout)
+        self.setWindowTitle("Mõõtmiste arhiiv")
+        self.resize(900, 500)
+
+        row = QHBoxLayout()
+        row.addWidget(QLabel("Propeller (in)"))
+        self.diameter = QDoubleSpinBox(); self.diameter.setRange(0, 100); self.diameter.setDecimals(1)
+        self.diameter.setSpecialValueText("kõik")
+        row.addWidget(self.diameter)
+        row.addWidget(QLabel("D/R"))
+        self.dr = QDoubleSpinBox(); self.dr.setRange(-0.01, 5); self.dr.setDecimals(2); self.dr.setSingleStep(0.1)
+        self.dr.setValue(-0.01); self.dr.setSpecialValueText("kõik")
+        row.addWidget(self.dr)
+        row.addWidget(QLabel("RPM alates"))
+        self.rpm_min = QDoubleSpinBox(); self.rpm_min.setRange(0, 100000); self.rpm_min.setDecimals(0)
+        self.rpm_min.setSingleStep(500); self.rpm_min.setSpecialValueText("kõik")
+        row.addWidget(self.rpm_min)
+        self.search_button = QPushButton("Otsi", self)
+        self.search_button.clicked.connect(self.search)
+        row.addWidget(self.search_button)
+        self.update_button = QPushButton("Uuenda arhiivi", self)
+        self.update_button.clicked.connect(self.rescan)
+        row.addWidget(self.update_button)
+        self.compare_button = QPushButton("Võrdle valitud", self)
+        self.compare_button.clicked.connect(self.compare_selected)
+        row.addWidget(self.compare_button)
+        layout.addLayout(row)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for _, title in COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.table.setSortingEnabled(True)
+        self.table.cellDoubleClicked.connect(self.open_run)
+        layout.addWidget(self.table)
+
+        self.status = QLabel("")
+        layout.addWidget(self.status)
+        self._rows = []
+        self.rescan()
+
+    def rescan(self):
+        stats = self.catalog.update()
+        print("[catalog]", stats)
+        self.search()
+
+    def search(self):
+        self._rows = self.catalog.query(
+            diameter=self.diameter.value() or None,
+            dr=self.dr.value() if self.dr.value() >= 0 else None,
+            rpm_min=self.rpm_min.value() or None,
+        )
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(self._rows))
+        for i, r in enumerate(self._rows):
+            for j, (col, _) in enumerate(COLUMNS):
+                v = r[col]
+                item = QTableWidgetItem()
+                if isinstance(v, float):
+                    item.setData(Qt.DisplayRole, round(v, 7) if col in ("ct", "cp") else round(v, 2))
+                else:
+                    item.setText("" if v is None else str(v))
+                item.setData(Qt.UserRole, r["run_dir"])
+                self.table.setItem(i, j, item)
+        self.table.setSortingEnabled(True)
+        self.status.setText(f"Leitud {len(self._rows)} mõõtmist (kokku {self.catalog.count()})")
+
+    def open_run(self, row: int, _col: int):
+        item = self.table.item(row, 0)
+        if item is not None:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(item.data(Qt.UserRole)))
+
+    def compare_selected(self):
+        rows = sorted({i.row() for i in self.table.selectedIndexes()})
+        paths = [self.table.item(r, 0).data(Qt.UserRole) for r in rows]
+        if len(paths) < 2:
+            QMessageBox.information(self, "Võrdlus", "Vali tabelist vähemalt kaks mõõtmist.")
+            return
+        from data.run_compare import export_comparison
+        try:
+            _, _, png_path = export_comparison(paths)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Võrdlus ebaõnnestus", str(e))
+            return
+        QDesktopServices.openUrl(QUrl.fromLocalFile(str(png_path)))
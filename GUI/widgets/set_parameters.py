@@ -165,6 +165,28 @@ class SetParameters(QWidget):
             app_globals.window.label7.setEnabled(False)
             self.probe_offset.setEnabled(False)
         
+    def refresh_from_shared(self):
+        """Show the values now in shared_data (a rig profile was applied)."""
+        sd = self.shared_data
+        for box, value in ((self.rho, sd.rho),
+                           (self.kin_visc, sd.kin_visc),
+                           (self.probe_offset, getattr(sd, "probe_offset", 0.0)),
+                           (self.first_trq_arm_length, sd.first_trq_arm_length),
+                           (self.first_trq_lc_factor, sd.first_trq_cal_val),
+                           (self.first_thr_arm_length, sd.first_thr_arm_length),
+                           (self.first_thr_lc_factor, sd.first_thr_cal_val),
+                           (self.second_trq_arm_length, sd.second_trq_arm_length),
+                           (self.second_trq_lc_factor, sd.second_trq_cal_val),
+                           (self.second_thr_arm_length, sd.second_thr_arm_length),
+                           (self.second_thr_lc_factor, sd.second_thr_cal_val)):
+            box.blockSignals(True)
+            box.setValue(value)
+            box.blockSignals(False)
+        tandem = int(sd.no_of_props) == 2
+        self.tandem.setChecked(tandem)
+        self.probe_offset.setEnabled(tandem)
+        self.confirm_button.setStyleSheet("background-color: None; color: None;")
+
     def enable_confirm_button(self):
         self.confirm_button.setEnabled(True)
         self.confirm_button.setStyleSheet("background-color: orange; color: black;")
@@ -178,15 +200,19 @@ class SetParameters(QWidget):
             self.shared_data.first_thr_arm_length = self.first_thr_arm_length.value()
             self.shared_data.second_trq_arm_length = self.second_trq_arm_length.value()
             self.shared_data.second_thr_arm_length = self.second_thr_arm_length.value()
+            self.shared_data.first_trq_cal_val = self.first_trq_lc_factor.value()
+            self.shared_data.first_thr_cal_val = self.first_thr_lc_factor.value()
+            self.shared_data.second_trq_cal_val = self.second_trq_lc_factor.value()
+            self.shared_data.second_thr_cal_val = self.second_thr_lc_factor.value()
             init_data = 'init|%.2f|%.2f|%.2f|%.2f|%.2f|%.2f|%.2f|%.2f|%.0f' % (
             self.shared_data.first_trq_arm_length,
             self.shared_data.first_thr_arm_length,
-            self.first_trq_lc_factor.value(),
-            self.first_thr_lc_factor.value(),
+            self.shared_data.first_trq_cal_val,
+            self.shared_data.first_thr_cal_val,
             self.shared_data.second_trq_arm_length,
             self.shared_data.second_thr_arm_length,
-            self.second_trq_lc_factor.value(),
-            self.second_thr_lc_factor.value(),
+            self.shared_data.second_trq_cal_val,
+            self.shared_data.second_thr_cal_val,
             self.shared_data.no_of_props
             )
             self.sendData.emit(init_data)
@@ -0,0 +1,203 @@
+# workers/acquisition_process.py
+import multiprocessing as mp
+import time
+from typing import Optional
+
+import serial
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from utils.clock_sync import ClockSync
+from utils.protocol import Measurements, parse_line
+from utils.shm_ring import DEFAULT_CAPACITY, FrameRing
+
+READ_TIMEOUT_S = 0.01      # child: bound on command latency while the line is quiet
+POLL_MS = 10               # GUI: ring / pipe drain interval
+JOIN_TIMEOUT_S = 2.0
+CLOCK_REPORT_FRAMES = 250  # child: frames between ClockSync summaries to the GUI
+
+
+def acquire(port: str, baudrate: int, ring_name: str, conn, stop_evt, tick_hz: float = 1000.0):
+    """
+    Child process main: owns the serial port. 'Measurements:' lines are decoded
+    here and go into the shared-memory ring, stamped with time.monotonic_ns() of
+    the read and the MCU tick aligned to it (ClockSync; the fit lives as long as
+    the connection, i.e. this process). Every other line goes to the GUI as
+    ("line", text, t_ns) over conn, the clock fit every CLOCK_REPORT_FRAMES as
+    ("clock", ClockSync.summary()). Commands arrive as ("write", bytes). A port
+    error ends the process after sending ("lost", reason).
+    """
+    ring = FrameRing(ring_name, create=False)
+    clock = ClockSync(tick_hz)
+    try:
+        ser = serial.Serial(port, baudrate, timeout=READ_TIMEOUT_S, exclusive=True)
+    except (serial.SerialException, OSError) as e:
+        conn.send(("lost", str(e)))
+        ring.close()
+        return
+
+    buf = bytearray()
+    try:
+        while not stop_evt.is_set():
+            while conn.poll():
+                kind, payload = conn.recv()
+                if kind == "write":
+                    ser.write(payload)
+            n = int(ser.in_waiting or 0)
+            data = ser.read(n if n > 0 else 1)
+            if not data:
+                continue
+            t_ns = time.monotonic_ns()
+            buf.extend(data)
+            while True:
+                i = buf.find(b"\n")
+                if i < 0:
+                    break
+                text = buf[:i].rstrip(b"\r").decode("utf-8", errors="replace").strip()
+                del buf[:i + 1]
+                if not text:
+                    continue
+                msg = parse_line(text)
+                if type(msg) is Measurements:
+                    t_mcu_ns = clock.add(msg.tick, t_ns) if msg.tick == msg.tick else 0
+                    ring.push(msg, t_ns, t_mcu_ns)
+                    if t_mcu_ns and clock.samples % CLOCK_REPORT_FRAMES == 0:
+                        conn.send(("clock", clock.summary()))
+                else:
+                    conn.send(("line", text, t_ns))
+    except (serial.SerialException, OSError) as e:
+        conn.send(("lost", str(e)))
+    except (EOFError, BrokenPipeError):
+        pass                                    # GUI went away
+    finally:
+        try:
+            ser.close()
+        except Exception:
+            pass
+        ring.close()
+
+
+class AcquisitionTransport(QObject):
+    """
+    Process alternative to SerialReader (config.serial_transport = "process").
+
+    A spawned child process (acquire) owns the port, so a long matplotlib draw,
+    savefig or post-processing on the GUI side cannot stall the serial reads:
+    frames pile up in the shared-memory ring (utils/shm_ring.py) and are taken
+    out on the next drain. The GUI side polls every POLL_MS:
+      - frames(list) carries the new ring records as NumPy views (no copy);
+        a measuring worker reads the ring itself through its own mapping
+        (ring_name, MeasuringWorker ring_name=)
+      - clock holds the child's latest ClockSync.summary() (None without a tick)
+      - serial_readout(str) and line_stamped(str, t_ns) per non-frame line,
+        like SerialReader, so MainWindow.handleData and the CommandDispatcher
+        stay unchanged; the frames carry their stamp in the ring (t_ns)
+      - write() hands commands to the child in order
+    The caller must close its own handle on the port first (it is opened
+    exclusively by the child).
+    """
+
+    serial_readout = pyqtSignal(str)
+    line_stamped = pyqtSignal(str, object)    # text, time.monotonic_ns() of the read in the child
+    frames = pyqtSignal(list)                 # [structured ndarray views] of utils.shm_ring.RECORD_DTYPE
+    connection_lost = pyqtSignal(str)
+
+    def __init__(self, port: str, baudrate: int = 115200, capacity: int = DEFAULT_CAPACITY,
+                 tick_hz: float = 1000.0, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.port = port
+        self.baudrate = int(baudrate)
+        self.capacity = int(capacity)
+        self.tick_hz = float(tick_hz)
+        self.running = False
+        self.latest_data = 0
+        self.dropped = 0
+        self.clock = None
+        self._ring: Optional[FrameRing] = None
+        self._reader = None
+        self._conn = None
+        self._stop_evt = None
+        self._proc = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(POLL_MS)
+        self._timer.timeout.connect(self._drain)
+
+    def start(self):
+        if self.running:
+            return
+        ctx = mp.get_context("spawn")           # never fork a process with a Qt GUI in it
+        self._ring = FrameRing(capacity=self.capacity)
+        self._reader = self._ring.reader()
+        self._conn, child_conn = ctx.Pipe()
+        self._stop_evt = ctx.Event()
+        self._proc = ctx.Process(target=acquire, name="Acquisition", daemon=True,
+                                 args=(self.port, self.baudrate, self._ring.name, child_conn, self._stop_evt,
+                                       self.tick_hz))
+        self._proc.start()
+        child_conn.close()
+        self.clock = None
+        self.running = True
+        self._timer.start()
+
+    def stop(self):
+        self.running = False
+        self._timer.stop()
+        if self._stop_evt is not None:
+            self._stop_evt.set()
+        if self._proc is not None:
+            self._proc.join(JOIN_TIMEOUT_S)
+            if self._proc.is_alive():
+                self._proc.terminate()
+                self._proc.join(JOIN_TIMEOUT_S)
+            self._proc = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._ring is not None:
+            self._reader = None
+            self._ring.close()
+            self._ring = None
+
+    @property
+    def ring_name(self) -> Optional[str]:
+        return self._ring.name if self._ring is not None else None
+
+    def write(self, payload: bytes):
+        """Ordered write through the child; raises SerialException when not running."""
+        if not self.running or self._conn is None:
+            raise serial.SerialException("acquisition process is not running")
+        try:
+            self._conn.send(("write", bytes(payload)))
+        except (OSError, BrokenPipeError) as e:
+            raise serial.SerialException(f"acquisition process is gone: {e}")
+
+    def _drain(self):
+        lost = None
+        try:
+            while self._conn is not None and self._conn.poll():
+                kind, text, *rest = self._conn.recv()
+                if kind == "lost":
+                    lost = text
+                    break
+                if kind == "clock":
+                    self.clock = text
+                    continue
+                self.latest_data = text
+                self.serial_readout.emit(text)
+                self.line_stamped.emit(text, rest[0] if rest else time.monotonic_ns())
+        except (EOFError, OSError) as e:
+            lost = lost or f"acquisition process pipe closed: {e}"
+
+        if self._reader is not None:
+            views, dropped = self._reader.read()
+            if dropped:
+                self.dropped += dropped
+                print(f"[acq] ring overrun: {dropped} frames lost")
+            if views:
+                self.frames.emit(views)
+
+        if lost is None and self._proc is not None and not self._proc.is_alive():
+            lost = f"acquisition process exited ({self._proc.exitcode})"
+        if lost is not None and self.running:
+            self.running = False
+            self._timer.stop()
+            self.connection_lost.emit(lost)
@@ -0,0 +1,240 @@
+import asyncio
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import serial
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+def has_selectable_fd(controller) -> bool:
+    """
+    True when the port can be driven by loop.add_reader(). pyserial ports always
+    have a fileno attribute (inherited from io.RawIOBase), so it has to be called:
+    Windows COM ports and loop:// style ports raise or have no usable fd.
+    """
+    if os.name != "posix":
+        return False
+    try:
+        return int(controller.fileno()) >= 0
+    except Exception:
+        return False
+
+
+class AsyncSerialTransport(QObject):
+    """
+    asyncio alternative to SerialReader (config.serial_transport = "asyncio").
+
+    An event loop runs in its own thread and owns the port:
+      - reads are driven by loop.add_reader() on the port fd, so the thread
+        sleeps in select/epoll until bytes arrive (no 50 ms read timeout poll)
+      - writes from any thread are queued with write() and go out in order
+        from a single writer coroutine
+      - request() is a coroutine that sends a command and awaits its reply line
+      - on a port error the loop closes the port, emits connection_lost and
+        tries to reopen the same device path with backoff
+    Emits serial_readout(str) and line_stamped(str, t_ns) per line, like
+    SerialReader, so MainWindow.handleData connects unchanged (Qt queues the
+    signal onto the GUI thread). If the port cannot be attached the loop ends
+    and `unavailable` is emitted, so the owner can fall back to SerialReader.
+    """
+
+    serial_readout = pyqtSignal(str)
+    line_stamped = pyqtSignal(str, object)    # text, time.monotonic_ns() of the read
+    connection_lost = pyqtSignal(str)
+    reconnected = pyqtSignal(object)          # new serial.Serial instance
+    unavailable = pyqtSignal(str)             # port has no selectable fd: transport ended
+
+    def __init__(self, controller, reconnect: bool = True,
+                 reconnect_backoff_s: Tuple[float, ...] = (0.5, 1.0, 2.0, 5.0),
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.controller = controller
+        self.port = getattr(controller, "port", None)
+        self.baudrate = getattr(controller, "baudrate", 115200)
+        self.reconnect = reconnect
+        self.reconnect_backoff_s = tuple(reconnect_backoff_s) or (1.0,)
+        self.latest_data = 0
+        self.running = False
+        self.buf = bytearray()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._write_q: Optional[asyncio.Queue] = None
+        self._lost: Optional[asyncio.Future] = None
+        self._waiters: List[Tuple[str, asyncio.Future]] = []
+
+    # ---------- Public API (any thread) ----------
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._thread_main, name="AsyncSerial", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+        loop = self._loop
+        if loop and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._shutdown)
+            except RuntimeError:
+                pass
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+
+    def write(self, payload: bytes):
+        """Thread-safe, ordered write; raises SerialException when not running."""
+        loop = self._loop
+        if not self.running or loop is None or loop.is_closed():
+            raise serial.SerialException("async serial transport is not running")
+        loop.call_soon_threadsafe(self._write_q.put_nowait, bytes(payload))
+
+    def submit(self, coro):
+        """Schedule a coroutine on the transport loop; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def request(self, cmd: str, reply_prefix: str, timeout_s: float = 3.0) -> str:
+        """Send cmd and await the first line starting with reply_prefix (case-insensitive)."""
+        fut = self._loop.create_future()
+        waiter = (reply_prefix.lower(), fut)
+        self._waiters.append(waiter)
+        try:
+            await self._write_q.put((cmd + '\n').encode('utf-8'))
+            return await asyncio.wait_for(fut, timeout_s)
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    # ---------- loop thread ----------
+
+    def _thread_main(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        # queue first: write() treats a published _loop as ready to take writes
+        self._write_q = asyncio.Queue()
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._main())
+        except Exception as e:
+            print("async serial loop error:", e)
+        finally:
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            except Exception:
+                pass
+            loop.close()
+
+    async def _main(self):
+        writer = asyncio.ensure_future(self._writer())
+        try:
+            while self.running:
+                self._lost = self._loop.create_future()
+                if not self._attach():
+                    # e.g. Windows COM ports have no selectable fd; use SerialReader there
+                    print("async serial: port has no selectable fd, transport not started")
+                    self.unavailable.emit(str(self.port))
+                    break
+                reason = await self._lost
+                self._detach()
+                if not self.running:
+                    break
+                print(f"Serial connection lost: {reason}")
+                self.connection_lost.emit(str(reason))
+                if not self.reconnect or not await self._reopen():
+                    break
+        finally:
+            self.running = False
+            writer.cancel()
+            self._detach()
+
+    def _attach(self) -> bool:
+        try:
+            fd = self.controller.fileno()
+            self.controller.timeout = 0              # non-blocking reads; add_reader does the waiting
+        except Exception:
+            return False
+        self._loop.add_reader(fd, self._on_readable)
+        return True
+
+    def _detach(self):
+        try:
+            self._loop.remove_reader(self.controller.fileno())
+        except Exception:
+            pass
+
+    def _on_readable(self):
+        try:
+            n = int(self.controller.in_waiting or 0)
+            data = self.controller.read(n if n > 0 else 1)
+            if not data:
+                # readable but empty: device went away (pyserial reports it this way on POSIX)
+                raise serial.SerialException("device reports readiness to read but returned no data")
+        except (serial.SerialException, OSError) as e:
+            self._signal_lost(e)
+            return
+        t_ns = time.monotonic_ns()
+        self.buf.extend(data)
+        while True:
+            i = self.buf.find(b"\n")
+            if i < 0:
+                break
+            raw_line = self.buf[:i].rstrip(b"\r")
+            del self.buf[:i + 1]
+            text = raw_line.decode("utf-8", errors="replace").strip()
+            self.latest_data = text
+            self._resolve_waiters(text)
+            self.serial_readout.emit(text)
+            self.line_stamped.emit(text, t_ns)
+
+    def _resolve_waiters(self, text: str):
+        if not self._waiters:
+            return
+        slow = text.lower()
+        for prefix, fut in list(self._waiters):
+            if not fut.done() and slow.startswith(prefix):
+                fut.set_result(text)
+
+    async def _writer(self):
+        while True:
+            payload = await self._write_q.get()
+            if self._lost is not None and self._lost.done():
+                print("Dropping write while disconnected:", payload)
+                continue
+            try:
+                self.controller.write(payload)
+            except (serial.SerialException, OSError) as e:
+                self._signal_lost(e)
+
+    def _signal_lost(self, err):
+        if self._lost is not None and not self._lost.done():
+            self._lost.set_result(err)
+
+    async def _reopen(self) -> bool:
+        try:
+            self.controller.close()
+        except Exception:
+            pass
+        self.buf.clear()
+        attempt = 0
+        while self.running and self.port:
+            await asyncio.sleep(self.reconnect_backoff_s[min(attempt, len(self.reconnect_backoff_s) - 1)])
+            attempt += 1
+            try:
+                self.controller = serial.Serial(self.port, self.baudrate, timeout=0, exclusive=True)
+            except (serial.SerialException, OSError) as e:
+                print(f"Reconnect attempt {attempt} on {self.port} failed: {e}")
+                continue
+            print(f"Reconnected to {self.port}")
+            self.reconnected.emit(self.controller)
+            return True
+        return False
+
+    def _shutdown(self):
+        self.running = False
+        self._signal_lost("stopped")
+        for _prefix, fut in self._waiters:
+            if not fut.done():
+                fut.cancel()
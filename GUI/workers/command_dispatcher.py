@@ -0,0 +1,248 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional, Tuple
+
+import serial
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+@dataclass(frozen=True)
+class AckRule:
+    """How the MCU acknowledges a command (all matching is on the lower-cased reply line)."""
+    prefix: str                       # command prefix as sent, e.g. 'j|'
+    ok: Tuple[str, ...]               # reply prefixes that complete the command
+    fail: Tuple[str, ...] = ()        # reply prefixes that complete it with an error
+    timeout_ms: int = 3000
+    retries: int = 0
+    exclusive: bool = False           # MCU blocks while executing (no pipelining around it)
+
+
+# Replies as printed by PropStandController.ino. Commands without a rule
+# (ON, OFF, BeaconON/OFF, l|, m|, ...) print nothing and are fire-and-forget.
+ACK_RULES: Tuple[AckRule, ...] = (
+    AckRule('j|',              ('jog done',), ('over axis limit', 'limit switch'), 60_000, 0, True),
+    AckRule('home',            ('homing done',), ('limit switch',), 120_000, 0, True),
+    AckRule('center',          ('centering done',), ('limit switch',), 60_000, 0, True),
+    AckRule('tare',            ('tare done',), (), 15_000, 1),
+    AckRule('stop',            ('ok|stopping',), (), 2_000, 1),
+    AckRule('startMotor|',     ('ok|first=',), ('err|',), 2_000, 1),
+    AckRule('init|',           ('ready!',), ('err|init',), 10_000, 1),
+    AckRule('trimAoA',         ('trimaoa set',), (), 2_000, 1),
+    AckRule('AoAlim',          ('limaoa set',), (), 2_000, 1),
+    AckRule('trimAoSS',        ('trimaoss|ok|',), ('trimaoss|err',), 2_000, 1),
+    AckRule('moveAoSSTubeAbs|', ('moveaosstubeabs|ok|',), ('moveaosstubeabs|err',), 5_000, 0),
+    AckRule('moveAoSSServoAbs|', ('moveaossservoabs|ok|',), ('moveaossservoabs|err',), 5_000, 0),
+    AckRule('moveAoSS|',       ('moveaoss|ok|',), ('moveaoss|err',), 5_000, 0),
+    AckRule('setAoSSRatio|',   ('setaossratio|ok|',), ('setaossratio|err',), 2_000, 1),
+    AckRule('setAoSSLimits|',  ('setaosslimits|ok|',), ('setaosslimits|err',), 2_000, 1),
+    AckRule('zeroAoSS',        ('zeroaoss|ok|',), (), 2_000, 1),
+    AckRule('enableAoSS',      ('aossenabled',), (), 2_000, 1),
+    AckRule('disableAoSS',     ('aossdisabled',), (), 2_000, 1),
+    AckRule('readAoA',         ('readaoa|',), (), 2_000, 2),
+    AckRule('readAoSS',        ('readaoss|',), (), 2_000, 2),
+    AckRule('calFirst',        ('calval:',), (), 30_000, 0),
+    AckRule('calSecond',       ('calval:',), (), 30_000, 0),
+    AckRule('pitotLive',       ('pitotlive',), (), 2_000, 1),
+    AckRule('setRamp|',        ('ok|rampms=',), (), 2_000, 1),
+)
+
+
+# Written at once, ahead of anything queued or in flight: an exclusive jog /
+# home the MCU silently refused must not hold back stopping the motors.
+SAFETY_COMMANDS = frozenset(('stop', 'OFF', 'BeaconOFF'))
+
+
+def ack_rule_for(cmd: str) -> Optional[AckRule]:
+    for rule in ACK_RULES:
+        if cmd.startswith(rule.prefix):
+            return rule
+    return None
+
+
+@dataclass
+class _Pending:
+    cmd: str
+    rule: Optional[AckRule]
+    on_ack: Optional[Callable[[str], None]] = None
+    on_fail: Optional[Callable[[str], None]] = None
+    attempts: int = 0
+    deadline: float = 0.0
+    t_sent: float = 0.0
+
+
+class CommandDispatcher(QObject):
+    """
+    Serial command queue for MainWindow.sendData:
+      - every command is framed with '\\n' so the MCU's readStringUntil('\\n')
+        returns immediately instead of waiting for its stream timeout
+      - commands with an AckRule are tracked until their reply line arrives
+        (on_line), time out, and are retried up to rule.retries times
+      - up to max_in_flight acknowledged commands (and max_in_flight_bytes of
+        unread command text, the MCU's RX buffer is small) may be outstanding;
+        exclusive commands (jog/home/center block the MCU) wait for everything
+        in flight and hold the queue until they complete
+      - queue order is preserved: nothing overtakes an earlier command, except
+        SAFETY_COMMANDS, which are written immediately
+      - the MCU prints nothing when it refuses an exclusive command (not homed,
+        emergency), so `guard(cmd)` is asked right before one is sent; a reason
+        string fails it at once instead of holding the queue until its timeout
+    Lives on the GUI thread; the write callable does the actual port I/O.
+    """
+
+    acked = pyqtSignal(str, str)      # (command, reply line)
+    failed = pyqtSignal(str, str)     # (command, reason)
+
+    def __init__(self, write: Callable[[bytes], None], max_in_flight: int = 4,
+                 max_in_flight_bytes: int = 48,
+                 guard: Optional[Callable[[str], Optional[str]]] = None,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._write = write
+        self._guard = guard
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.max_in_flight_bytes = max(1, int(max_in_flight_bytes))
+        self._queue: Deque[_Pending] = deque()
+        self._in_flight: List[_Pending] = []
+        self._timer = QTimer(self)
+        self._timer.setInterval(50)
+        self._timer.timeout.connect(self._check_timeouts)
+
+    # ---------- Public API ----------
+
+    def send(self, cmd: str, on_ack: Optional[Callable[[str], None]] = None,
+             on_fail: Optional[Callable[[str], None]] = None):
+        """Queue one command; callbacks fire on its reply (or failure / timeout)."""
+        if not cmd:
+            # Old 'keep serial alive' nudges; framing makes them unnecessary
+            return
+        p = _Pending(cmd, ack_rule_for(cmd), on_ack, on_fail)
+        if cmd in SAFETY_COMMANDS:
+            self._start(p)
+            return
+        self._queue.append(p)
+        self._pump()
+
+    def send_sequence(self, cmds, on_done: Optional[Callable[[], None]] = None,
+                      on_fail: Optional[Callable[[str], None]] = None):
+        """Send commands strictly one after another (each waits for the previous
+        reply); on_done fires after the last one completes, on_fail stops the chain."""
+        cmds = [c for c in cmds if c]
+        if not cmds:
+            if on_done:
+                on_done()
+            return
+
+        def _next(_line=""):
+            if not cmds:
+                if on_done:
+                    on_done()
+                return
+            self.send(cmds.pop(0), on_ack=_next, on_fail=on_fail)
+
+        _next()
+
+    def on_line(self, line: str):
+        """Feed every received line here (MainWindow.handleData)."""
+        if not self._in_flight:
+            return
+        slow = line.strip().lower()
+        for p in self._in_flight:
+            if slow.startswith(p.rule.ok):
+                self._complete(p, True, line)
+                return
+            if p.rule.fail and slow.startswith(p.rule.fail):
+                self._complete(p, False, line)
+                return
+
+    def clear(self, reason: str = "cleared"):
+        """Drop everything queued or in flight (emergency / disconnect)."""
+        pending = list(self._in_flight) + list(self._queue)
+        self._in_flight.clear()
+        self._queue.clear()
+        self._timer.stop()
+        for p in pending:
+            self._notify_fail(p, reason)
+
+    def busy(self) -> bool:
+        return bool(self._queue or self._in_flight)
+
+    # ---------- internals ----------
+
+    def _in_flight_bytes(self) -> int:
+        return sum(len(p.cmd) + 1 for p in self._in_flight)
+
+    def _pump(self):
+        while self._queue:
+            if any(p.rule.exclusive for p in self._in_flight):
+                return
+            p = self._queue[0]
+            if p.rule is not None:
+                if p.rule.exclusive and self._guard is not None:
+                    reason = self._guard(p.cmd)
+                    if reason:
+                        self._queue.popleft()
+                        self._notify_fail(p, reason)
+                        continue
+                if p.rule.exclusive and self._in_flight:
+                    return
+                if len(self._in_flight) >= self.max_in_flight:
+                    return
+                if self._in_flight and self._in_flight_bytes() + len(p.cmd) + 1 > self.max_in_flight_bytes:
+                    return
+            self._queue.popleft()
+            self._start(p)
+
+    def _start(self, p: _Pending):
+        if not self._transmit(p):
+            return
+        if p.rule is not None:
+            self._in_flight.append(p)
+            if not self._timer.isActive():
+                self._timer.start()
+        elif p.on_ack:
+            p.on_ack("")      # fire-and-forget: done once written
+
+    def _transmit(self, p: _Pending) -> bool:
+        try:
+            self._write((p.cmd + '\n').encode('utf-8'))
+            print(p.cmd)
+        except (serial.SerialException, OSError) as e:
+            print(f"Error sending data: {e}")
+            self._notify_fail(p, f"write error: {e}")
+            return False
+        p.attempts += 1
+        p.t_sent = time.monotonic()
+        if p.rule is not None:
+            p.deadline = p.t_sent + p.rule.timeout_ms / 1000.0
+        return True
+
+    def _complete(self, p: _Pending, ok: bool, line: str):
+        self._in_flight.remove(p)
+        if not self._in_flight:
+            self._timer.stop()
+        if ok:
+            self.acked.emit(p.cmd, line)
+            if p.on_ack:
+                p.on_ack(line)
+        else:
+            self._notify_fail(p, line)
+        self._pump()
+
+    def _notify_fail(self, p: _Pending, reason: str):
+        print(f"Command '{p.cmd}' failed: {reason}")
+        self.failed.emit(p.cmd, reason)
+        if p.on_fail:
+            p.on_fail(reason)
+
+    def _check_timeouts(self):
+        now = time.monotonic()
+        for p in [p for p in self._in_flight if now >= p.deadline]:
+            if p.attempts <= p.rule.retries:
+                print(f"Command '{p.cmd}' timed out, retry {p.attempts}/{p.rule.retries}")
+                if not self._transmit(p):
+                    self._in_flight.remove(p)
+            else:
+                self._complete(p, False, "timeout")
+        if not self._in_flight:
+            self._timer.stop()
@@ -0,0 +1,149 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import serial
+import serial.tools.list_ports
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+# Configuration commands replayed after a reconnect, in this order
+# (the MCU resets when the USB-CDC port is reopened and forgets them).
+# Load cell cal factors / arm lengths changed after init| (calibration windows)
+CAL_PREFIXES: Tuple[str, ...] = (
+    'setFirstTrqCalVal|', 'setFirstThrCalVal|', 'setSecondTrqCalVal|', 'setSecondThrCalVal|',
+    'setFirstTrqArmLength|', 'setFirstThrArmLength|', 'setSecondTrqArmLength|', 'setSecondThrArmLength|',
+)
+REPLAY_PREFIXES: Tuple[str, ...] = ('init|',) + CAL_PREFIXES + (
+    'l|', 'trimAoA', 'AoAlim', 'trimAoSS',
+    'setAoSSRatio|', 'setAoSSLimits|', 'enableAoSS', 'disableAoSS', 'setRamp|',
+)
+# Commands that overwrite each other's state share one replay slot
+_REPLAY_SLOT = {'disableAoSS': 'enableAoSS'}
+# A new init| carries all cal factors and arm lengths: earlier setters are stale
+_SUPERSEDES = {'init|': CAL_PREFIXES}
+
+
+@dataclass(frozen=True)
+class PortIdentity:
+    """USB identity of the stand; survives /dev/ttyACM0 -> ttyACM1 renumbering."""
+    device: str
+    vid: Optional[int] = None
+    pid: Optional[int] = None
+    serial_number: Optional[str] = None
+    location: Optional[str] = None
+
+    def matches(self, info) -> bool:
+        if self.vid is None or self.pid is None:
+            return info.device == self.device
+        if info.vid != self.vid or info.pid != self.pid:
+            return False
+        if self.serial_number:
+            return info.serial_number == self.serial_number
+        # no serial number (clone boards): prefer same USB location, then same path
+        if self.location and info.location:
+            return info.location == self.location
+        return info.device == self.device
+
+
+def port_identity(device: str) -> PortIdentity:
+    for info in serial.tools.list_ports.comports():
+        if info.device == device:
+            return PortIdentity(device, info.vid, info.pid, info.serial_number, info.location)
+    return PortIdentity(device)
+
+
+def find_port(identity: PortIdentity) -> Optional[str]:
+    for info in serial.tools.list_ports.comports():
+        if identity.matches(info):
+            return info.device
+    return None
+
+
+class ConnectionManager(QObject):
+    """
+    Keeps the MCU link alive across USB dropouts:
+      - remembers the identity of the connected port and the last configuration
+        commands sent (init|, cal factors / arm lengths, l|, AoA/AoSS setup) - MainWindow.sendData calls remember()
+      - on link_lost() it polls for the same device (VID/PID/serial number) with
+        backoff and reopens it, emitting reconnected(serial.Serial)
+      - replay_commands() lists the configuration to resend once the reader is up
+    Lives on the GUI thread.
+    """
+
+    disconnected = pyqtSignal(str)      # reason
+    reconnected = pyqtSignal(object)    # new serial.Serial
+
+    def __init__(self, baudrate: int = 115200,
+                 backoff_ms: Tuple[int, ...] = (500, 1000, 2000, 3000, 5000),
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.baudrate = int(baudrate)
+        self.backoff_ms = tuple(backoff_ms) or (1000,)
+        self.identity: Optional[PortIdentity] = None
+        self._config: Dict[str, str] = {}
+        self._attempt = 0
+        self._lost = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._try_reconnect)
+
+    # ---------- Public API ----------
+
+    def attach(self, device: str):
+        """Call after a successful manual connect."""
+        self.identity = port_identity(device)
+        self._lost = False
+        self._timer.stop()
+        print(f"[conn] attached to {self.identity}")
+
+    def detach(self):
+        self.identity = None
+        self._lost = False
+        self._timer.stop()
+
+    def is_reconnecting(self) -> bool:
+        return self._lost
+
+    def remember(self, cmd: str):
+        for prefix in REPLAY_PREFIXES:
+            if cmd.startswith(prefix):
+                slot = _REPLAY_SLOT.get(prefix, prefix)
+                for old in _SUPERSEDES.get(slot, ()):
+                    self._config.pop(old, None)
+                self._config[slot] = cmd
+                return
+
+    def replay_commands(self) -> List[str]:
+        order = {p: i for i, p in enumerate(REPLAY_PREFIXES)}
+        return [cmd for _slot, cmd in sorted(self._config.items(), key=lambda kv: order[kv[0]])]
+
+    def link_lost(self, reason: str = ""):
+        if self._lost or self.identity is None:
+            return
+        self._lost = True
+        self._attempt = 0
+        print(f"[conn] link lost ({reason}); waiting for {self.identity.device}")
+        self.disconnected.emit(reason)
+        self._timer.start(self.backoff_ms[0])
+
+    # ---------- internals ----------
+
+    def _try_reconnect(self):
+        if not self._lost or self.identity is None:
+            return
+        self._attempt += 1
+        device = find_port(self.identity)
+        if device:
+            try:
+                controller = serial.Serial(device, self.baudrate, timeout=0.1, exclusive=True)
+            except (serial.SerialException, OSError) as e:
+                print(f"[conn] reopen {device} failed: {e}")
+            else:
+                self._lost = False
+                if device != self.identity.device:
+                    print(f"[conn] device renumbered {self.identity.device} -> {device}")
+                    self.identity = port_identity(device)
+                print(f"[conn] reconnected on {device} after {self._attempt} attempt(s)")
+                self.reconnected.emit(controller)
+                return
+        self._timer.start(self.backoff_ms[min(self._attempt, len(self.backoff_ms) - 1)])
@@ -12,8 +12,40 @@ from typing import Iterable, List, Optional, Tuple
 
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot, QTimer
 
+from data.frame_log import FrameLog, frame_log_path
+from data.lag_compensation import LagCompensator
+from utils.frame import Frame, FrameSum
+from utils.shm_ring import FrameRing, iter_records
+from workers.run_context import RunContext
+
 MEAS_PREFIX = "Measurements:"  # exact prefix printed by the MCU
 
+# Persistent series: re-tare between sweeps only when the thrust/torque level of
+# the first Δx bin moved this much from the level after the last tare
+RETARE_DRIFT_PCT = 5.0
+RETARE_DRIFT_FLOOR = 0.02       # N / Nm, below this a change is noise
+SWEEP_SETTLE_MS = 2000          # flow settle after repositioning, motors still running
+SPIN_DOWN_MS = 5000             # motors stopped before a re-tare
+RING_POLL_MS = 10               # acquisition ring drain interval (ring_name=)
+
+
+def last_logged_x_mm(csv_path: str) -> Optional[float]:
+    """X_position(mm) of the last row in the CSV's last sweep block (None if that block is empty)."""
+    last = None
+    try:
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            for row in csv.reader(f):
+                if not row or not any(c.strip() for c in row):
+                    last = None          # blank separator starts a new sweep block
+                    continue
+                try:
+                    last = float(row[1])
+                except (ValueError, IndexError):
+                    continue             # header
+    except OSError:
+        return None
+    return last
+
 
 @dataclass
 class MeasurePoint:
@@ -26,11 +58,23 @@ class MeasuringWorker(QObject):
     Drives the stepper via 'm|X|Y|' commands, and logs MCU 'Measurements:' frames.
     - points are given in *steps* (your trajectory files already use steps)
     - MainWindow should parse the incoming line and emit:
-        measurementsFrame.emit(x_steps, y_steps, vals13)
-      where vals13 is a list of 10 or 13 floats in this order:
-        [ X, Y, thr1, trq1, rpm1, airspeed, aoa_raw, aoa_abs, aoss_raw, aoss_abs, (thr2, trq2, rpm2)? ]
+        measurementsFrame.emit(x_steps, y_steps, frame)
+      where frame is a utils.frame.Frame (SI units; thr2/trq2/rpm2 are 0 on one prop).
+      A plain list of 10 or 13 floats in FRAME_FIELDS order is still accepted.
     - We average N samples per point (samples_per_point) before advancing motion.
     - CSV writing is *decoupled* from waypoints: it logs baseline at 0 mm then every Δx mm, regardless of trajectory.
+    - persistent=True: one worker (one CSV handle, one thread) for the whole series. start()
+      spins up once; after each sweep sweepFinished fires with the CSV still open and the
+      motors running, next_sweep(points) only waits for the flow to settle before the next
+      trajectory. Tare + motor restart happen again only when the level drifted
+      (RETARE_DRIFT_PCT). close_series() closes the CSV.
+    - All UI-side settings (prop diameter, rotation, steps/mm, center, feeds, Δx, tandem) come
+      from the RunContext given at construction / next_sweep(); the worker does not touch the
+      parent window, so it can live in measuringThread without cross-thread widget access.
+    - ring_name: frames come from the acquisition process' shared-memory ring
+      (utils/shm_ring.py) instead of measurementsFrame. The worker maps the ring
+      itself and builds the Frames in its own thread, so the GUI thread does no
+      per-frame work for the measurement.
     """
 
     # Outbound: connect this to MainWindow's serial write slot
@@ -47,6 +91,9 @@ class MeasuringWorker(QObject):
     pointStarted = pyqtSignal(int, int, int)   # (x_steps, y_steps, index)
     pointDone = pyqtSignal(int)                # index
     finished = pyqtSignal(str)                 # csv path
+    sweepFinished = pyqtSignal(str)            # csv path; persistent series stays open
+    sweepInterrupted = pyqtSignal()            # ESCs stopped mid-sweep; redo it with next_sweep
+    retareStarted = pyqtSignal(float)          # level drift (%) that triggered it
     error = pyqtSignal(str)
 
     def __init__(self,
@@ -60,6 +107,12 @@ class MeasuringWorker(QObject):
                  motor_pwm2: Optional[int] = None,
                  arrival_tolerance_steps: int = 2,
                  steps_per_mm: Optional[float] = None,
+                 resume_bins: int = 0,
+                 persistent: bool = False,
+                 retare_drift_pct: Optional[float] = RETARE_DRIFT_PCT,
+                 context: Optional[RunContext] = None,
+                 frame_log: bool = True,
+                 ring_name: Optional[str] = None,
                  parent: Optional[QObject] = None):
         super().__init__(parent)
 
@@ -68,41 +121,37 @@ class MeasuringWorker(QObject):
         self._samples_per_point = max(1, int(samples_per_point))
         self._settle_timeout_s = max(0.1, float(settle_timeout_s))
         self._overall_timeout_s = overall_timeout_s
-        self._is_tandem = bool(tandem_setup)
+        if context is None:
+            context = RunContext.for_feed(200, steps_per_mm=float(steps_per_mm or 1.0),
+                                          tandem=bool(tandem_setup))
+        self._is_tandem = bool(context.tandem)
         self._motor_pwm1 = motor_pwm1
         self._motor_pwm2 = motor_pwm2
         self._arrival_tol = max(0, int(arrival_tolerance_steps))
-
-        # steps/mm & X-center (in steps) to compute radial X_mm; prefer ctor arg, fall back to parent.shared_data
-        self._steps_per_mm = None
-        self._x_center_steps = 0
-        try:
-            p = self.parent()
-            ratio = float(getattr(getattr(p, "shared_data", object()), "ratio", 1.0) or 1.0)
-            x_center_mm = float(getattr(getattr(p, "shared_data", object()), "x_center", 0.0) or 0.0)
-        except Exception:
-            ratio = 1.0
-            x_center_mm = 0.0
-        self._steps_per_mm = float(steps_per_mm) if steps_per_mm is not None else ratio
-        self._x_center_steps = int(round(x_center_mm * self._steps_per_mm))
-
-        # Δx binning is *always enabled* (even with trajectory files)
-        try:
-            x_delta_mm = float(getattr(getattr(self.parent(), "shared_data", object()), "x_delta", 3.0))
-        except Exception:
-            x_delta_mm = 3.0
-        self._bin_delta_mm = x_delta_mm
-        self._bin_delta_steps = max(1, int(round(self._bin_delta_mm * self._steps_per_mm)))
+        self._persistent = bool(persistent)
+        self._retare_drift_pct = retare_drift_pct
+        self._series_open = False       # CSV open + motors spun up (persistent mode)
+        self._level_ref = None          # first-bin thrust/torque after the last tare
+        self._sweep_level = None        # first-bin thrust/torque of the last sweep
+        self._motors_off = False        # 'stop' went out while the series was parked
+
+        # steps/mm, X-center (steps), Δx binning (*always enabled*, even with trajectory files)
+        self._apply_context(context)
         self._goal_x = self._points[-1].x_steps if self._points else None
 
+        # Resume after a reconnect: the CSV already holds bins 0..resume_bins of this
+        # sweep and points[0] is that last bin edge; nothing is binned until we're back there.
+        self._resume_bins = max(0, int(resume_bins))
+        self._resume_pending = False
+
         # run state
         self._running = False
         self._t_start_overall = 0.0
         self._t_start_point = 0.0
         self._cur_idx = -1
         self._cur_target: Optional[MeasurePoint] = None
-        self._cur_samples: List[List[float]] = []
-        self._bin_samples: List[List[float]] = []
+        self._cur_samples = 0                   # frames seen at the current waypoint
+        self._bin_samples = FrameSum()          # running sums of the current Δx bin
         self._x_start_steps: Optional[int] = None
         self._y0_steps: Optional[int] = None
         self._bins_logged = 0
@@ -122,12 +171,6 @@ class MeasuringWorker(QObject):
         self._rpm_stable_count = 0
         self._rpm_last_seen = None
         
-        try:
-            # Allow override from UI SharedData if you want later (optional)
-            pre_mm = float(getattr(getattr(self.parent(), "shared_data", object()), "pre_settle_mm", 5.0))
-        except Exception:
-            pre_mm = 5.0
-        self._pre_settle_mm = max(0.0, min(10.0, pre_mm))  # clamp to 0–10 mm
         self._pre_settle_active = False   # true only during the dither
         self._pre_state = 0               # 0:not started, 1:going +X, 2:returning to center
         self._pre_targets = None          # (pt_plus, pt_center) once we know Y
@@ -136,6 +179,17 @@ class MeasuringWorker(QObject):
         # CSV
         self._csv_file = None
         self._csv_writer: Optional[csv.writer] = None
+        # every frame with its timestamps, next to the CSV (data/frame_log.py)
+        self._frame_log_on = bool(frame_log)
+        self._frame_log: Optional[FrameLog] = None
+
+        # acquisition ring: own mapping + reader, drained in the worker thread
+        self._ring_name = ring_name
+        self._ring: Optional[FrameRing] = None
+        self._ring_reader = None
+        self._ring_timer = QTimer(self)          # moves to measuringThread with the worker
+        self._ring_timer.setInterval(RING_POLL_MS)
+        self._ring_timer.timeout.connect(self._drain_ring)
 
         # CSV headers (mm)
         self.CSV_HEADER_1P = [
@@ -164,17 +218,7 @@ class MeasuringWorker(QObject):
             self.error.emit("No points to measure.")
             return
 
-        # per-sweep resets
-        self._y0_steps = None
-        self._cur_idx = -1
-        self._cur_target = None
-        self._cur_samples = []
-        self._bin_samples.clear()
-        self._x_start_steps = None
-        self._bins_logged = 0
-        self._logged_zero = False
-        self._last_x = None
-        self._last_y = None
+        self._reset_sweep_state()
 
         # --- OPEN CSV (append if exists; write header only once) ---
         log_path = Path(self._csv_path)
@@ -185,17 +229,28 @@ class MeasuringWorker(QObject):
             self._csv_writer = csv.writer(self._csv_file)
             if mode == "w":
                 self._csv_writer.writerow(self._csv_header)
+            elif self._resume_bins > 0:
+                pass  # continue the interrupted sweep block
             else:
                 # blank separator keeps numeric parsers happy
                 self._csv_writer.writerow([])
             self._csv_file.flush()
+            if self._frame_log_on:
+                self._frame_log = FrameLog(frame_log_path(self._csv_path))
         except Exception as e:
             self._running = False
+            self._close_csv()
             self.error.emit(f"Failed to open log file:\n{e}")
             return
+        if self._ring_name and not self._attach_ring():
+            self._close_csv()
+            return
 
         # Beacon + tare-before-motors sequence
         self._running = True
+        self._series_open = self._persistent
+        self._level_ref = None
+        self._sweep_level = None
         self._sweep_started = False
         self._pre_settle_active = self._pre_settle_mm > 0.0
         self._pre_state = 0
@@ -205,6 +260,149 @@ class MeasuringWorker(QObject):
         self.sendData.emit("BeaconON")
         QTimer.singleShot(3000, self._send_tare)
 
+    @pyqtSlot(object, int)
+    @pyqtSlot(object, int, object)
+    def next_sweep(self, points, resume_bins: int = 0, context: Optional[RunContext] = None):
+        """Persistent series: run the next trajectory on the open CSV, motors still spinning."""
+        if self._running:
+            return
+        if not self._series_open or not self._csv_writer:
+            self.error.emit("Series is not open.")
+            return
+        if context is not None:
+            self._apply_context(context)
+        self._points = [MeasurePoint(int(x), int(y)) for x, y in points]
+        if not self._points:
+            self.error.emit("No points to measure.")
+            return
+        self._goal_x = self._points[-1].x_steps
+        self._resume_bins = max(0, int(resume_bins))
+        self._reset_sweep_state()
+        if self._resume_bins == 0:
+            self._csv_writer.writerow([])
+            self._csv_file.flush()
+
+        self._running = True
+        self._sweep_started = False
+        self._pre_settle_active = False
+        self._t_start_overall = time.monotonic()
+
+        drift = self._level_drift_pct()
+        if self._motors_off or (drift is not None and self._retare_drift_pct is not None
+                                and drift > self._retare_drift_pct):
+            # spin down, tare, spin up again; on_tare_done schedules the kickoff
+            print(f"[MW] level drift {drift or 0.0:.1f} % / motors off -> re-tare before sweep")
+            self.retareStarted.emit(float(drift or 0.0))
+            self._level_ref = None
+            self.sendData.emit("stop")
+            QTimer.singleShot(SPIN_DOWN_MS, self._send_tare)
+            return
+        QTimer.singleShot(SWEEP_SETTLE_MS, self._kickoff_points)
+
+    @pyqtSlot()
+    def motors_stopped(self):
+        """
+        The UI sent 'stop': spin up (with tare) before the next sweep. Under a running
+        sweep the frames from here on are not valid, so the sweep is parked like a
+        suspend (completed bins stay in the CSV, the open bin is dropped) and
+        sweepInterrupted asks the UI to redo it from the last logged bin; a worker
+        without an open series just ends with an error.
+        """
+        self._motors_off = True
+        if not self._running:
+            return
+        if not self._series_open:
+            self._finish("Motors stopped mid-sweep.")
+            return
+        self._running = False
+        self._waiting_tare = False
+        self._pending_motor_start = False
+        self._cur_target = None
+        self._cur_samples = 0
+        self._bin_samples.clear()
+        if self._csv_file:
+            self._csv_file.flush()
+        if self._frame_log is not None:
+            self._frame_log.flush()
+        self.sweepInterrupted.emit()
+
+    @pyqtSlot()
+    def close_series(self):
+        """Persistent series done: close the CSV (no signals; the last sweep already reported)."""
+        if self._running:
+            return
+        self._close_csv()
+        self._series_open = False
+
+    def _attach_ring(self) -> bool:
+        try:
+            self._ring = FrameRing(self._ring_name, create=False)
+        except (OSError, ValueError) as e:
+            self.error.emit(f"Failed to attach to the acquisition ring:\n{e}")
+            return False
+        self._ring_reader = self._ring.reader()
+        self._ring_timer.start()
+        return True
+
+    def _detach_ring(self):
+        self._ring_timer.stop()
+        self._ring_reader = None
+        if self._ring is not None:
+            self._ring.close()          # not the owner: only the mapping goes
+            self._ring = None
+
+    def _drain_ring(self):
+        reader = self._ring_reader
+        if reader is None:
+            return
+        if not self._running:
+            reader.skip()               # parked between sweeps: nothing to bin
+            return
+        views, dropped = reader.read()
+        if dropped:
+            print(f"[MW] acquisition ring overrun: {dropped} frames lost")
+        for t_ns, t_mcu_ns, msg in iter_records(views):
+            if not self._running:
+                break
+            frame = Frame.from_measurements(msg, t_ns, t_mcu_ns)
+            self.on_measurements(int(frame.x), int(frame.y), frame)
+
+    def _apply_context(self, ctx: RunContext):
+        """Take the sweep's settings snapshot (the CSV layout / tandem flag stay as opened)."""
+        self._ctx = ctx
+        self._steps_per_mm = ctx.steps_per_mm
+        self._x_center_steps = int(ctx.x_center_steps)
+        self._bin_delta_mm = ctx.x_delta_mm
+        self._bin_delta_steps = ctx.bin_delta_steps
+        self._pre_settle_mm = ctx.pre_settle_clamped_mm
+        # flow channels belong to an earlier probe position (data/lag_compensation.py)
+        self._lag = LagCompensator(ctx.flow_lag_s, ctx.flow_tau_s)
+
+    def _reset_sweep_state(self):
+        self._y0_steps = None
+        self._cur_idx = -1
+        self._cur_target = None
+        self._cur_samples = 0
+        self._bin_samples.clear()
+        self._x_start_steps = None
+        self._bins_logged = 0
+        self._logged_zero = False
+        self._last_x = None
+        self._last_y = None
+        self._lag.reset()
+        self._resume_pending = self._resume_bins > 0
+
+    def _level_drift_pct(self) -> Optional[float]:
+        """Largest relative change of the last sweep's first-bin loads vs. the reference."""
+        if self._level_ref is None or self._sweep_level is None:
+            return None
+        worst = 0.0
+        for ref, cur in zip(self._level_ref, self._sweep_level):
+            if abs(cur - ref) <= RETARE_DRIFT_FLOOR:
+                continue
+            worst = max(worst, abs(cur - ref) / max(abs(ref), RETARE_DRIFT_FLOOR) * 100.0)
+        return worst
+
     def _send_tare(self):
         if not self._running:
             return
@@ -219,6 +417,7 @@ class MeasuringWorker(QObject):
         self._waiting_tare = False
         # Start motors after tare; small delay to let ESCs spin up
         if self._pending_motor_start:
+            self._motors_off = False
             if self._motor_pwm1 is not None and self._motor_pwm2 is not None:
                 self.sendData.emit(f"startMotor|{self._motor_pwm1}|{self._motor_pwm2}")
             else:
@@ -252,6 +451,8 @@ class MeasuringWorker(QObject):
 
     @pyqtSlot()
     def _kickoff_points(self):
+        if not self._running:
+            return
         # Don't send the first waypoint while the pre-settle dither is active.
         if getattr(self, "_pre_settle_active", False):
             QTimer.singleShot(100, self._kickoff_points)
@@ -273,40 +474,48 @@ class MeasuringWorker(QObject):
         """Abort the sequence."""
         self._finish("Canceled by user.")
 
+    @pyqtSlot()
+    def suspend(self):
+        """Serial link lost: close the CSV keeping only completed bins, emit nothing."""
+        self._close_csv()
+        self._series_open = False
+        self._running = False
+        self._cur_target = None
+        self._cur_samples = 0
+        self._bin_samples.clear()
+
     # MainWindow should connect its parsed frame signal to this slot:
     #   self.measurementsFrame.connect(worker.on_measurements)
-    # Signature: (int x_meas, int y_meas, object vals13)
+    # Signature: (int x_meas, int y_meas, object frame)
     @pyqtSlot(int, int, object)
-    def on_measurements(self, x_meas: int, y_meas: int, vals_obj):
+    def on_measurements(self, x_meas: int, y_meas: int, frame):
         if not self._running:
             return
 
+        if not isinstance(frame, Frame):
+            try:
+                frame = Frame.from_values(frame)
+            except (TypeError, ValueError):
+                return
+        if self._frame_log is not None:
+            self._frame_log.write(frame)
+
+        # Δx bins take the lag-compensated frame at its delayed position; motion
+        # control (pre-settle, resume, waypoints) keeps using the measured one
+        binned = self._lag.apply(frame)
+        if binned is frame:
+            x_bin, y_bin = x_meas, y_meas
+        else:
+            x_bin, y_bin = binned.x, binned.y
+
         # remember last positions for tail flush
-        self._last_x = x_meas
-        self._last_y = y_meas
+        self._last_x = x_bin
+        self._last_y = y_bin
+
+        cur_rpm1 = frame.rpm1
+        self._last_rpm1 = cur_rpm1
+        self._last_rpm2 = frame.rpm2 if self._is_tandem else 0.0
 
-        # Normalize frame length (10 vs 13 fields)
-        try:
-            vals = list(vals_obj)
-        except Exception:
-            return
-        expected = 13 if self._is_tandem else 10
-        if len(vals) < expected:
-            vals += [0.0] * (expected - len(vals))
-        elif len(vals) > expected:
-            vals = vals[:expected]
-            
-        try:
-            self._last_rpm1 = float(vals[4])
-            self._last_rpm2 = float(vals[12]) if self._is_tandem and len(vals) >= 13 else 0.0
-        except Exception:
-            pass
-        
-        try:
-            cur_rpm1 = float(vals[4])
-        except Exception:
-            cur_rpm1 = 0.0
-            
         if self._pre_settle_active:
             # We rely on measured positions to build the dither targets on the first frame
             if not self._pre_started:
@@ -352,10 +561,6 @@ class MeasuringWorker(QObject):
                     self._start_sweep_once()
                 return  # don't fall through during this frame
 
-        # Update last RPMs as before
-        self._last_rpm1 = cur_rpm1
-        self._last_rpm2 = float(vals[12]) if self._is_tandem and len(vals) >= 13 else 0.0
-
         # --- RPM stability gate ---
         if self._rpm_gate_active:
             if cur_rpm1 >= self._rpm_min:
@@ -385,65 +590,58 @@ class MeasuringWorker(QObject):
         if self._x_start_steps is None:
             self._x_start_steps = int(self._x_center_steps)
             self._y0_steps = y_meas
-            self._bins_logged = 0
-            self._bin_samples.clear()
-            self._logged_zero = False
-
-        # collect current frame into the bin
-        self._bin_samples.append(vals)
-
-        # emit 0‑mm baseline once so X_mm starts at 0 in the CSV
-        if not self._logged_zero:
-            baseline = list(vals)
-            baseline[0] = float(x_meas); baseline[1] = float(y_meas)
-            self._write_row(baseline)
-            self._logged_zero = True
-
-        # flush a row every Δx (in steps measured from center)
-        traveled_steps = abs(int(x_meas) - int(self._x_start_steps))
-        next_edge = (self._bins_logged + 1) * self._bin_delta_steps
-        if traveled_steps >= next_edge:
-            averaged = self._average_samples(self._bin_samples) or list(vals)
-            averaged[0] = float(x_meas); averaged[1] = float(y_meas)
-            self._write_row(averaged)
-            self._bins_logged += 1
+            self._bins_logged = self._resume_bins
             self._bin_samples.clear()
+            self._logged_zero = self._resume_bins > 0
+
+        if self._resume_pending:
+            # travelling back to the last logged bin edge: don't bin these frames
+            tgt = self._points[0]
+            if abs(x_meas - tgt.x_steps) <= self._arrival_tol and abs(y_meas - tgt.y_steps) <= self._arrival_tol:
+                self._resume_pending = False
+                self._bin_samples.clear()
+        else:
+            # collect current frame into the bin
+            self._bin_samples.add(binned)
+
+            # emit 0‑mm baseline once so X_mm starts at 0 in the CSV
+            if not self._logged_zero:
+                self._write_row(binned)
+                self._logged_zero = True
+
+            # flush a row every Δx (in steps measured from center)
+            traveled_steps = abs(int(x_bin) - int(self._x_start_steps))
+            next_edge = (self._bins_logged + 1) * self._bin_delta_steps
+            if traveled_steps >= next_edge:
+                averaged = self._bin_samples.mean(float(x_bin), float(y_bin))
+                self._write_row(averaged)
+                if self._bins_logged == 0:
+                    # thr1, trq1 (, thr2, trq2) of the first bin: re-tare drift check
+                    if self._is_tandem:
+                        self._sweep_level = (averaged.thr1, averaged.trq1, averaged.thr2, averaged.trq2)
+                    else:
+                        self._sweep_level = (averaged.thr1, averaged.trq1)
+                    if self._level_ref is None:
+                        self._level_ref = self._sweep_level
+                self._bins_logged += 1
+                self._bin_samples.clear()
 
         # -------- Waypoint advance only (no CSV writes here) --------
         if self._cur_target is not None:
             dx = abs(x_meas - self._cur_target.x_steps)
             dy = abs(y_meas - self._cur_target.y_steps)
             if dx <= self._arrival_tol and dy <= self._arrival_tol:
-                self._cur_samples.append(vals)
-                if (time.monotonic() - self._t_start_point) > self._settle_timeout_s or len(self._cur_samples) >= self._samples_per_point:
+                self._cur_samples += 1
+                if (time.monotonic() - self._t_start_point) > self._settle_timeout_s or self._cur_samples >= self._samples_per_point:
                     self.pointDone.emit(self._cur_idx)
                     self._advance_to_next_point()
 
     # ---------- internals ----------
 
-    def _average_samples(self, samples):
-        """Return the element-wise average; None if samples is empty."""
-        if not samples:
-            return None
-        n = len(samples)
-        acc = [0.0] * len(samples[0])
-        for row in samples:
-            if len(row) != len(acc):
-                continue  # skip malformed rows defensively
-            for i, v in enumerate(row):
-                acc[i] += float(v)
-        return [a / n for a in acc]
-
     def _send_move(self, pt: MeasurePoint):
         """MCU expects m|X|Y|feed_xy|feed_y"""
-        feed_xy = 200
-        try:
-            mw = self.parent()
-            feed_xy = int(getattr(mw, "measure_speed").value())
-        except Exception:
-            pass
-        feed_y = max(1, int(feed_xy / 3))
-        self.sendData.emit(f"m|{pt.x_steps}|{pt.y_steps}|{feed_xy}|{feed_y}")
+        ctx = self._ctx
+        self.sendData.emit(f"m|{pt.x_steps}|{pt.y_steps}|{ctx.feed_xy}|{ctx.feed_y}")
 
     def _advance_to_next_point(self):
         """Move to next point or finish."""
@@ -461,7 +659,7 @@ class MeasuringWorker(QObject):
 
         self.progress.emit(self._cur_idx, total)
         self._cur_target = self._points[self._cur_idx]
-        self._cur_samples = []
+        self._cur_samples = 0
         self._t_start_point = time.monotonic()
         self.pointStarted.emit(self._cur_target.x_steps, self._cur_target.y_steps, self._cur_idx)
 
@@ -471,32 +669,17 @@ class MeasuringWorker(QObject):
         # Harmless nudge to keep serial alive in some stacks
         self.sendData.emit("")
 
-    def _write_row(self, *args):
-        """
-        Accepts:
-          - _write_row(vals13)
-          - _write_row(x_steps, y_steps, vals13)  # legacy call sites OK
-        """
+    def _write_row(self, f: Frame):
+        """One CSV row from a frame (a raw frame or a bin mean, X/Y in steps)."""
         if not self._csv_writer:
             return
         try:
-            # normalize args to vals13 list with X/Y injected
-            if len(args) == 1:
-                vals13 = list(args[0])
-            elif len(args) == 3:
-                x_steps, y_steps, vals = args
-                vals13 = list(vals)
-                vals13[0] = float(x_steps)
-                vals13[1] = float(y_steps)
-            else:
-                return
-
             spmm = self._steps_per_mm if self._steps_per_mm else 1.0
             xc   = self._x_center_steps
-            y0   = self._y0_steps if self._y0_steps is not None else int(round(vals13[1]))
+            y0   = self._y0_steps if self._y0_steps is not None else int(round(f.y))
 
-            x_steps_i = int(round(float(vals13[0])))
-            y_steps_i = int(round(float(vals13[1])))
+            x_steps_i = int(round(f.x))
+            y_steps_i = int(round(f.y))
 
             x_mm = abs(x_steps_i - xc) / spmm
             if x_mm < 0.5:
@@ -508,20 +691,15 @@ class MeasuringWorker(QObject):
             def r(x, nd=3): return round(float(x), nd)
 
             # first prop
-            thr1, trq1 = r(vals13[2], 2), r(vals13[3], 2)
-            airspeed, aoa_r, aoa_a = r(vals13[5], 2), r(vals13[6], 2), r(vals13[7], 2)
-            aoss_r, aoss_a    = r(vals13[8], 2), r(vals13[9], 2)
-
-            # --- pull rotation_dir (+1 CW / -1 CCW) and optional mount_sign from UI shared data ---
-            mw = self.parent()
-            d_ui = 1
-            m = 1
-            try:
-                d_ui = int(getattr(getattr(mw, "shared_data", object()), "rotation_dir", 1) or 1)
-                #m = int(getattr(getattr(mw, "shared_data", object()), "mount_sign", 1) or 1)
-            except Exception:
-                pass
-            
+            thr1, trq1 = r(f.thr1, 2), r(f.trq1, 2)
+            airspeed, aoa_r, aoa_a = r(f.airspeed, 2), r(f.aoa_raw, 2), r(f.aoa_abs, 2)
+            aoss_r, aoss_a    = r(f.aoss_raw, 2), r(f.aoss_abs, 2)
+
+            # --- rotation_dir (+1 CW / -1 CCW) and mount_sign from the run context ---
+            ctx = self._ctx
+            d_ui = int(ctx.rotation_dir or 1)
+            #m = int(ctx.mount_sign or 1)
+
             d = -d_ui
 
             # --- build the angles used for PHYSICS (signed) ---
@@ -541,22 +719,16 @@ class MeasuringWorker(QObject):
             omega2 = 0.0
 
             if self._is_tandem:
-                thr2, trq2 = r(vals13[10], 2), r(vals13[11], 2)
+                thr2, trq2 = r(f.thr2, 2), r(f.trq2, 2)
                 omega2 = round((float(self._last_rpm2) * 6.283185307179586) / 60.0, 2)
             else:
                 thr2 = trq2 = 0.0
                 
-            # pull prop diameter (inch) from UI
-            prop_in = 0.0
-            try:
-                mw = self.parent()
-                # MainWindow has self.prop (QDoubleSpinBox) for diameter in inches
-                prop_in = float(getattr(mw, "prop").value())
-            except Exception:
-                pass
+            # prop diameter (inch), MainWindow.prop at sweep start
+            prop_in = ctx.prop_diam_in
 
             # --- flow components from *averaged* samples ---
-            # Use AoA/AoSS (degrees) and Airspeed (m/s) that arrived in vals13
+            # Use AoA/AoSS (degrees) and Airspeed (m/s) of the frame
             # These are bin-averaged when called from the bin flush path.
             aoa_rad  = math.radians(float(aoa_abs))
             aoss_rad = math.radians(float(aoss_a))
@@ -600,28 +772,32 @@ class MeasuringWorker(QObject):
         # tail flush of Δx bin
         try:
             if self._csv_writer and self._bin_samples:
-                tail = self._average_samples(self._bin_samples)
-                if tail:
-                    if self._last_x is not None and self._last_y is not None:
-                        tail[0] = float(self._last_x)
-                        tail[1] = float(self._last_y)
-                    self._write_row(tail)
+                if self._last_x is not None and self._last_y is not None:
+                    tail = self._bin_samples.mean(float(self._last_x), float(self._last_y))
+                else:
+                    tail = self._bin_samples.mean()
+                self._write_row(tail)
         except Exception:
             pass
 
-        if self._csv_file:
-            try:
-                self._csv_file.flush()
-                self._csv_file.close()
-            except Exception:
-                pass
-        self._csv_file = None
-        self._csv_writer = None
-
         was_running = self._running
+        if self._persistent and self._series_open and reason_ok is None:
+            # end of one sweep: keep the CSV open and the motors spinning
+            self._running = False
+            self._cur_target = None
+            self._cur_samples = 0
+            self._bin_samples.clear()
+            if self._frame_log is not None:
+                self._frame_log.flush()
+            if was_running:
+                self.sweepFinished.emit(self._csv_path)
+            return
+
+        self._close_csv()
+        self._series_open = False
         self._running = False
         self._cur_target = None
-        self._cur_samples = []
+        self._cur_samples = 0
         self._bin_samples.clear()
 
         if was_running:
@@ -630,3 +806,17 @@ class MeasuringWorker(QObject):
             else:
                 self.error.emit(reason_ok)
                 self.finished.emit(self._csv_path)
+
+    def _close_csv(self):
+        if self._csv_file:
+            try:
+                self._csv_file.flush()
+                self._csv_file.close()
+            except Exception:
+                pass
+        self._csv_file = None
+        self._csv_writer = None
+        if self._frame_log is not None:
+            self._frame_log.close()
+            self._frame_log = None
+        self._detach_ring()
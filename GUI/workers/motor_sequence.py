@@ -0,0 +1,95 @@
+# workers/motor_sequence.py
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+# Motor test choreography (command, settle ms after it completed). Commands with
+# an AckRule (stop, startMotor|...) complete on the MCU reply, the rest
+# (ON, OFF, BeaconON/OFF) once written; the settle gives the relays / ESCs time.
+# MOTOR_TEST_STOP is run best-effort: a failed 'stop' must not keep OFF /
+# BeaconOFF from going out.
+MOTOR_TEST_START: Tuple[Tuple[str, int], ...] = (
+    ("ON", 2000),
+    ("BeaconON", 2000),
+)
+MOTOR_TEST_STOP: Tuple[Tuple[str, int], ...] = (
+    ("stop", 2000),
+    ("OFF", 2000),
+    ("BeaconOFF", 2000),
+    ("OFF", 0),
+)
+
+
+class MotorSequence(QObject):
+    """
+    Runs a command sequence on the GUI thread without blocking it: each step is
+    sent through send(cmd, on_ack=, on_fail=) (MainWindow.sendData) and the next
+    one is scheduled with a QTimer once the previous one completed + settled.
+    A failed step ends the run (failed, then on_fail) unless it was started with
+    best_effort=True: then failed is emitted for the step and the rest still
+    runs. cancel() (or run() of another sequence) drops the rest; late replies
+    of a cancelled run are ignored.
+    """
+
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, send: Callable[..., None], parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._send = send
+        self._steps: List[Tuple[str, int]] = []
+        self._on_done: Optional[Callable[[], None]] = None
+        self._on_fail: Optional[Callable[[str], None]] = None
+        self._best_effort = False
+        self._gen = 0                    # run id; callbacks of older runs are stale
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._next)
+
+    def run(self, steps: Iterable[Tuple[str, int]], on_done: Optional[Callable[[], None]] = None,
+            on_fail: Optional[Callable[[str], None]] = None, best_effort: bool = False):
+        self.cancel()
+        self._steps = list(steps)
+        self._on_done = on_done
+        self._on_fail = on_fail
+        self._best_effort = bool(best_effort)
+        self._next()
+
+    def cancel(self):
+        self._gen += 1
+        self._timer.stop()
+        self._steps = []
+        self._on_done = None
+        self._on_fail = None
+
+    def running(self) -> bool:
+        return bool(self._steps) or self._timer.isActive()
+
+    def _next(self):
+        if not self._steps:
+            on_done, self._on_done = self._on_done, None
+            if on_done:
+                on_done()
+            self.finished.emit()
+            return
+        cmd, settle_ms = self._steps.pop(0)
+        gen = self._gen
+
+        def _ok(_line=""):
+            if gen == self._gen:
+                self._timer.start(max(0, int(settle_ms)))
+
+        def _fail(reason):
+            if gen != self._gen:
+                return
+            if self._best_effort:
+                self.failed.emit(f"{cmd}: {reason}")
+                self._timer.start(max(0, int(settle_ms)))
+                return
+            on_fail = self._on_fail
+            self.cancel()
+            self.failed.emit(f"{cmd}: {reason}")
+            if on_fail:
+                on_fail(f"{cmd}: {reason}")
+
+        self._send(cmd, on_ack=_ok, on_fail=_fail)
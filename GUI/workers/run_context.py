@@ -0,0 +1,48 @@
+# workers/run_context.py
+from dataclasses import dataclass
+
+PRE_SETTLE_MM_DEFAULT = 5.0
+PRE_SETTLE_MM_MAX = 10.0
+
+
+@dataclass(frozen=True)
+class RunContext:
+    """
+    Everything the measuring worker needs from the UI, read once on the GUI thread
+    at sweep start (MainWindow._run_context). The worker runs in measuringThread
+    and never touches widgets or SharedData; a new sweep brings a new snapshot.
+    """
+    prop_diam_in: float = 0.0
+    rotation_dir: int = 1            # SharedData.rotation_dir: -1 CW, +1 CCW
+    mount_sign: int = 1
+    steps_per_mm: float = 1.0
+    x_center_steps: int = 0
+    feed_xy: int = 200               # m|X|Y|feed_xy|feed_y
+    feed_y: int = 66
+    x_delta_mm: float = 3.0          # Δx bin width
+    tandem: bool = False
+    pre_settle_mm: float = PRE_SETTLE_MM_DEFAULT
+    flow_lag_s: float = 0.0          # data/lag_compensation.py, 0 = off
+    flow_tau_s: float = 0.0
+
+    def __post_init__(self):
+        if not self.steps_per_mm > 0:
+            raise ValueError(f"Sammude arv millimeetri kohta peab olema positiivne: {self.steps_per_mm!r}")
+        if not self.x_delta_mm > 0:
+            raise ValueError(f"Δx peab olema positiivne: {self.x_delta_mm!r}")
+        if self.flow_lag_s < 0 or self.flow_tau_s < 0:
+            raise ValueError(f"Voolukanalite viide ei tohi olla negatiivne: {self.flow_lag_s!r}, {self.flow_tau_s!r}")
+
+    @classmethod
+    def for_feed(cls, feed_xy: int, **kw) -> "RunContext":
+        """Context with feed_y derived the way the worker always did (a third of feed_xy)."""
+        feed_xy = int(feed_xy)
+        return cls(feed_xy=feed_xy, feed_y=max(1, int(feed_xy / 3)), **kw)
+
+    @property
+    def bin_delta_steps(self) -> int:
+        return max(1, int(round(self.x_delta_mm * self.steps_per_mm)))
+
+    @property
+    def pre_settle_clamped_mm(self) -> float:
+        return max(0.0, min(PRE_SETTLE_MM_MAX, float(self.pre_settle_mm)))
@@ -1,9 +1,14 @@
+import time
+
+import serial
 from PyQt5.QtCore import QObject, QTimer, pyqtSignal
 from data.shared_data import SharedData
 
 class SerialReader(QObject):
     serial_readout = pyqtSignal(str)
+    line_stamped = pyqtSignal(str, object)     # text, time.monotonic_ns() of the read
     calValueReceived = pyqtSignal(str)
+    connection_lost = pyqtSignal(str)
 
     def __init__(self, controller):
         super().__init__()
@@ -27,10 +32,18 @@ class SerialReader(QObject):
 
         while self.running and self.controller and self.controller.isOpen():
             # Read whatever is available; if nothing, read(1) will wait up to timeout
-            n = int(getattr(self.controller, "in_waiting", 0) or 0)
-            data = self.controller.read(n if n > 0 else 1)
+            try:
+                n = int(getattr(self.controller, "in_waiting", 0) or 0)
+                data = self.controller.read(n if n > 0 else 1)
+            except (serial.SerialException, OSError) as e:
+                # USB unplug / device reset: report instead of exiting silently
+                self.running = False
+                self.connection_lost.emit(str(e))
+                break
             if not data:
                 continue
+            # arrival stamp, shared by every line completed by this read
+            t_ns = time.monotonic_ns()
 
             # Accumulate into buffer
             self.buf.extend(data)
@@ -53,6 +66,7 @@ class SerialReader(QObject):
 
                 self.latest_data = text
                 self.serial_readout.emit(text)
+                self.line_stamped.emit(text, t_ns)
 
     def stop(self):
         self.running = False